@@ -14,7 +14,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from vol_edge.config import AppConfig, load_config
-from vol_edge.data.ibkr.snapshots import build_signal_snapshots
+from vol_edge.data.ibkr.snapshot_cache import load_signal_snapshots
 from vol_edge.exec.ib_trader import TradeExecutor, get_last_price, get_positions, get_index_price
 from vol_edge.signals import (
     compute_erv30,
@@ -53,12 +53,14 @@ def run(args: argparse.Namespace) -> None:
     config = load_config(args.config)
     if config.data.provider != "ibkr":
         raise SystemExit("Config must use data.provider=ibkr for live trading")
+    if config.strategy.erv30_estimator != "close_to_close":
+        raise SystemExit("Live trading computes eRV30 close-to-close from snapshots; unset strategy.erv30_estimator")
     if not config.execution.account_id:
         raise SystemExit("execution.account_id must be set to your IBKR account (e.g., U14983106)")
 
     target_date = args.date or date.today()
     lookback_days = 20
-    snapshots = build_signal_snapshots(config, target_date - timedelta(days=lookback_days), target_date)
+    snapshots = load_signal_snapshots(config, target_date - timedelta(days=lookback_days), target_date)
     if snapshots.empty or target_date not in snapshots.index.date:
         raise SystemExit(f"No snapshot for {target_date}")
     snap_row = snapshots.loc[str(target_date)]
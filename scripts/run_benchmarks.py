@@ -0,0 +1,178 @@
+"""Time each pipeline stage on synthetic data and compare against a baseline.
+
+Daily stages run at 1, 10 and 30 years of business days; the minute-bar snapshot
+stage runs at 1 to 10 years of 390-bar sessions. Results are written as JSON
+keyed by ``stage@dataset`` so two runs (or a run and a stored baseline) can be
+diffed directly.
+
+    python scripts/run_benchmarks.py --output bench.json
+    python scripts/run_benchmarks.py --baseline bench.json --tolerance 1.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from vol_edge.config import BacktestEngine, load_config  # noqa: E402
+from vol_edge.data import build_panel  # noqa: E402
+from vol_edge.data.synthetic import generate_daily_market_data, generate_minute_bars, write_minute_cache  # noqa: E402
+from vol_edge.exec.backtest import run_backtest  # noqa: E402
+from vol_edge.exec.vectorized import prepare_inputs, simulate  # noqa: E402
+from vol_edge.reports import build_daily_report, compute_metrics  # noqa: E402
+from vol_edge.signals import compute_erv30_series, compute_realized_vol_estimators  # noqa: E402
+
+DAILY_YEARS = (1, 10, 30)
+MINUTE_YEARS = (1, 2, 5, 10)
+SEED = 42
+
+
+def _config(dates: pd.DatetimeIndex, engine: BacktestEngine = BacktestEngine.VECTORIZED):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "strategy": {"name": "evrp_boc_sizing"},
+            "backtest": {
+                "start_date": str(dates[0].date()),
+                "end_date": str(dates[-1].date()),
+                "engine": engine.value,
+            },
+        }
+    )
+
+
+def _time(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "repeat": repeat}
+
+
+def daily_stages(years: int, repeat: int, include_loop: bool) -> List[Dict]:
+    data = generate_daily_market_data(years, seed=SEED)
+    dates = data.spy.index
+    config = _config(dates)
+    panel = build_panel(data, config.data.missing_data)
+    data.panel = panel
+    inputs = prepare_inputs(config, panel)
+    result = run_backtest(config, data=data)
+
+    stages = {
+        "panel": lambda: build_panel(data, config.data.missing_data),
+        "erv30": lambda: compute_erv30_series(panel.column("spy")),
+        "erv30_all_estimators": lambda: compute_realized_vol_estimators(panel.bars("spy")),
+        "prepare_inputs": lambda: prepare_inputs(config, panel),
+        "simulate": lambda: simulate(inputs, config.strategy, config.backtest.initial_equity),
+        "backtest_vectorized": lambda: run_backtest(config, data=data),
+        "compute_metrics": lambda: compute_metrics(result.equity_curve),
+        "daily_report": lambda: build_daily_report(result, config),
+    }
+    if include_loop:
+        stages["backtest_loop"] = lambda: run_backtest(config, data=data, engine=BacktestEngine.LOOP)
+
+    dataset = f"daily_{years}y"
+    return [
+        {"stage": name, "dataset": dataset, "rows": len(dates), **_time(fn, repeat)}
+        for name, fn in stages.items()
+    ]
+
+
+def minute_stages(years: int, repeat: int) -> List[Dict]:
+    from vol_edge.data.ibkr.snapshot_cache import load_signal_snapshots
+    from vol_edge.data.ibkr.snapshots import build_signal_snapshots
+
+    bars = generate_minute_bars(years, seed=SEED)
+    days = pd.DatetimeIndex(bars["SPY"].index.normalize().unique().tz_localize(None))
+    config = _config(days)
+    first, last = days[0].date(), days[-1].date()
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The IBKR loaders resolve their cache relative to the working directory.
+        os.chdir(tmp)
+        try:
+            write_minute_cache(bars)
+            timings = {"build_signal_snapshots": _time(lambda: build_signal_snapshots(config, first, last), repeat)}
+            load_signal_snapshots(config, first, last)  # materialize once, then time warm reads
+            timings["load_signal_snapshots_warm"] = _time(lambda: load_signal_snapshots(config, first, last), repeat)
+        finally:
+            os.chdir(previous)
+    rows = int(sum(len(frame) for frame in bars.values()))
+    return [{"stage": name, "dataset": f"minute_{years}y", "rows": rows, **timing} for name, timing in timings.items()]
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print a ratio table and return the keys slower than ``tolerance`` x baseline."""
+
+    regressions = []
+    print(f"{'benchmark':<44}{'baseline':>11}{'current':>11}{'ratio':>8}")
+    for key, entry in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            print(f"{key:<44}{'-':>11}{entry['min_s']:>11.4f}{'new':>8}")
+            continue
+        ratio = entry["min_s"] / base["min_s"] if base["min_s"] > 0 else float("inf")
+        flag = " !" if ratio > tolerance else ""
+        print(f"{key:<44}{base['min_s']:>11.4f}{entry['min_s']:>11.4f}{ratio:>8.2f}{flag}")
+        if ratio > tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark vol-edge stages on synthetic data")
+    parser.add_argument("--daily-years", type=int, nargs="*", default=list(DAILY_YEARS))
+    parser.add_argument("--minute-years", type=int, nargs="*", default=list(MINUTE_YEARS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-loop", action="store_true", help="Skip the per-day loop engine")
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown ratio vs baseline")
+    args = parser.parse_args()
+
+    entries: List[Dict] = []
+    for years in args.daily_years:
+        entries.extend(daily_stages(years, args.repeat, include_loop=not args.skip_loop))
+    for years in args.minute_years:
+        entries.extend(minute_stages(years, args.repeat))
+
+    current = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": SEED,
+        },
+        "results": {f"{entry['stage']}@{entry['dataset']}": entry for entry in entries},
+    }
+    args.output.write_text(json.dumps(current, indent=2))
+    print(f"Wrote {len(entries)} timings to {args.output}")
+
+    if args.baseline:
+        regressions = compare(current, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than {args.tolerance:.2f}x baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,15 @@
-from datetime import date
+from datetime import date, time
 
+import numpy as np
 import pandas as pd
+import pytest
 
-from vol_edge.config import StrategyConfig, StrategyName, load_config
-from vol_edge.data import MarketData
-from vol_edge.exec.backtest import BacktestResult, run_backtest
+from vol_edge.config import BacktestEngine, StrategyConfig, StrategyName, load_config
+from vol_edge.data import MarketData, MissingDataError
+from vol_edge.data.ibkr.snapshots import SnapshotSurface
+from vol_edge.exec.backtest import BacktestResult, DailyRecord, RecordTable, run_backtest
+from vol_edge.reports import build_daily_report
+from vol_edge.signals import TermStructureState
 
 
 def make_frame(values):
@@ -52,3 +57,254 @@ def test_backtest_generates_records():
     last_record = result.records[-1]
     assert "SVIX" in last_record.actual_weights or "UVXY" in last_record.actual_weights
     assert result.equity_curve.iloc[-1] > 0
+
+
+def build_random_bundle(length: int = 300, seed: int = 7) -> tuple[MarketData, pd.DatetimeIndex]:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2018-01-01", periods=length, freq="B")
+    spy = 100 * np.exp(np.cumsum(rng.normal(0, 0.012, length)))
+    vix = np.clip(18 + np.cumsum(rng.normal(0, 1.0, length)), 9, 80)
+    vix3m = vix + rng.normal(1.0, 2.0, length)
+    long_vol = 20 * np.exp(np.cumsum(rng.normal(0, 0.05, length)))
+    short_vol = 40 * np.exp(np.cumsum(rng.normal(0, 0.03, length)))
+    bundle = MarketData(
+        spy=make_frame(list(spy)),
+        vix=make_frame(list(vix)),
+        vix3m=make_frame(list(vix3m)),
+        long_vol=make_frame(list(long_vol)),
+        short_vol=make_frame(list(short_vol)),
+    )
+    for frame in (bundle.spy, bundle.vix, bundle.vix3m, bundle.long_vol, bundle.short_vol):
+        frame.index = dates
+    return bundle, dates
+
+
+@pytest.mark.parametrize("strategy", [name.value for name in StrategyName])
+def test_vectorized_engine_matches_loop(strategy):
+    bundle, dates = build_random_bundle()
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": strategy, "trade_cost_bps": 5, "term_structure_epsilon": 0.25},
+            "backtest": {"start_date": str(dates[0].date()), "end_date": str(dates[-1].date())},
+        }
+    )
+
+    loop = run_backtest(config, data=bundle, engine=BacktestEngine.LOOP)
+    fast = run_backtest(config, data=bundle, engine=BacktestEngine.VECTORIZED)
+
+    pd.testing.assert_series_equal(fast.equity_curve, loop.equity_curve, check_freq=False, rtol=1e-12)
+    pd.testing.assert_series_equal(fast.benchmark_curve, loop.benchmark_curve, check_freq=False, rtol=1e-12)
+    assert len(fast.records) == len(loop.records)
+    for fast_rec, loop_rec in zip(fast.records, loop.records):
+        assert fast_rec.date == loop_rec.date
+        assert fast_rec.term_structure is loop_rec.term_structure
+        assert fast_rec.erv30 == pytest.approx(loop_rec.erv30, rel=1e-12)
+        assert fast_rec.target_weights == pytest.approx(loop_rec.target_weights)
+        assert fast_rec.actual_weights == pytest.approx(loop_rec.actual_weights, rel=1e-9)
+
+
+@pytest.mark.parametrize("estimator", ["parkinson", "garman_klass", "ewma"])
+def test_engines_agree_on_alternative_erv30_estimators(estimator):
+    bundle, dates = build_random_bundle(length=120)
+    rng = np.random.default_rng(5)
+    close = bundle.spy["close"]
+    bundle.spy = bundle.spy.assign(
+        open=close * (1 + rng.normal(0, 0.004, len(close))),
+        high=close * (1 + np.abs(rng.normal(0, 0.008, len(close)))),
+        low=close * (1 - np.abs(rng.normal(0, 0.008, len(close)))),
+    )
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"erv30_estimator": estimator},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+
+    loop = run_backtest(config, data=bundle, engine=BacktestEngine.LOOP)
+    fast = run_backtest(config, data=bundle, engine=BacktestEngine.VECTORIZED)
+    baseline = run_backtest(config.model_copy(update={"strategy": StrategyConfig()}), data=bundle)
+
+    pd.testing.assert_series_equal(fast.equity_curve, loop.equity_curve, check_freq=False, rtol=1e-12)
+    fast_erv = [rec.erv30 for rec in fast.records]
+    assert fast_erv == pytest.approx([rec.erv30 for rec in loop.records], rel=1e-12)
+    assert fast_erv != pytest.approx([rec.erv30 for rec in baseline.records])
+    for rec in fast.records:
+        assert rec.evrp == pytest.approx(rec.vix - rec.erv30)
+
+
+def test_engines_agree_on_decision_table_strategy():
+    bundle, dates = build_random_bundle(length=160)
+    table = {
+        "rules": [
+            {"when": {"evrp": "positive", "term": "contango", "vix_max": 25}, "weights": {"short_vol": "vix / divisor"}},
+            {"when": {"term": "backwardation", "vix_min": 20}, "weights": {"long_vol": "min(0.15, cap)"}},
+        ]
+    }
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"table": table, "trade_cost_bps": 5},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+
+    loop = run_backtest(config, data=bundle, engine=BacktestEngine.LOOP)
+    fast = run_backtest(config, data=bundle, engine=BacktestEngine.VECTORIZED)
+
+    pd.testing.assert_series_equal(fast.equity_curve, loop.equity_curve, check_freq=False, rtol=1e-12)
+    for fast_rec, loop_rec in zip(fast.records, loop.records):
+        assert fast_rec.target_weights == pytest.approx(loop_rec.target_weights)
+    assert any("UVXY" in rec.target_weights for rec in fast.records)
+
+
+@pytest.mark.parametrize("engine", [BacktestEngine.LOOP, BacktestEngine.VECTORIZED])
+def test_missing_vix_date_follows_policy(engine):
+    bundle, dates = build_random_bundle(length=40)
+    bundle.vix = bundle.vix.drop(dates[20])
+
+    def config(policy):
+        return load_config(
+            {
+                "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+                "data": {"missing_data": policy},
+                "backtest": {"start_date": str(dates[0].date())},
+            }
+        )
+
+    with pytest.raises(MissingDataError):
+        run_backtest(config("fail"), data=bundle, engine=engine)
+    filled = run_backtest(config("ffill"), data=bundle, engine=engine)
+    assert dates[20] in filled.equity_curve.index
+    assert filled.records[10].vix == bundle.vix["adj_close"].loc[dates[19]]
+    dropped = run_backtest(config("drop"), data=bundle, engine=engine)
+    assert dates[20] not in dropped.equity_curve.index
+
+
+def test_result_is_columnar_with_lazy_record_views():
+    bundle, dates = build_random_bundle(length=120)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": "evrp_boc"},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+    loop = run_backtest(config, data=bundle, engine=BacktestEngine.LOOP)
+    fast = run_backtest(config, data=bundle, engine=BacktestEngine.VECTORIZED)
+
+    for result in (loop, fast):
+        table = result.table
+        assert table.symbols == ("SVIX", "UVXY")
+        assert table.actual_weights.shape == (len(result.equity_curve), 2)
+        assert table.term_structure.dtype == np.int8
+        frame = table.to_frame()
+        assert {"equity", "erv30", "term_structure", "weight_SVIX", "target_UVXY"} <= set(frame.columns)
+        assert frame["equity"].to_numpy() == pytest.approx(result.equity_curve.to_numpy())
+
+    records = fast.records
+    assert records[-1] == records[len(records) - 1]
+    assert [rec.date for rec in records[:3]] == list(fast.table.dates[:3])
+    rebuilt = RecordTable.from_records(list(loop.records), symbols=("SVIX", "UVXY"))
+    np.testing.assert_array_equal(rebuilt.actual_weights, loop.table.actual_weights)
+    np.testing.assert_array_equal(rebuilt.term_structure, loop.table.term_structure)
+
+
+def test_loop_engine_fills_the_record_table_without_daily_records(monkeypatch):
+    from vol_edge.exec import backtest
+
+    bundle, dates = build_random_bundle(length=120)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": "evrp_boc"},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+    expected = run_backtest(config, data=bundle, engine=BacktestEngine.VECTORIZED)
+    monkeypatch.setattr(backtest, "DailyRecord", None)  # any per-day record would fail to build
+
+    loop = run_backtest(config, data=bundle, engine=BacktestEngine.LOOP)
+
+    assert loop.table.symbols == expected.table.symbols
+    pd.testing.assert_series_equal(loop.equity_curve, expected.equity_curve, check_freq=False)
+    pd.testing.assert_series_equal(loop.benchmark_curve, expected.benchmark_curve, check_freq=False)
+    np.testing.assert_allclose(loop.table.actual_weights, expected.table.actual_weights)
+    np.testing.assert_array_equal(loop.table.term_structure, expected.table.term_structure)
+
+
+def test_backtest_result_accepts_record_lists():
+    record = DailyRecord(
+        date=pd.Timestamp("2020-01-02"),
+        equity=100.0,
+        target_weights={"SVIX": 0.2},
+        actual_weights={"SVIX": 0.19, "UVXY": 0.0},
+        vix=20.0,
+        vix3m=22.0,
+        erv30=12.0,
+        evrp=8.0,
+        term_structure=TermStructureState.CONTANGO,
+    )
+    curve = pd.Series([100.0], index=[record.date])
+    result = BacktestResult(equity_curve=curve, benchmark_curve=curve, records=[record])
+    assert len(result.records) == 1
+    assert result.records[0] == record
+
+
+def test_daily_report_lists_positions_in_holding_order():
+    def record(day, weights):
+        return DailyRecord(
+            date=pd.Timestamp(day),
+            equity=100.0,
+            target_weights=weights,
+            actual_weights=weights,
+            vix=30.0,
+            vix3m=28.0,
+            erv30=35.0,
+            evrp=-5.0,
+            term_structure=TermStructureState.BACKWARDATION,
+        )
+
+    records = [
+        record("2020-01-02", {}),
+        record("2020-01-03", {"UVXY": 0.2}),
+        record("2020-01-06", {"UVXY": 0.0, "SVIX": 0.1}),
+    ]
+    curve = pd.Series(100.0, index=[rec.date for rec in records])
+    table = RecordTable.from_records(records, symbols=("SVIX", "UVXY"))
+    result = BacktestResult(equity_curve=curve, benchmark_curve=curve, table=table)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "backtest": {"start_date": "2020-01-02"},
+        }
+    )
+
+    report = build_daily_report(result, config)
+    assert report["position"].tolist() == ["n/a", "UVXY 20.00%", "UVXY 0.00%, SVIX 10.00%"]
+
+
+@pytest.mark.parametrize("engine", [BacktestEngine.LOOP, BacktestEngine.VECTORIZED])
+def test_run_backtest_replays_snapshot_slices(engine):
+    bundle, dates = build_random_bundle(length=200)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": "evrp_boc"},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+    at_close = np.stack([bundle.spy["adj_close"], bundle.vix["adj_close"], bundle.vix3m["adj_close"]], axis=-1)
+    earlier = at_close * np.array([1.0, 1.08, 0.97])
+    surface = SnapshotSurface(
+        dates=dates, times=(time(15, 30), time(16, 0)), values=np.stack([earlier, at_close], axis=1)
+    )
+
+    daily = run_backtest(config, data=bundle, engine=engine)
+    replay_close = run_backtest(config, data=bundle, engine=engine, snapshots=surface.frame(time(16, 0)))
+    replay_early = run_backtest(config, data=bundle, engine=engine, snapshots=surface.frame(time(15, 30)))
+
+    pd.testing.assert_series_equal(replay_close.equity_curve, daily.equity_curve, rtol=1e-12)
+    assert replay_early.records[0].vix == pytest.approx(earlier[10, 1])
+    assert not np.allclose(replay_early.equity_curve.to_numpy(), daily.equity_curve.to_numpy())
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vol_edge.exec.backtest import BacktestResult
+from vol_edge.reports import BlendRebalance, compute_metrics, run_blend
+from vol_edge.reports.blend import daily_blend_returns, drift_blend_returns
+
+
+def _result(length: int = 250, seed: int = 11) -> BacktestResult:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", periods=length, freq="B")
+    strategy = pd.Series(1e6 * np.cumprod(1 + rng.normal(0.0005, 0.02, length)), index=dates)
+    spy = pd.Series(1e6 * np.cumprod(1 + rng.normal(0.0003, 0.01, length)), index=dates)
+    return BacktestResult(equity_curve=strategy, benchmark_curve=spy, records=[])
+
+
+def test_blend_endpoints_match_compute_metrics():
+    result = _result()
+    table = run_blend(result, [0.0, 0.5, 1.0])
+    assert list(table["spy_weight"]) == [0.0, 0.5, 1.0]
+
+    for weight, curve in ((0.0, result.equity_curve), (1.0, result.benchmark_curve)):
+        expected = compute_metrics(curve)
+        row = table.loc[table["spy_weight"] == weight].iloc[0]
+        assert row["cagr"] == pytest.approx(expected.cagr)
+        assert row["volatility"] == pytest.approx(expected.volatility)
+        assert row["sharpe"] == pytest.approx(expected.sharpe)
+        assert row["max_drawdown"] == pytest.approx(expected.max_drawdown)
+
+
+def test_daily_blend_columns_match_manual_mix():
+    result = _result()
+    strategy = result.equity_curve.pct_change().dropna()
+    spy = result.benchmark_curve.pct_change().dropna()
+    table = run_blend(result, [0.25])
+    equity = (1 + 0.75 * strategy + 0.25 * spy).cumprod()
+    equity = pd.concat([pd.Series([1.0], index=result.equity_curve.index[:1]), equity])
+    assert table.iloc[0]["sharpe"] == pytest.approx(compute_metrics(equity).sharpe)
+    assert table.iloc[0]["max_drawdown"] == pytest.approx(compute_metrics(equity).max_drawdown)
+
+
+def test_drift_blend_with_zero_band_matches_daily_rebalance():
+    rng = np.random.default_rng(5)
+    strategy = rng.normal(0, 0.02, 100)
+    spy = rng.normal(0, 0.01, 100)
+    weights = np.linspace(0, 1, 21)
+    np.testing.assert_allclose(
+        drift_blend_returns(strategy, spy, weights, threshold=0.0),
+        daily_blend_returns(strategy, spy, weights),
+        rtol=1e-12,
+        atol=1e-15,
+    )
+
+
+def test_drift_blend_lets_weights_wander_inside_band():
+    result = _result()
+    daily = run_blend(result, [0.5], rebalance=BlendRebalance.DAILY)
+    drift = run_blend(result, [0.5], rebalance=BlendRebalance.DRIFT, threshold=0.2)
+    assert drift.iloc[0]["cagr"] != pytest.approx(daily.iloc[0]["cagr"])
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+from vol_edge.config import load_config
+from vol_edge.data import MarketData
+from vol_edge.exec.backtest import run_backtest
+from vol_edge.exec.checkpoint import load_checkpoint, load_checkpoint_curves, run_incremental_backtest
+from vol_edge.reports import build_daily_report
+
+from test_backtest import build_random_bundle
+
+
+def _config(dates, **strategy):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": "evrp_boc_sizing", "trade_cost_bps": 5, **strategy},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+
+
+def _until(bundle: MarketData, end) -> MarketData:
+    return MarketData(
+        spy=bundle.spy.loc[:end],
+        vix=bundle.vix.loc[:end],
+        vix3m=bundle.vix3m.loc[:end],
+        long_vol=bundle.long_vol.loc[:end],
+        short_vol=bundle.short_vol.loc[:end],
+    )
+
+
+@pytest.mark.parametrize("estimator", ["close_to_close", "parkinson", "ewma"])
+def test_resumed_backtest_matches_full_run(tmp_path, estimator):
+    bundle, dates = build_random_bundle(length=200)
+    config = _config(dates, erv30_estimator=estimator)
+    resumable = estimator != "ewma"  # EWMA needs the whole history, so it reruns in full
+
+    first = run_incremental_backtest(config, tmp_path, data=_until(bundle, dates[149]))
+    assert not first.resumed
+    second = run_incremental_backtest(config, tmp_path, data=_until(bundle, dates[179]))
+    assert second.resumed is resumable
+    if resumable:
+        assert list(second.result.equity_curve.index) == list(dates[150:180])
+    third = run_incremental_backtest(config, tmp_path, data=bundle)
+    assert len(third.result.records) == (20 if resumable else 190)
+
+    full = run_backtest(config, data=bundle)
+    equity, benchmark = load_checkpoint_curves(tmp_path)
+    pd.testing.assert_series_equal(equity, full.equity_curve, check_names=False, check_freq=False, rtol=1e-10)
+    pd.testing.assert_series_equal(benchmark, full.benchmark_curve, check_names=False, check_freq=False, rtol=1e-10)
+    state = load_checkpoint(tmp_path)
+    assert state.last_date == dates[-1]
+    assert len(state.signal_closes) == 10
+
+
+def test_resume_without_new_dates_is_a_no_op(tmp_path):
+    bundle, dates = build_random_bundle(length=60)
+    config = _config(dates)
+    run_incremental_backtest(config, tmp_path, data=bundle)
+    again = run_incremental_backtest(config, tmp_path, data=bundle)
+    assert again.resumed
+    assert again.result.equity_curve.empty
+    assert len(load_checkpoint_curves(tmp_path)[0]) == 50
+
+
+def test_config_or_data_change_triggers_full_rebuild(tmp_path):
+    bundle, dates = build_random_bundle(length=80)
+    run_incremental_backtest(_config(dates), tmp_path, data=_until(bundle, dates[59]))
+
+    changed_config = run_incremental_backtest(_config(dates, rebalance_threshold_pct=0.05), tmp_path, data=bundle)
+    assert not changed_config.resumed
+
+    revised = _until(bundle, dates[-1])
+    revised.spy = revised.spy.copy()
+    revised.spy.loc[dates[-5], "adj_close"] *= 1.01
+    rebuilt = run_incremental_backtest(_config(dates, rebalance_threshold_pct=0.05), tmp_path, data=revised)
+    assert not rebuilt.resumed
+    assert len(rebuilt.result.records) == 70
+
+
+def test_incremental_report_rows_continue_full_report(tmp_path):
+    bundle, dates = build_random_bundle(length=120)
+    config = _config(dates)
+    first = run_incremental_backtest(config, tmp_path, data=_until(bundle, dates[99]))
+    second = run_incremental_backtest(config, tmp_path, data=bundle)
+
+    head = build_daily_report(first.result, config)
+    tail = build_daily_report(
+        second.result, config, previous_equity=second.previous_equity, base_equity=second.checkpoint.first_equity
+    )
+    full = build_daily_report(run_backtest(config, data=bundle), config)
+    combined = pd.concat([head, tail], ignore_index=True)
+    assert list(combined["date"]) == list(full["date"])
+    assert combined["pnl"].to_numpy() == pytest.approx(full["pnl"].to_numpy())
+    assert combined["cumulative_pnl"].to_numpy() == pytest.approx(full["cumulative_pnl"].to_numpy())
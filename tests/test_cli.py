@@ -61,3 +61,162 @@ def test_cli_backtest(tmp_path):
     payload = json.loads(result.stdout.strip())
     assert payload["records"] > 0
     assert payload["final_equity"] > 0
+
+
+def test_cli_sweep(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    length = 25
+    _write_csv(csv_dir / "spy.csv", [100 + i * 0.2 for i in range(length)])
+    _write_csv(csv_dir / "vix.csv", [18 + (i % 3) for i in range(length)])
+    _write_csv(csv_dir / "vix3m.csv", [20 + (i % 2) for i in range(length)])
+    _write_csv(csv_dir / "uvxy.csv", [15 - 0.1 * i for i in range(length)])
+    _write_csv(csv_dir / "svix.csv", [40 + 0.3 * i for i in range(length)])
+
+    config = tmp_path / "config.yml"
+    config.write_text(
+        f"""
+        instruments:
+          long_vol: {{symbol: UVXY}}
+          short_vol: {{symbol: SVIX}}
+        data:
+          provider: csv
+          csv:
+            spy: {csv_dir / 'spy.csv'}
+            vix: {csv_dir / 'vix.csv'}
+            vix3m: {csv_dir / 'vix3m.csv'}
+            long_vol: {csv_dir / 'uvxy.csv'}
+            short_vol: {csv_dir / 'svix.csv'}
+        backtest:
+          start_date: 2020-01-01
+          end_date: 2020-02-10
+        """
+    )
+    output = tmp_path / "sweep.csv"
+
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "vol_edge.cli",
+            "sweep",
+            "--config",
+            str(config),
+            "--param",
+            "rebalance_threshold_pct=0.01:0.03:0.01",
+            "--param",
+            "trade_cost_bps=0,5",
+            "--workers",
+            "1",
+            "--output",
+            str(output),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    table = pd.read_csv(output)
+    assert len(table) == 6
+    assert {"sharpe", "cagr", "max_drawdown"} <= set(table.columns)
+
+
+def _write_bundle(csv_dir: Path, length: int) -> None:
+    _write_csv(csv_dir / "spy.csv", [100 + i * 0.2 + (i % 4) for i in range(length)])
+    _write_csv(csv_dir / "vix.csv", [18 + (i % 3) for i in range(length)])
+    _write_csv(csv_dir / "vix3m.csv", [20 + (i % 2) for i in range(length)])
+    _write_csv(csv_dir / "uvxy.csv", [15 - 0.1 * i for i in range(length)])
+    _write_csv(csv_dir / "svix.csv", [40 + 0.3 * i for i in range(length)])
+
+
+def test_cli_report_appends_from_checkpoint(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    _write_bundle(csv_dir, 25)
+    config = tmp_path / "config.yml"
+    config.write_text(
+        f"""
+        instruments:
+          long_vol: {{symbol: UVXY}}
+          short_vol: {{symbol: SVIX}}
+        data:
+          provider: csv
+          csv:
+            spy: {csv_dir / 'spy.csv'}
+            vix: {csv_dir / 'vix.csv'}
+            vix3m: {csv_dir / 'vix3m.csv'}
+            long_vol: {csv_dir / 'uvxy.csv'}
+            short_vol: {csv_dir / 'svix.csv'}
+        backtest:
+          start_date: 2020-01-01
+        """
+    )
+    output = tmp_path / "report.csv"
+    command = [
+        sys.executable,
+        "-m",
+        "vol_edge.cli",
+        "report",
+        "--config",
+        str(config),
+        "--checkpoint",
+        str(tmp_path / "ckpt"),
+        "--output",
+        str(output),
+    ]
+
+    subprocess.run(command, check=True, capture_output=True, text=True)
+    assert len(pd.read_csv(output)) == 15
+    _write_bundle(csv_dir, 30)
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    assert "Appended 5 rows" in result.stdout
+    report = pd.read_csv(output)
+    assert len(report) == 20
+    assert report["date"].is_monotonic_increasing
+
+
+def test_cli_backtest_profile_json(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    _write_bundle(csv_dir, 25)
+    config = tmp_path / "config.yml"
+    config.write_text(
+        f"""
+        instruments:
+          long_vol: {{symbol: UVXY}}
+          short_vol: {{symbol: SVIX}}
+        data:
+          provider: csv
+          csv:
+            spy: {csv_dir / 'spy.csv'}
+            vix: {csv_dir / 'vix.csv'}
+            vix3m: {csv_dir / 'vix3m.csv'}
+            long_vol: {csv_dir / 'uvxy.csv'}
+            short_vol: {csv_dir / 'svix.csv'}
+        backtest:
+          start_date: 2020-01-01
+        """
+    )
+    stats_path = tmp_path / "loop.pstats"
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "vol_edge.cli",
+            "backtest",
+            "--config",
+            str(config),
+            "--profile",
+            "json",
+            "--profile-stats",
+            str(stats_path),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert json.loads(result.stdout.strip())["records"] > 0
+    profile = {row["name"]: row for row in json.loads(result.stderr.splitlines()[0])}
+    assert {"data.load", "data.panel", "signals.daily", "strategy.target_weights", "reports.metrics"} <= set(profile)
+    assert profile["data.load"]["calls"] == 1
+    assert stats_path.exists()
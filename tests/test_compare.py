@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from vol_edge.config import StrategyName, load_config
+from vol_edge.exec.backtest import run_backtest
+from vol_edge.exec.compare import comparison_table, run_strategy_comparison
+
+from test_backtest import build_random_bundle
+
+
+def _config(dates, name="evrp_boc_sizing"):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": name, "trade_cost_bps": 5},
+            "backtest": {"start_date": str(dates[0].date())},
+        }
+    )
+
+
+def test_comparison_matches_individual_backtests():
+    bundle, dates = build_random_bundle(length=150)
+    results = run_strategy_comparison(_config(dates), data=bundle)
+
+    assert list(results) == [name.value for name in StrategyName]
+    for name, result in results.items():
+        expected = run_backtest(_config(dates, name), data=bundle, engine="loop")
+        pd.testing.assert_series_equal(result.equity_curve, expected.equity_curve, check_freq=False, rtol=1e-12)
+
+
+def test_comparison_table_has_row_per_strategy_and_benchmark():
+    bundle, dates = build_random_bundle(length=80)
+    results = run_strategy_comparison(_config(dates), strategies=["passive", "evrp"], data=bundle)
+    table = comparison_table(results)
+    assert list(table.index) == ["passive", "evrp", "spy"]
+    assert {"cagr", "sharpe", "sortino", "max_drawdown", "adjusted_max_drawdown"} <= set(table.columns)
+    with pytest.raises(ValueError):
+        run_strategy_comparison(_config(dates), strategies=["bogus"], data=bundle)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -8,6 +10,7 @@ import pytest
 
 from vol_edge.config import AppConfig, load_config
 from vol_edge.data import CSVDataSource, MarketData, YahooDataSource, get_data_source
+from vol_edge.data.csv_cache import CsvCache
 
 
 def _write_csv(path: Path, rows: list[dict]):
@@ -108,3 +111,81 @@ def test_yahoo_source_uses_adjusted_close(monkeypatch, tmp_path):
     assert called["tickers"] == ["SPY", "^VIX", "^VIX3M", "UVXY", "SVIX"]
     assert bundle.spy.loc["2020-01-01", "adj_close"] == 99
     assert "adj_close" in bundle.long_vol.columns
+
+
+def _with_cache_dir(cfg: AppConfig, cache_dir: Path) -> AppConfig:
+    csv = cfg.data.csv.model_copy(update={"cache_dir": cache_dir})
+    return cfg.model_copy(update={"data": cfg.data.model_copy(update={"csv": csv})})
+
+
+def test_csv_cache_matches_direct_parse_and_tracks_file_changes(tmp_path, monkeypatch):
+    cfg = _build_csv_config(tmp_path)
+    cached_cfg = _with_cache_dir(cfg, tmp_path / "arrow")
+    direct = CSVDataSource(cfg).load(cfg.backtest.start_date, cfg.backtest.end_date)
+    cached = CSVDataSource(cached_cfg).load(cfg.backtest.start_date, cfg.backtest.end_date)
+
+    for role in ("spy", "vix", "vix3m", "long_vol", "short_vol"):
+        pd.testing.assert_frame_equal(getattr(cached, role), getattr(direct, role), check_freq=False)
+    assert len(list((tmp_path / "arrow").glob("*.arrow"))) == 5
+
+    parsed = []
+    original = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *a, **k: parsed.append(a[0]) or original(*a, **k))
+    tail = CSVDataSource(cached_cfg).load(date(2020, 1, 3))
+    assert parsed == []
+    assert list(tail.spy.index) == [pd.Timestamp("2020-01-03")]
+
+    spy_csv = cfg.data.csv.spy
+    _write_csv(spy_csv, [{"date": "2020-01-01", "close": 9.0, "adj_close": 9.0}])
+    refreshed = CSVDataSource(cached_cfg).load(date(2020, 1, 1), date(2020, 1, 1))
+    assert parsed == [spy_csv]
+    assert refreshed.spy.loc["2020-01-01", "close"] == pytest.approx(9.0)
+    assert len(list((tmp_path / "arrow").glob("spy-*.arrow"))) == 1
+
+
+def test_csv_cache_keeps_same_named_csvs_from_other_directories(tmp_path, monkeypatch):
+    cache = CsvCache(tmp_path / "arrow")
+    paths = []
+    for folder, close in (("a", 1.0), ("b", 2.0)):
+        (tmp_path / folder).mkdir()
+        paths.append(tmp_path / folder / "spy.csv")
+        _write_csv(paths[-1], [{"date": "2020-01-01", "close": close}])
+    first = cache.load(paths[0])
+    cache.load(paths[1])
+    assert len(list((tmp_path / "arrow").glob("spy-*.arrow"))) == 2
+
+    _write_csv(paths[1], [{"date": "2020-01-01", "close": 3.0}, {"date": "2020-01-02", "close": 4.0}])
+    assert cache.load(paths[1])["close"].tolist() == [3.0, 4.0]
+
+    parsed = []
+    original = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *a, **k: parsed.append(a[0]) or original(*a, **k))
+    pd.testing.assert_frame_equal(cache.load(paths[0]), first)
+    assert parsed == []  # a/spy.csv's copy survived b/spy.csv's refresh
+    assert len(list((tmp_path / "arrow").glob("spy-*.arrow"))) == 2
+
+
+def test_csv_cache_concurrent_conversions_use_separate_temp_files(tmp_path, monkeypatch):
+    from vol_edge.data import csv_cache
+
+    csv_path = tmp_path / "spy.csv"
+    _write_csv(csv_path, [{"date": "2020-01-01", "close": 1.0}])
+    cache = CsvCache(tmp_path / "arrow")
+    target = cache.path_for(csv_path)
+    barrier = threading.Barrier(2, timeout=5)
+    temps = []
+    original = csv_cache.feather.write_feather
+
+    def write_together(table, dest, **kwargs):
+        temps.append(dest)
+        barrier.wait()  # both threads are mid-write at once
+        original(table, dest, **kwargs)
+
+    monkeypatch.setattr(csv_cache.feather, "write_feather", write_together)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for future in [pool.submit(cache._convert, csv_path, target) for _ in range(2)]:
+            future.result()
+
+    assert len(set(temps)) == 2
+    assert cache.load(csv_path)["close"].tolist() == [1.0]
+    assert not list((tmp_path / "arrow").glob("*.tmp"))
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from types import SimpleNamespace
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 import pytest
@@ -16,6 +18,10 @@ from vol_edge.data.ibkr.downloader import (
     load_or_fetch,
     load_vix3m_with_fallback,
 )
+from vol_edge.data.ibkr.coverage import load_coverage, manifest_path, missing_intervals
+from vol_edge.data.ibkr.minute_store import MinuteStore
+
+NY = ZoneInfo("America/New_York")
 
 
 def test_historical_chunks_cover_range():
@@ -31,7 +37,7 @@ def test_cache_path_creates_directory(tmp_path, monkeypatch):
     monkeypatch.setattr("vol_edge.data.ibkr.downloader.Path", lambda p="data/ibkr_cache": tmp_path / "cache")
     path = cache_path("SPY")
     assert path.parent.exists()
-    assert path.name == "SPY_1min.parquet"
+    assert path.name == "SPY_1min"
 
 
 def test_fetch_minute_bars_converts_timezone(monkeypatch):
@@ -50,11 +56,12 @@ def test_fetch_minute_bars_converts_timezone(monkeypatch):
     assert df.index.tz.zone == "America/New_York"
 
 
-def test_load_or_fetch_reads_cache(tmp_path, monkeypatch):
-    cache_file = tmp_path / "SPY_1min.parquet"
+def test_load_or_fetch_migrates_legacy_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "SPY_1min"
+    legacy = tmp_path / "SPY_1min.parquet"
     df = pd.DataFrame({"close": [1, 2]}, index=pd.date_range("2020-01-01", periods=2, tz="America/New_York"))
-    df.to_parquet(cache_file)
-    monkeypatch.setattr("vol_edge.data.ibkr.downloader.cache_path", lambda symbol, base_dir=Path("data/ibkr_cache"): cache_file)
+    df.to_parquet(legacy)
+    monkeypatch.setattr("vol_edge.data.ibkr.downloader.cache_path", lambda symbol, base_dir=Path("data/ibkr_cache"): cache_dir)
 
     config = load_config(
         {
@@ -67,10 +74,14 @@ def test_load_or_fetch_reads_cache(tmp_path, monkeypatch):
         "SPY",
         SimpleNamespace(),
         config,
-        datetime(2020, 1, 1, tzinfo=timezone.utc),
-        datetime(2020, 1, 2, tzinfo=timezone.utc),
+        datetime(2020, 1, 1, tzinfo=NY),
+        datetime(2020, 1, 2, tzinfo=NY),
     )
     assert len(data) == 2
+    assert data["close"].tolist() == [1.0, 2.0]
+    assert not legacy.exists()
+    assert (cache_dir / "year=2020" / "month=01" / "part.parquet").exists()
+    assert manifest_path(cache_dir).exists()
 
 
 def test_load_vix3m_with_fallback(monkeypatch):
@@ -105,3 +116,178 @@ def test_load_vix3m_with_fallback(monkeypatch):
     df = load_vix3m_with_fallback(config, start, end)
     assert not df.empty
     assert "close" in df.columns
+
+
+def test_missing_intervals_skips_covered_ranges():
+    coverage = [
+        (pd.Timestamp("2020-01-02", tz="UTC"), pd.Timestamp("2020-01-05", tz="UTC")),
+        (pd.Timestamp("2020-01-04", tz="UTC"), pd.Timestamp("2020-01-07", tz="UTC")),
+        (pd.Timestamp("2020-01-09", tz="UTC"), pd.Timestamp("2020-01-10", tz="UTC")),
+    ]
+    gaps = missing_intervals(coverage, datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 12, tzinfo=timezone.utc))
+    assert gaps == [
+        (pd.Timestamp("2020-01-01", tz="UTC"), pd.Timestamp("2020-01-02", tz="UTC")),
+        (pd.Timestamp("2020-01-07", tz="UTC"), pd.Timestamp("2020-01-09", tz="UTC")),
+        (pd.Timestamp("2020-01-10", tz="UTC"), pd.Timestamp("2020-01-12", tz="UTC")),
+    ]
+    assert missing_intervals(coverage, datetime(2020, 1, 3, tzinfo=timezone.utc), datetime(2020, 1, 6, tzinfo=timezone.utc)) == []
+
+
+def test_load_or_fetch_downloads_only_gaps(tmp_path, monkeypatch):
+    cache_file = tmp_path / "SPY_1min"
+    monkeypatch.setattr(dl, "cache_path", lambda symbol, base_dir=Path("data/ibkr_cache"): cache_file)
+    requests = []
+
+    class FakeIB:
+        def run(self, awaitable):
+            return asyncio.run(awaitable)
+
+        async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, **kwargs):
+            requests.append((endDateTime, durationStr))
+            count, unit = durationStr.split()
+            span = pd.Timedelta(days=int(count)) if unit == "D" else pd.Timedelta(seconds=int(count))
+            end = pd.Timestamp(endDateTime)
+            stamps = pd.date_range(end - span, end, freq="h", inclusive="left")
+            return [
+                SimpleNamespace(date=ts.isoformat(), open=1.0, high=1.0, low=1.0, close=float(ts.hour), volume=10)
+                for ts in stamps
+            ]
+
+    class FakeClient:
+        def __init__(self, config):
+            pass
+
+        def __enter__(self):
+            return FakeIB()
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(dl, "IBKRClient", FakeClient)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "data": {"provider": "ibkr"},
+            "backtest": {"start_date": "2020-01-01"},
+        }
+    )
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    first = load_or_fetch("SPY", SimpleNamespace(), config, start, start + timedelta(days=2))
+    assert len(requests) == 1
+    assert manifest_path(cache_file).exists()
+    assert first.index.max() < pd.Timestamp("2020-01-03", tz="UTC")
+
+    again = load_or_fetch("SPY", SimpleNamespace(), config, start + timedelta(hours=6), start + timedelta(days=1))
+    assert len(requests) == 1
+    assert again.index.min() >= pd.Timestamp("2020-01-01 06:00", tz="UTC")
+
+    topped_up = load_or_fetch("SPY", SimpleNamespace(), config, start, start + timedelta(days=2, hours=3))
+    assert len(requests) == 2
+    assert requests[-1][1] == "10800 S"
+    assert topped_up.index.is_unique
+    assert len(topped_up) == 2 * 24 + 3
+
+
+def test_no_data_chunks_are_covered_and_not_requested_again(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "SVIX_1min"
+    monkeypatch.setattr(dl, "cache_path", lambda symbol, base_dir=Path("data/ibkr_cache"): cache_dir)
+    requests = []
+
+    class NoDataError(Exception):
+        code = 162
+        message = "Historical Market Data Service error message:HMDS query returned no data: SVIX@SMART Trades"
+
+    class PreListingIB:
+        def run(self, awaitable):
+            return asyncio.run(awaitable)
+
+        async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, **kwargs):
+            requests.append(endDateTime)
+            raise NoDataError(NoDataError.message)
+
+    class FakeClient:
+        def __init__(self, config):
+            pass
+
+        def __enter__(self):
+            return PreListingIB()
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(dl, "IBKRClient", FakeClient)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "data": {"provider": "ibkr"},
+            "backtest": {"start_date": "2020-01-01"},
+        }
+    )
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=14)
+
+    assert load_or_fetch("SVIX", SimpleNamespace(), config, start, end, allow_empty=True).empty
+    assert len(requests) == 2
+    assert load_coverage(cache_dir, None) == [(pd.Timestamp(start), pd.Timestamp(end))]
+
+    load_or_fetch("SVIX", SimpleNamespace(), config, start, end, allow_empty=True)
+    assert len(requests) == 2  # the rerun finds nothing missing
+
+
+def test_interrupted_backfill_resumes_after_completed_chunks(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "SPY_1min"
+    monkeypatch.setattr(dl, "cache_path", lambda symbol, base_dir=Path("data/ibkr_cache"): cache_dir)
+    served = []
+
+    class FlakyIB:
+        def __init__(self, fail_after=None):
+            self.fail_after = fail_after
+
+        def run(self, awaitable):
+            return asyncio.run(awaitable)
+
+        async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, **kwargs):
+            end = pd.Timestamp(endDateTime)
+            if self.fail_after is not None and len(served) >= self.fail_after:
+                raise ConnectionError("socket closed")
+            await asyncio.sleep(0)
+            served.append(end)
+            span = pd.Timedelta(days=int(durationStr.split()[0]))
+            stamps = pd.date_range(end - span, end, freq="h", inclusive="left")
+            return [SimpleNamespace(date=ts.isoformat(), open=1.0, high=1.0, low=1.0, close=1.0, volume=1) for ts in stamps]
+
+    sessions = [FlakyIB(fail_after=3), FlakyIB()]
+
+    class FakeClient:
+        def __init__(self, config):
+            pass
+
+        def __enter__(self):
+            return sessions.pop(0)
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(dl, "IBKRClient", FakeClient)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "data": {"provider": "ibkr", "ibkr": {"max_concurrent_requests": 1}},
+            "backtest": {"start_date": "2020-01-01"},
+        }
+    )
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=70)  # ten 7-day chunks
+
+    with pytest.raises(ConnectionError):
+        load_or_fetch("SPY", SimpleNamespace(), config, start, end)
+    assert len(served) == 3
+    partial = load_coverage(cache_dir, None)
+    assert partial == [(pd.Timestamp(start), pd.Timestamp(start + timedelta(days=21)))]
+    assert len(MinuteStore(cache_dir).read()) == 21 * 24
+
+    resumed = load_or_fetch("SPY", SimpleNamespace(), config, start, end)
+    assert len(served) == 10
+    assert min(served[3:]) == pd.Timestamp(start + timedelta(days=28))
+    assert len(resumed) == 70 * 24
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import weakref
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from vol_edge.data.ibkr.scheduler import ChunkRequest, HistoricalScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class FakeIB:
+    """Serves one bar per hour of the requested span after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.01, failures=None):
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = []
+
+    async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, **kwargs):
+        self.calls.append((contract, endDateTime, durationStr))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            pending = self.failures.get(contract)
+            if pending:
+                self.failures[contract] = pending[1:]
+                raise pending[0]
+            end = pd.Timestamp(endDateTime)
+            stamps = pd.date_range(end - pd.Timedelta(days=int(durationStr.split()[0])), end, freq="h", inclusive="left")
+            return [SimpleNamespace(date=ts.isoformat(), open=1, high=1, low=1, close=1, volume=1) for ts in stamps]
+        finally:
+            self.in_flight -= 1
+
+
+def _chunks(symbols, days: int = 3):
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return [
+        ChunkRequest(symbol, symbol, start + timedelta(days=i), start + timedelta(days=i + 1))
+        for symbol in symbols
+        for i in range(days)
+    ]
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    asyncio.run(take(5))
+    assert clock.now == pytest.approx(1.0)  # 3 immediately, then 2 more at 0.5 s each
+
+
+def test_scheduler_keeps_requests_in_flight_across_symbols():
+    ib = FakeIB(latency=0.02)
+    scheduler = HistoricalScheduler(ib, TokenBucket(rate=1000.0, capacity=100), max_in_flight=4)
+    chunks = _chunks(["SPY", "^VIX", "^VIX3M"])
+
+    results = asyncio.run(scheduler.run(chunks))
+
+    assert [r.request for r in results] == chunks
+    assert all(r.ok and len(r.bars) == 24 for r in results)
+    assert ib.peak_in_flight == 4
+    assert {contract for contract, _, _ in ib.calls} == {"SPY", "^VIX", "^VIX3M"}
+
+
+def test_scheduler_retries_pacing_violations_with_backoff():
+    clock = FakeClock()
+    pacing = RequestError(162, "Historical Market Data Service error message:API historical data query cancelled: pacing violation")
+    ib = FakeIB(latency=0, failures={"SPY": [pacing, pacing]})
+    scheduler = HistoricalScheduler(
+        ib, TokenBucket(rate=1000.0, capacity=100), max_retries=3, backoff_seconds=10.0, sleep=clock.sleep
+    )
+
+    results = asyncio.run(scheduler.run(_chunks(["SPY"], days=1)))
+
+    assert results[0].ok
+    assert clock.sleeps == [10.0, 20.0]
+    assert len(ib.calls) == 3
+
+
+def test_scheduler_reports_rejections_and_gives_up_on_persistent_pacing():
+    rejection = RequestError(162, "Historical Market Data Service error message:No market data permissions for CBOE IND")
+    no_data = RequestError(162, "Historical Market Data Service error message:HMDS query returned no data: VIX3M@CBOE")
+    ib = FakeIB(latency=0, failures={"^VIX3M": [rejection], "SVIX": [no_data]})
+    scheduler = HistoricalScheduler(ib, TokenBucket(rate=1000.0, capacity=100))
+    results = asyncio.run(scheduler.run(_chunks(["SPY", "^VIX3M", "SVIX"], days=1)))
+    assert [r.ok for r in results] == [True, False, True]  # "no data" is an empty chunk, not a rejection
+    assert results[1].bars.empty and results[2].bars.empty
+
+    clock = FakeClock()
+    pacing = RequestError(420, "pacing")
+    ib = FakeIB(latency=0, failures={"SPY": [pacing] * 5})
+    scheduler = HistoricalScheduler(ib, TokenBucket(rate=1000.0, capacity=100), max_retries=2, sleep=clock.sleep)
+    with pytest.raises(RequestError):
+        asyncio.run(scheduler.run(_chunks(["SPY"], days=1)))
+
+
+def test_scheduler_never_mistakes_a_timeout_for_an_empty_chunk():
+    class TimingOutIB(FakeIB):
+        async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, timeout=60, **kwargs):
+            if timeout:  # ib_insync cancels the request and returns an empty list
+                return []
+            return await super().reqHistoricalDataAsync(contract, endDateTime, durationStr, **kwargs)
+
+    scheduler = HistoricalScheduler(TimingOutIB(latency=0), TokenBucket(rate=1000.0, capacity=100))
+    results = asyncio.run(scheduler.run(_chunks(["SPY"], days=2)))
+    assert all(r.ok and len(r.bars) == 24 for r in results)
+
+
+def test_scheduler_streams_chunks_as_they_complete():
+    ib = FakeIB(latency=0.01)
+    scheduler = HistoricalScheduler(ib, TokenBucket(rate=1000.0, capacity=100), max_in_flight=2)
+    chunks = _chunks(["SPY", "^VIX"], days=4)
+
+    async def consume(limit=None):
+        seen = []
+        async for result in scheduler.stream(chunks):
+            seen.append(result.request)
+            if limit and len(seen) == limit:
+                break
+        return seen
+
+    seen = asyncio.run(consume())
+    assert sorted(seen, key=chunks.index) == chunks
+
+    ib.calls.clear()
+    assert len(asyncio.run(consume(limit=1))) == 1
+    assert len(ib.calls) < len(chunks)  # outstanding requests are cancelled once the consumer stops
+
+
+def test_stream_draws_requests_lazily_and_frees_yielded_chunks():
+    ib = FakeIB(latency=0)
+    scheduler = HistoricalScheduler(ib, TokenBucket(rate=1000.0, capacity=100), max_in_flight=3)
+    chunks = _chunks(["SPY"], days=30)
+    drawn = []
+
+    def requests():
+        for chunk in chunks:
+            drawn.append(chunk)
+            yield chunk
+
+    async def consume():
+        frames, most_alive, most_ahead = [], 0, 0
+        async for result in scheduler.stream(requests()):
+            frames.append(weakref.ref(result.bars))
+            del result
+            gc.collect()
+            most_alive = max(most_alive, sum(ref() is not None for ref in frames[:-1]))
+            most_ahead = max(most_ahead, len(drawn) - len(frames))
+        return frames, most_alive, most_ahead
+
+    frames, most_alive, most_ahead = asyncio.run(consume())
+    assert len(frames) == len(chunks)
+    assert most_alive == 0  # every chunk before the latest is freed once the consumer drops it
+    assert most_ahead <= 2 * 3  # max_in_flight running plus at most one finished batch
@@ -0,0 +1,72 @@
+"""Startup regressions: provider backends must stay off the CSV/daily path."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from test_cli import _write_bundle
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# pandas + pydantic account for ~0.8 s here; eager ib_insync/yfinance imports added ~0.5 s on top.
+STARTUP_BUDGET_S = 2.0
+PROVIDER_MODULES = ("ib_insync", "eventkit", "yfinance")
+
+
+def _run(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_csv_backtest_does_not_import_provider_backends(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    _write_bundle(csv_dir, 40)
+    config = tmp_path / "config.yml"
+    config.write_text(
+        f"""
+        instruments:
+          long_vol: {{symbol: UVXY}}
+          short_vol: {{symbol: SVIX}}
+        data:
+          provider: csv
+          csv:
+            spy: {csv_dir / 'spy.csv'}
+            vix: {csv_dir / 'vix.csv'}
+            vix3m: {csv_dir / 'vix3m.csv'}
+            long_vol: {csv_dir / 'uvxy.csv'}
+            short_vol: {csv_dir / 'svix.csv'}
+        backtest:
+          start_date: 2020-01-01
+        """
+    )
+
+    loaded = _run(
+        f"""
+import json, sys
+from vol_edge.cli import main
+sys.argv = ["vol-edge", "backtest", "--config", {str(config)!r}]
+main()
+print(json.dumps(sorted(m for m in {PROVIDER_MODULES!r} if m in sys.modules)))
+"""
+    )
+    assert loaded == []
+
+
+def test_cli_import_fits_startup_budget():
+    timings = [
+        _run("import json, time; t = time.perf_counter(); import vol_edge.cli; print(json.dumps(time.perf_counter() - t))")
+        for _ in range(3)
+    ]
+    assert min(timings) < STARTUP_BUDGET_S
+
+
+def test_ibkr_exports_resolve_on_first_access():
+    import vol_edge.data as data
+
+    assert data.IBKRClient.__name__ == "IBKRClient"
+    assert hasattr(data.ibkr_snapshots, "build_signal_snapshots")
+    assert "IBKRClient" in data.__all__
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from vol_edge.data.ibkr.minute_store import SCHEMA_VERSION, MinuteStore
+
+
+def _bars(start: str, periods: int, freq: str = "min", close: float = 100.0) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq=freq, tz="America/New_York")
+    prices = close + np.arange(periods) * 0.25
+    return pd.DataFrame(
+        {"open": prices, "high": prices + 0.1, "low": prices - 0.1, "close": prices, "volume": np.arange(periods) * 10.0},
+        index=idx,
+    )
+
+
+def test_store_round_trips_compact_partitions(tmp_path):
+    store = MinuteStore(tmp_path / "SPY_1min")
+    bars = _bars("2020-01-31 15:00", 3, freq="D")  # Jan 31, Feb 1, Feb 2
+    store.write(bars)
+
+    assert [p.relative_to(store.root).as_posix() for p in map(store.partition_path, store.months())] == [
+        "year=2020/month=01/part.parquet",
+        "year=2020/month=02/part.parquet",
+    ]
+    meta = pq.read_metadata(store.partition_path(store.months()[0]))
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+    assert pq.read_schema(store.partition_path(store.months()[0])).field("ts").type == "int64"
+
+    out = store.read()
+    assert out.index.equals(bars.index)
+    assert out.dtypes.to_dict() == {
+        "open": np.float32,
+        "high": np.float32,
+        "low": np.float32,
+        "close": np.float32,
+        "volume": np.int32,
+    }
+    np.testing.assert_allclose(out["close"], bars["close"], rtol=1e-6)
+    assert store.bounds() == (bars.index[0].tz_convert("UTC"), bars.index[-1].tz_convert("UTC"))
+
+
+def test_store_reads_only_months_in_range(tmp_path, monkeypatch):
+    store = MinuteStore(tmp_path / "SPY_1min")
+    store.write(_bars("2020-01-15 10:00", 120, freq="D"))
+    scanned = []
+    original = store._files
+    monkeypatch.setattr(store, "_files", lambda lo, hi: scanned.extend(original(lo, hi)) or original(lo, hi))
+
+    out = store.read(pd.Timestamp("2020-03-05", tz="UTC"), pd.Timestamp("2020-03-07 14:00", tz="UTC"), columns=["close"])
+
+    assert list(out.columns) == ["close"]
+    assert [ts.day for ts in out.index] == [5, 6]
+    assert {p.parent.name for p in scanned} == {"month=03"}
+    assert store.read(pd.Timestamp("2030-01-01", tz="UTC")).empty
+
+
+def test_store_write_merges_and_new_bars_win(tmp_path):
+    store = MinuteStore(tmp_path / "SPY_1min")
+    store.write(_bars("2020-01-02 09:30", 5, close=100.0))
+    store.write(_bars("2020-01-02 09:33", 5, close=200.0))
+
+    out = store.read()
+    assert len(out) == 8
+    assert out.index.is_unique and out.index.is_monotonic_increasing
+    assert out["close"].iloc[2] == pytest.approx(100.5)
+    assert out["close"].iloc[3] == pytest.approx(200.0)
+
+
+def test_store_rejects_other_schema_versions(tmp_path):
+    root = tmp_path / "SPY_1min"
+    MinuteStore(root).write(_bars("2020-01-02 09:30", 2))
+    assert json.loads((root / "schema.json").read_text())["schema_version"] == SCHEMA_VERSION
+
+    (root / "schema.json").write_text(json.dumps({"schema_version": SCHEMA_VERSION + 1}))
+    with pytest.raises(RuntimeError, match="schema version"):
+        MinuteStore(root)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vol_edge.config import MissingDataPolicy
+from vol_edge.data import MarketData, MissingDataError, build_panel
+
+from test_backtest import make_frame
+
+
+def _bundle(length: int = 6) -> MarketData:
+    return MarketData(
+        spy=make_frame([100.0 + i for i in range(length)]),
+        vix=make_frame([20.0 + i for i in range(length)]),
+        vix3m=make_frame([22.0 + i for i in range(length)]),
+        long_vol=make_frame([10.0 + i for i in range(length)]),
+        short_vol=make_frame([40.0 + i for i in range(length)]),
+    )
+
+
+def test_panel_aligns_symbols_on_spy_dates():
+    data = _bundle()
+    data.vix3m = pd.concat([data.vix3m, make_frame([99.0]).set_axis([pd.Timestamp("2021-06-01")])])
+    panel = build_panel(data)
+    assert panel.values.shape == (6, 5, 5)
+    assert panel.values.flags["C_CONTIGUOUS"]
+    assert list(panel.dates) == list(data.spy.index)
+    assert panel.column("short_vol")[panel.offset(data.spy.index[2])] == 42.0
+
+
+def test_adj_close_falls_back_to_close():
+    data = _bundle()
+    data.vix = data.vix.assign(adj_close=pd.NA)
+    panel = build_panel(data)
+    np.testing.assert_array_equal(panel.column("vix"), panel.column("vix", "close"))
+
+
+def test_missing_policies():
+    data = _bundle()
+    dates = data.spy.index
+    data.long_vol = data.long_vol.drop([dates[0], dates[3]])
+
+    with pytest.raises(MissingDataError, match="long_vol"):
+        build_panel(data, MissingDataPolicy.FAIL)
+
+    filled = build_panel(data, MissingDataPolicy.FFILL)
+    # Leading gap has nothing to carry forward, so that date is dropped.
+    assert list(filled.dates) == list(dates[1:])
+    assert filled.column("long_vol")[filled.offset(dates[3])] == 12.0
+
+    dropped = build_panel(data, MissingDataPolicy.DROP)
+    assert list(dropped.dates) == [dates[1], dates[2], dates[4], dates[5]]
+
+
+def test_market_data_caches_panel_per_policy():
+    data = _bundle()
+    first = data.aligned()
+    assert data.aligned() is first
+    assert data.aligned(MissingDataPolicy.DROP) is not first
+    assert data.aligned(MissingDataPolicy.DROP).since(data.spy.index[2]).dates[0] == data.spy.index[2]
@@ -0,0 +1,80 @@
+import pstats
+
+import numpy as np
+import pytest
+
+from test_backtest import build_random_bundle
+from vol_edge.config import BacktestEngine, load_config
+from vol_edge.exec.backtest import run_backtest
+from vol_edge.profiling import Profiler, active, profiled, stage
+from vol_edge.reports import compute_metrics
+
+
+def _config(dates):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "backtest": {"start_date": str(dates[0].date()), "end_date": str(dates[-1].date())},
+        }
+    )
+
+
+def test_stage_is_shared_noop_when_disabled():
+    assert active() is None
+    assert stage("a") is stage("b")
+    with stage("a"):
+        pass
+
+
+def test_profiler_records_calls_wall_time_and_nested_peak():
+    @profiled("outer")
+    def outer():
+        with stage("inner"):
+            block = np.ones(500_000)
+        return block.sum()
+
+    with Profiler() as profiler:
+        for _ in range(3):
+            outer()
+        with stage("batch", calls=10):
+            pass
+
+    stats = profiler.stats
+    assert [name for name in stats] == ["outer", "inner", "batch"]
+    assert stats["outer"].calls == 3
+    assert stats["batch"].calls == 10
+    assert stats["outer"].wall_s >= stats["inner"].wall_s > 0
+    assert stats["inner"].peak_bytes >= 4_000_000
+    assert stats["outer"].peak_bytes >= stats["inner"].peak_bytes
+    assert active() is None
+    assert list(profiler.table()["stage"]) == ["outer", "inner", "batch"]
+
+
+def test_profiler_rejects_nesting():
+    with Profiler(memory=False):
+        with pytest.raises(RuntimeError):
+            Profiler().__enter__()
+
+
+@pytest.mark.parametrize("engine", [BacktestEngine.LOOP, BacktestEngine.VECTORIZED])
+def test_backtest_stages_are_profiled(engine, tmp_path):
+    bundle, dates = build_random_bundle(length=120)
+    config = _config(dates)
+
+    with Profiler(cprofile=True) as profiler:
+        result = run_backtest(config, data=bundle, engine=engine)
+        compute_metrics(result.equity_curve)
+
+    stats = profiler.stats
+    days = len(result.equity_curve)
+    assert stats["data.panel"].calls == 1
+    assert stats["strategy.target_weights"].calls == days
+    assert stats["portfolio.rebalance"].calls == days
+    assert stats["reports.metrics"].calls == 1
+    hot = "engine.loop" if engine is BacktestEngine.LOOP else "engine.simulate"
+    assert stats[hot].wall_s >= stats["strategy.target_weights"].wall_s
+
+    dump = tmp_path / "hot.pstats"
+    profiler.dump_stats(dump)
+    functions = {func[2] for func in pstats.Stats(str(dump)).stats}
+    assert ("target_weights" if engine is BacktestEngine.LOOP else "target_weights_batch") in functions
@@ -1,9 +1,22 @@
 import math
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from vol_edge.signals import TermStructureState, compute_erv30, compute_evrp, compute_term_structure_state
+from vol_edge.signals import (
+    TERM_STATES,
+    RollingRealizedVol,
+    StreamingSignals,
+    TermStructureState,
+    compute_erv30,
+    compute_erv30_series,
+    compute_evrp,
+    compute_evrp_array,
+    compute_realized_vol_estimators,
+    compute_term_structure_codes,
+    compute_term_structure_state,
+)
 
 
 def test_compute_erv30_matches_manual_std():
@@ -26,5 +39,131 @@ def test_term_structure_state_with_epsilon():
     assert compute_term_structure_state(20.0, 20.0) is TermStructureState.CONTANGO
 
 
+def test_term_structure_codes_match_scalar_rule():
+    rng = np.random.default_rng(1)
+    vix = np.round(rng.uniform(10, 40, 500), 1)
+    vix3m = np.round(vix + rng.choice([-0.25, -0.1, 0.0, 0.1, 0.25, 2.0], 500), 2)
+    vix3m[:3] = [np.nan, vix[1], vix[2] + 0.25]  # NaN and exact ties go to contango
+    for epsilon in (0.0, 0.1, 0.25):
+        codes = compute_term_structure_codes(vix, vix3m, epsilon)
+        assert codes.dtype == np.int8
+        expected = [compute_term_structure_state(v, v3, epsilon) for v, v3 in zip(vix.tolist(), vix3m.tolist())]
+        assert [TERM_STATES[code] for code in codes] == expected
+    assert compute_term_structure_codes(vix[:3], vix3m[:3], 0.25).tolist() == [0, 0, 0]
+
+
+def test_evrp_array_matches_scalar():
+    vix = np.array([18.0, 25.5, 12.0])
+    erv30 = np.array([12.5, 30.0, np.nan])
+    result = compute_evrp_array(vix, erv30)
+    assert result[:2].tolist() == [compute_evrp(18.0, 12.5), compute_evrp(25.5, 30.0)]
+    assert np.isnan(result[2])
+
+
 def test_evrp_calculation():
     assert compute_evrp(18.0, 12.5) == pytest.approx(5.5)
+
+
+def test_compute_erv30_series_matches_scalar_windows():
+    rng = np.random.default_rng(3)
+    closes = pd.Series(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60))),
+        index=pd.date_range("2020-01-01", periods=60, freq="B"),
+    )
+    series = compute_erv30_series(closes)
+    assert series.index.equals(closes.index)
+    assert series.iloc[:10].isna().all()
+    for i in range(10, len(closes)):
+        assert series.iloc[i] == pytest.approx(compute_erv30(closes.iloc[i - 10 : i + 1]), rel=1e-12)
+
+
+def test_compute_erv30_series_accepts_plain_sequences():
+    prices = [100 + i for i in range(12)]
+    values = compute_erv30_series(prices)
+    assert isinstance(values, np.ndarray)
+    assert values[-1] == pytest.approx(compute_erv30(prices))
+    assert np.isnan(compute_erv30_series([100, 101])).all()
+
+
+def test_rolling_realized_vol_matches_scalar_after_push_and_replace():
+    rng = np.random.default_rng(11)
+    closes = list(100 * np.exp(np.cumsum(rng.normal(0, 0.012, 400))))
+    acc = RollingRealizedVol()
+    history = []
+    for i, close in enumerate(closes):
+        value = acc.push(close)
+        history.append(close)
+        if len(history) < 11:
+            assert value is None
+            continue
+        assert value == pytest.approx(compute_erv30(history), rel=1e-9)
+        if i % 7 == 0:  # revise the forming bar a few times
+            for tick in close * (1 + rng.normal(0, 0.002, 5)):
+                history[-1] = tick
+                assert acc.replace_last(tick) == pytest.approx(compute_erv30(history), rel=1e-9)
+
+
+def test_streaming_signals_matches_scalar_signals():
+    closes = [100 + 0.7 * i + (-1) ** i for i in range(11)]
+    stream = StreamingSignals(closes, epsilon=0.1)
+    state = stream.open_bar(112.0, vix=20.0, vix3m=20.05)
+    expected = compute_erv30(closes + [112.0])
+    assert state.erv30 == pytest.approx(expected, rel=1e-9)
+    assert state.evrp == pytest.approx(compute_evrp(20.0, expected), rel=1e-9)
+    assert state.term_structure is TermStructureState.CONTANGO  # inside epsilon ties to contango
+
+    state = stream.update(109.5, vix=22.0, vix3m=21.0)
+    assert state.erv30 == pytest.approx(compute_erv30(closes + [109.5]), rel=1e-9)
+    assert state.term_structure is TermStructureState.BACKWARDATION
+
+
+def test_rolling_realized_vol_needs_a_full_window():
+    acc = RollingRealizedVol.from_closes([100, 101, 102])
+    assert not acc.ready
+    with pytest.raises(ValueError):
+        acc.erv30
+    with pytest.raises(ValueError):
+        RollingRealizedVol().replace_last(100.0)
+
+
+def _ohlc(length: int = 80, seed: int = 9) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    open_ = close * (1 + rng.normal(0, 0.004, length))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, length)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, length)))
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close},
+        index=pd.date_range("2020-01-01", periods=length, freq="B"),
+    )
+
+
+def test_realized_vol_estimators_match_textbook_formulas():
+    bars = _ohlc()
+    table = compute_realized_vol_estimators(bars, ewma_lambda=0.9)
+    scale = math.sqrt(252) * 100
+    assert list(table.columns) == ["close_to_close", "parkinson", "garman_klass", "ewma"]
+    assert table.iloc[:10].isna().all().all()
+    np.testing.assert_allclose(table["close_to_close"], compute_erv30_series(bars["close"]), rtol=1e-12)
+
+    window = bars.iloc[30:40]
+    hl = np.log(window["high"] / window["low"]) ** 2
+    co = np.log(window["close"] / window["open"]) ** 2
+    assert table["parkinson"].iloc[39] == pytest.approx(math.sqrt(hl.mean() / (4 * math.log(2))) * scale, rel=1e-10)
+    gk = (0.5 * hl - (2 * math.log(2) - 1) * co).mean()
+    assert table["garman_klass"].iloc[39] == pytest.approx(math.sqrt(gk) * scale, rel=1e-10)
+
+    returns = bars["close"].pct_change().to_numpy()[1:]
+    variance = float(np.mean(returns[:10] ** 2))
+    for r in returns[10:40]:
+        variance = 0.9 * variance + 0.1 * r * r
+    assert table["ewma"].iloc[40] == pytest.approx(math.sqrt(variance) * scale, rel=1e-10)
+
+
+def test_realized_vol_estimators_isolate_missing_ranges():
+    bars = _ohlc()
+    bars.iloc[50, bars.columns.get_loc("high")] = np.nan
+    table = compute_realized_vol_estimators(bars)
+    assert table["parkinson"].iloc[50:60].isna().all()
+    assert table["parkinson"].iloc[[49, 60]].notna().all()
+    assert table["close_to_close"].iloc[10:].notna().all()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from vol_edge.config import load_config
+from vol_edge.data.ibkr import snapshots as snap
+from vol_edge.data.ibkr.downloader import cache_path
+from vol_edge.data.ibkr.minute_store import MinuteStore
+from vol_edge.data.ibkr.snapshot_cache import load_signal_snapshots
+from vol_edge.data.synthetic import generate_minute_bars, write_minute_cache
+
+
+@pytest.fixture
+def minute_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    syncs = []
+
+    def recording_sync(requests, *args):
+        syncs.append([symbol for symbol, _ in requests])
+        return snap._open_stores()
+
+    monkeypatch.setattr(snap, "sync_minutes", recording_sync)
+    bars = generate_minute_bars(0.25, seed=4, start="2021-01-04")
+    cutoff = pd.Timestamp("2021-03-01", tz="America/New_York")
+    write_minute_cache({symbol: frame.loc[frame.index < cutoff] for symbol, frame in bars.items()})
+    builds = []
+    original = snap.build_signal_snapshots
+
+    def counting_build(config, start, end, snapshot_time=snap.SNAPSHOT_TIME, **kwargs):
+        builds.append((start, end))
+        return original(config, start, end, snapshot_time, **kwargs)
+
+    monkeypatch.setattr(snap, "build_signal_snapshots", counting_build)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "data": {"provider": "ibkr"},
+            "backtest": {"start_date": "2021-01-04"},
+        }
+    )
+    return config, bars, cutoff, builds, original, syncs
+
+
+def test_snapshot_cache_serves_repeat_loads_from_disk(minute_cache):
+    config, _, _, builds, original, _ = minute_cache
+
+    first = load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+    pd.testing.assert_frame_equal(first, original(config, date(2021, 1, 4), date(2021, 2, 26)))
+    assert builds == [(date(2021, 1, 4), date(2021, 2, 26))]
+
+    lookback = load_signal_snapshots(config, date(2021, 2, 6), date(2021, 2, 26))
+    assert len(builds) == 1
+    pd.testing.assert_frame_equal(lookback, first.loc["2021-02-06":])
+
+
+def test_snapshot_cache_rebuilds_only_changed_months_and_new_days(minute_cache):
+    config, bars, cutoff, builds, original, _ = minute_cache
+    load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+
+    # a top-up lands new March bars and rewrites February's SPY partition
+    for symbol, frame in bars.items():
+        MinuteStore(cache_path(symbol)).write(frame.loc[(frame.index >= cutoff - pd.Timedelta(days=3))])
+    extended = load_signal_snapshots(config, date(2021, 1, 4), date(2021, 3, 31))
+
+    assert builds[-1] == (date(2021, 2, 1), date(2021, 3, 31))
+    pd.testing.assert_frame_equal(extended, original(config, date(2021, 1, 4), date(2021, 3, 31)))
+
+    load_signal_snapshots(config, date(2021, 3, 1), date(2021, 3, 31))
+    assert len(builds) == 2
+
+
+def test_snapshot_cache_syncs_the_minute_stores_once_per_load(minute_cache, monkeypatch):
+    config, _, _, builds, _, syncs = minute_cache
+    shutil.rmtree(cache_path("^VIX3M"))  # IBKR refuses VIX3M: its store stays empty and Yahoo fills in
+    yahoo = []
+
+    def fake_daily(start, end):
+        yahoo.append((start, end))
+        days = pd.bdate_range("2020-12-01", "2021-03-01", tz="America/New_York")
+        return pd.DataFrame({"close": 25.0}, index=days + pd.Timedelta(hours=16))
+
+    monkeypatch.setattr(snap, "fetch_vix3m_daily", fake_daily)
+
+    frame = load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+
+    assert len(builds) == 1 and not frame.empty
+    assert syncs == [["SPY", "^VIX", "^VIX3M"]]
+    assert len(yahoo) == 1
+
+
+def test_snapshot_cache_fingerprints_the_yahoo_vix3m_fallback(minute_cache, monkeypatch):
+    config, bars, _, builds, original, _ = minute_cache
+    shutil.rmtree(cache_path("^VIX3M"))
+    # IBKR minutes from outside the window don't make IBKR the source for it
+    stray = bars["^VIX3M"].iloc[:10].copy()
+    stray.index = stray.index - pd.Timedelta(days=400)
+    MinuteStore(cache_path("^VIX3M")).write(stray)
+    days = pd.bdate_range("2020-12-01", "2021-03-01", tz="America/New_York") + pd.Timedelta(hours=16)
+    daily = pd.DataFrame({"close": 25.0}, index=days)
+    monkeypatch.setattr(snap, "fetch_vix3m_daily", lambda start, end: daily.copy())
+
+    first = load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+    assert (first["vix3m"] == 25.0).all()
+    load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+    assert len(builds) == 1
+
+    daily.loc[daily.index >= pd.Timestamp("2021-02-10", tz="America/New_York"), "close"] = 26.0  # Yahoo revises
+    revised = load_signal_snapshots(config, date(2021, 1, 4), date(2021, 2, 26))
+    assert builds[-1] == (date(2021, 2, 1), date(2021, 2, 26))
+    assert revised.loc["2021-02-11":, "vix3m"].eq(26.0).all()
+    assert revised.loc[:"2021-01-29", "vix3m"].eq(25.0).all()
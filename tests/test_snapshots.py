@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, time
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from vol_edge.config import load_config
 from vol_edge.data.ibkr import snapshots as snap
 
+_STORES = dict.fromkeys(("SPY", "^VIX", "^VIX3M"))
+
 
 def _make_minutes(day: str, base: float) -> pd.DataFrame:
     idx = pd.date_range(f"{day} 15:40", periods=10, freq="min", tz="America/New_York")
@@ -23,15 +26,16 @@ def test_build_signal_snapshots(monkeypatch):
     vix = spy * 0 + 20
     vix3m = spy * 0 + 25
 
-    def fake_prepare(symbol, builder, config, start, end):
+    def fake_prepare(symbol, store, start, end):
         if symbol == "SPY":
             return spy
         if symbol == "^VIX":
             return vix
         raise AssertionError("unexpected symbol")
 
+    monkeypatch.setattr(snap, "_prefetch_minutes", lambda *args: _STORES)
     monkeypatch.setattr(snap, "_prepare_minutes", fake_prepare)
-    monkeypatch.setattr(snap, "load_vix3m_with_fallback", lambda *args, **kwargs: vix3m)
+    monkeypatch.setattr(snap, "_load_vix3m", lambda *args: vix3m)
 
     config = load_config(
         {
@@ -45,3 +49,89 @@ def test_build_signal_snapshots(monkeypatch):
     assert len(df) == 2
     assert df.iloc[0]["spy"] == pytest.approx(100.5)
     assert df.iloc[1]["spy"] == pytest.approx(101.5)
+
+
+def _reference_asof(df: pd.DataFrame, target: pd.Timestamp):
+    subset = df.loc[:target]
+    return None if subset.empty else float(subset["close"].iloc[-1])
+
+
+def test_snapshots_sample_last_bar_at_or_before_target(monkeypatch):
+    rng = np.random.default_rng(7)
+    days = pd.bdate_range("2021-03-01", periods=30)
+    stamps = []
+    for day in days:
+        minutes = pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=390, freq="min", tz="America/New_York")
+        stamps.append(minutes[rng.random(390) > 0.6])  # ragged, often missing 15:45 itself
+    spy = pd.DataFrame({"close": rng.normal(400, 5, sum(map(len, stamps)))}, index=stamps[0].append(stamps[1:]))
+    vix = spy.iloc[::7] * 0 + rng.normal(20, 1, len(spy.iloc[::7]))[:, None]
+    vix = vix.loc[vix.index >= pd.Timestamp("2021-03-03 15:50", tz="America/New_York")]  # no VIX before day 3
+    # daily prior-close fallback stamped at 16:00, as fetch_vix3m_daily returns it
+    vix3m = pd.DataFrame({"close": np.arange(len(days), dtype=float) + 25}, index=days.tz_localize("America/New_York") + pd.Timedelta(hours=16))
+
+    monkeypatch.setattr(snap, "_prefetch_minutes", lambda *args: _STORES)
+    monkeypatch.setattr(snap, "_prepare_minutes", lambda symbol, *args: spy if symbol == "SPY" else vix)
+    monkeypatch.setattr(snap, "_load_vix3m", lambda *args: vix3m)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "data": {"provider": "ibkr"},
+            "backtest": {"start_date": "2021-03-01"},
+        }
+    )
+
+    df = snap.build_signal_snapshots(config, date(2021, 3, 2), date(2021, 4, 1))
+
+    expected = {}
+    for day in days[(days >= "2021-03-02") & (days <= "2021-04-01")]:
+        target = (day + pd.Timedelta(hours=15, minutes=45)).tz_localize("America/New_York")
+        values = [_reference_asof(frame, target) for frame in (spy, vix, vix3m)]
+        if None not in values:
+            expected[day] = values
+    assert list(df.index) == list(expected)
+    assert df.index[0] == pd.Timestamp("2021-03-04")
+    np.testing.assert_allclose(df[["spy", "vix", "vix3m"]].to_numpy(), np.array(list(expected.values())))
+    assert (df["vix3m"].to_numpy() == np.arange(3, 3 + len(df)) + 25 - 1).all()  # prior close
+
+
+def test_snapshot_surface_samples_every_time_in_one_pass(monkeypatch):
+    days = pd.bdate_range("2021-06-01", periods=5)
+    idx = pd.DatetimeIndex(
+        np.concatenate(
+            [pd.date_range(d + pd.Timedelta(hours=9, minutes=30), periods=390, freq="min", tz="America/New_York") for d in days]
+        )
+    )
+    minute_of_day = (idx.hour - 9) * 60 + idx.minute - 30
+    spy = pd.DataFrame({"close": 400 + idx.day * 1.0 + minute_of_day / 1000}, index=idx)
+    vix = pd.DataFrame({"close": 20 + minute_of_day / 1000}, index=idx)
+    vix3m = pd.DataFrame({"close": 22 + minute_of_day / 1000}, index=idx)
+    loads = []
+
+    def fake_prepare(symbol, *args):
+        loads.append(symbol)
+        return spy if symbol == "SPY" else vix
+
+    monkeypatch.setattr(snap, "_prefetch_minutes", lambda *args: _STORES)
+    monkeypatch.setattr(snap, "_prepare_minutes", fake_prepare)
+    monkeypatch.setattr(snap, "_load_vix3m", lambda *args: vix3m)
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "data": {"provider": "ibkr"},
+            "backtest": {"start_date": "2021-06-01"},
+        }
+    )
+
+    surface = snap.build_snapshot_surface(config, date(2021, 6, 1), date(2021, 6, 7))
+
+    assert loads == ["SPY", "^VIX"]
+    assert surface.values.shape == (5, len(snap.SURFACE_TIMES), 3)
+    assert surface.times == snap.SURFACE_TIMES
+    vix_by_time = surface.field("vix")
+    assert vix_by_time[snap.CLOSE_TIME].tolist() == pytest.approx([20.389] * 5)  # 15:59 bar
+    assert vix_by_time[snap.SNAPSHOT_TIME].tolist() == pytest.approx([20.375] * 5)
+    for t in snap.SURFACE_TIMES:
+        single = snap.build_signal_snapshots(config, date(2021, 6, 1), date(2021, 6, 7), snapshot_time=t)
+        pd.testing.assert_frame_equal(surface.frame(t), single)
+    with pytest.raises(KeyError):
+        surface.frame(time(12, 0))
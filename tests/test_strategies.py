@@ -1,8 +1,21 @@
 from __future__ import annotations
 
-from vol_edge.config import StrategyConfig, StrategyName
-from vol_edge.signals import TermStructureState
-from vol_edge.strategies import StrategyContext, build_strategy
+import numpy as np
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from vol_edge.config import StrategyConfig, StrategyName, load_config
+from vol_edge.signals import TERM_STATES, TermStructureState, compute_term_structure_codes
+from vol_edge.strategies import (
+    BUILTIN_TABLES,
+    ROLES,
+    Strategy,
+    StrategyContext,
+    StrategyDecision,
+    TableStrategy,
+    build_strategy,
+)
 
 
 def make_ctx(vix=20.0, vix3m=22.0, erv30=10.0, evrp=10.0, state=TermStructureState.CONTANGO):
@@ -50,3 +63,126 @@ def test_evrp_boc_sizing_caps_exposure():
     ctx3 = make_ctx(vix=30, evrp=-1.0, state=TermStructureState.BACKWARDATION)
     decision3 = strat.target_weights(ctx3)
     assert decision3.weights["long_vol"] == 0.30  # capped by max exposure
+
+
+def _scalar_matrix(strategy, vix, vix3m, erv30, evrp, codes):
+    out = np.full((len(vix), len(ROLES)), np.nan)
+    for i in range(len(vix)):
+        ctx = StrategyContext(
+            vix=float(vix[i]),
+            vix3m=float(vix3m[i]),
+            erv30=float(erv30[i]),
+            evrp=float(evrp[i]),
+            term_structure=TERM_STATES[codes[i]],
+        )
+        for role, weight in strategy.target_weights(ctx).weights.items():
+            out[i, ROLES.index(role)] = weight
+    return out
+
+
+def _random_signals(rng, n=400):
+    vix = np.round(rng.uniform(8, 90, n), 2)
+    vix3m = vix + rng.choice([-3.0, -0.1, 0.0, 0.1, 3.0], n)
+    erv30 = rng.uniform(0, 60, n)
+    evrp = vix - erv30
+    evrp[rng.random(n) < 0.1] = 0.0  # exercise the evrp == 0 branches
+    cfg = StrategyConfig(
+        max_vol_exposure_pct=float(rng.choice([0.05, 0.15, 0.3, 0.4])),
+        size_rule_divisor=float(rng.choice([50.0, 100.0, 150.0])),
+        half_sizing_in_contango_when_neg_evrp=bool(rng.integers(2)),
+    )
+    codes = compute_term_structure_codes(vix, vix3m, float(rng.choice([0.0, 0.1])))
+    return cfg, (vix, vix3m, erv30, evrp, codes)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("name", list(StrategyName))
+def test_target_weights_batch_matches_scalar_path(name, seed):
+    cfg, signals = _random_signals(np.random.default_rng(seed))
+    strategy = build_strategy(cfg.model_copy(update={"name": name}))
+
+    batch = strategy.target_weights_batch(*signals)
+    np.testing.assert_array_equal(batch, _scalar_matrix(strategy, *signals))
+
+
+def test_target_weights_batch_falls_back_to_scalar_decisions():
+    class Contrarian(Strategy):
+        def target_weights(self, ctx):
+            return StrategyDecision({"long_vol": 0.1} if ctx.term_structure is TermStructureState.CONTANGO else {})
+
+    vix = np.array([20.0, 25.0])
+    batch = Contrarian(StrategyConfig()).target_weights_batch(vix, vix + 1, vix, vix, np.array([0, 1], dtype=np.int8))
+    np.testing.assert_array_equal(batch[:, ROLES.index("long_vol")], [0.1, np.nan])
+    assert np.isnan(batch[:, ROLES.index("short_vol")]).all()
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("name", list(StrategyName))
+def test_builtin_tables_reproduce_table2_strategies(name, seed):
+    cfg, signals = _random_signals(np.random.default_rng(seed))
+    cfg = cfg.model_copy(update={"name": name})
+    reference = build_strategy(cfg)
+    table = TableStrategy(cfg, BUILTIN_TABLES[name])
+
+    np.testing.assert_array_equal(table.target_weights_batch(*signals), reference.target_weights_batch(*signals))
+    for vix, vix3m, erv30, evrp, code in list(zip(*(column.tolist() for column in signals)))[:100]:
+        ctx = StrategyContext(vix=vix, vix3m=vix3m, erv30=erv30, evrp=evrp, term_structure=TERM_STATES[code])
+        assert table.target_weights(ctx).weights == reference.target_weights(ctx).weights
+
+
+def test_yaml_table_strategy_scalar_and_batch_agree(tmp_path):
+    table_path = tmp_path / "calm_only.yaml"
+    table_path.write_text(
+        yaml.safe_dump(
+            {
+                "params": {"floor": 0.05},
+                "rules": [
+                    {"when": {"vix_min": 30}, "weights": {}},
+                    {
+                        "when": {"evrp": "positive", "term": "contango", "vix_max": 30},
+                        "weights": {"short_vol": "max(floor, evrp / divisor)"},
+                    },
+                    {"when": {"term": "backwardation"}, "weights": {"long_vol": 0.1}},
+                ],
+            }
+        )
+    )
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "strategy": {"table": str(table_path), "max_vol_exposure_pct": 0.3},
+            "backtest": {"start_date": "2020-01-01"},
+        }
+    )
+    strategy = build_strategy(config.strategy)
+    assert isinstance(strategy, TableStrategy)
+
+    assert strategy.target_weights(make_ctx(vix=35.0)).weights == {}
+    assert strategy.target_weights(make_ctx(vix=20.0, evrp=2.0)).weights == {"short_vol": 0.05}
+    assert strategy.target_weights(make_ctx(vix=20.0, evrp=50.0)).weights == {"short_vol": 0.3}
+    backward = make_ctx(vix=20.0, evrp=-1.0, state=TermStructureState.BACKWARDATION)
+    assert strategy.target_weights(backward).weights == {"long_vol": 0.1}
+
+    _, signals = _random_signals(np.random.default_rng(11))
+    np.testing.assert_array_equal(
+        strategy.target_weights_batch(*signals), _scalar_matrix(strategy, *signals)
+    )
+
+
+def test_decision_tables_reject_unsafe_or_unknown_entries():
+    def table(**rule):
+        return StrategyConfig(table={"rules": [rule]})
+
+    for expression in ("__import__('os')", "vix.real", "vix ** 2", "gamma * 2", "min(vix, key=abs)"):
+        with pytest.raises(ValueError):
+            build_strategy(table(weights={"short_vol": expression}))
+    with pytest.raises(ValueError, match="Unknown strategy role"):
+        build_strategy(table(weights={"spy": 0.1}))
+    with pytest.raises(ValidationError):
+        table(when={"evrp_sign": "positive"}, weights={"short_vol": 0.1})
+    with pytest.raises(ValidationError):
+        table(when={"evrp": "positive"}, weight={"short_vol": 0.1})
+    with pytest.raises(ValidationError):
+        StrategyConfig(table={"drop_zero_weight": False, "rules": []})
+    with pytest.raises(ValueError, match="shadow"):
+        build_strategy(StrategyConfig(table={"params": {"cap": 1.0}, "rules": []}))
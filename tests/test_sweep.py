@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from vol_edge.config import load_config
+from vol_edge.exec.backtest import run_backtest
+from vol_edge.exec.sweep import expand_grid, parse_range, run_sweep
+from vol_edge.reports import compute_metrics
+
+from test_backtest import build_random_bundle
+
+
+def _config(dates):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "strategy": {"name": "evrp_boc_sizing"},
+            "backtest": {"start_date": str(dates[0].date()), "end_date": str(dates[-1].date())},
+        }
+    )
+
+
+def test_parse_range_is_inclusive():
+    assert parse_range("0:100:5") == [float(v) for v in range(0, 101, 5)]
+    assert parse_range("0.01:0.03:0.01") == [0.01, 0.02, 0.03]
+    with pytest.raises(ValueError):
+        parse_range("1:2")
+
+
+def test_expand_grid_builds_cartesian_product():
+    points = expand_grid({"rebalance_threshold_pct": [0.01, 0.02], "trade_cost_bps": "0,5", "name": ["evrp"]})
+    assert len(points) == 4
+    assert points[0] == {"rebalance_threshold_pct": 0.01, "trade_cost_bps": "0", "name": "evrp"}
+    with pytest.raises(ValueError):
+        expand_grid({"not_a_knob": [1]})
+
+
+def test_run_sweep_matches_individual_backtests():
+    bundle, dates = build_random_bundle(length=120)
+    config = _config(dates)
+    grid = {"rebalance_threshold_pct": [0.0, 0.05], "size_rule_divisor": [50, 100]}
+
+    table = run_sweep(config, grid, data=bundle, workers=1)
+
+    assert list(table.columns[:2]) == ["rebalance_threshold_pct", "size_rule_divisor"]
+    assert len(table) == 4
+    for row in table.itertuples(index=False):
+        point = config.model_copy(
+            update={
+                "strategy": config.strategy.model_copy(
+                    update={"rebalance_threshold_pct": row.rebalance_threshold_pct, "size_rule_divisor": row.size_rule_divisor}
+                )
+            }
+        )
+        expected = run_backtest(point, data=bundle)
+        metrics = compute_metrics(expected.equity_curve)
+        assert row.final_equity == pytest.approx(expected.equity_curve.iloc[-1])
+        assert row.sharpe == pytest.approx(metrics.sharpe)
+
+
+def test_run_sweep_recomputes_signals_per_erv30_estimator():
+    bundle, dates = build_random_bundle(length=120)
+    config = _config(dates)
+    grid = {"erv30_estimator": ["close_to_close", "parkinson", "ewma"], "ewma_lambda": [0.9, 0.97]}
+
+    table = run_sweep(config, grid, data=bundle, workers=1)
+
+    for row in table.itertuples(index=False):
+        strategy = config.strategy.model_copy(update={"erv30_estimator": row.erv30_estimator, "ewma_lambda": row.ewma_lambda})
+        expected = run_backtest(config.model_copy(update={"strategy": strategy}), data=bundle)
+        assert row.final_equity == pytest.approx(expected.equity_curve.iloc[-1], rel=1e-12)
+    assert table["final_equity"].nunique() == 4  # lambda only matters for ewma
+
+
+def test_run_sweep_process_pool_matches_in_process():
+    bundle, dates = build_random_bundle(length=80)
+    config = _config(dates)
+    grid = {"term_structure_epsilon": [0.0, 0.5], "name": ["evrp", "evrp_boc"]}
+
+    serial = run_sweep(config, grid, data=bundle, workers=1)
+    parallel = run_sweep(config, grid, data=bundle, workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
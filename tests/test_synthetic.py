@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from vol_edge.config import BacktestEngine, load_config
+from vol_edge.data.synthetic import MINUTES_PER_DAY, generate_daily_market_data, generate_minute_bars
+from vol_edge.exec.backtest import run_backtest
+
+
+def test_daily_generator_is_seeded_and_switches_regimes():
+    first = generate_daily_market_data(5, seed=11)
+    second = generate_daily_market_data(5, seed=11)
+    other = generate_daily_market_data(5, seed=12)
+
+    pd.testing.assert_frame_equal(first.vix, second.vix)
+    assert not np.allclose(first.vix["close"], other.vix["close"])
+    assert len(first.spy) == 5 * 252
+    for frame in (first.spy, first.vix, first.vix3m, first.long_vol, first.short_vol):
+        assert frame.index.equals(first.spy.index)
+        assert (frame["close"] > 0).all()
+        assert (frame["high"] >= frame[["open", "close"]].max(axis=1)).all()
+
+    backwardation = (first.vix3m["close"] < first.vix["close"]).mean()
+    assert 0.02 < backwardation < 0.6
+
+
+def test_minute_bars_close_on_daily_path():
+    bars = generate_minute_bars(0.1, seed=3, start="2021-03-01")
+    daily = generate_daily_market_data(0.1, seed=3, start="2021-03-01")
+
+    spy = bars["SPY"]
+    assert set(bars) == {"SPY", "^VIX", "^VIX3M"}
+    assert str(spy.index.tz) == "America/New_York"
+    assert len(spy) == len(daily.spy) * MINUTES_PER_DAY
+    assert spy.index[0].strftime("%H:%M") == "09:30"
+    last_bars = spy.groupby(spy.index.date)["close"].last().to_numpy()
+    np.testing.assert_allclose(last_bars, daily.spy["close"].to_numpy(), rtol=1e-12)
+
+
+def test_backtest_engines_agree_on_synthetic_data():
+    data = generate_daily_market_data(2, seed=5)
+    dates = data.spy.index
+    config = load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVXY"}},
+            "backtest": {"start_date": str(dates[0].date()), "end_date": str(dates[-1].date())},
+        }
+    )
+
+    loop = run_backtest(config, data=data, engine=BacktestEngine.LOOP)
+    vectorized = run_backtest(config, data=data, engine=BacktestEngine.VECTORIZED)
+    states = {record.term_structure for record in loop.records}
+
+    assert len(states) == 2
+    np.testing.assert_allclose(vectorized.equity_curve, loop.equity_curve, rtol=1e-12)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from vol_edge.config import load_config
+from vol_edge.data import YahooDataSource, get_data_source
+from vol_edge.data.yahoo_cache import Coverage, plan_fetches
+
+SYMBOLS = ["SPY", "^VIX", "^VIX3M", "UVXY", "SVIX"]
+_DATES = pd.bdate_range("2020-01-01", "2020-03-31")
+
+
+class FakeYahoo:
+    """Serves a fixed business-day history; ``adj_factor`` mimics a dividend re-adjustment."""
+
+    def __init__(self):
+        self.calls = []
+        self.adj_factor = 1.0
+
+    def __call__(self, tickers, start, end, auto_adjust, progress):
+        self.calls.append((tuple(tickers), pd.Timestamp(start), pd.Timestamp(end)))
+        idx = _DATES[(_DATES >= pd.Timestamp(start)) & (_DATES < pd.Timestamp(end))]
+        base = pd.Series(range(len(_DATES)), index=_DATES, dtype=float).reindex(idx) + 100
+        data = {}
+        for offset, sym in enumerate(tickers):
+            data[("Close", sym)] = base + offset
+            data[("Adj Close", sym)] = (base + offset) * self.adj_factor
+        frame = pd.DataFrame(data, index=idx)
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns)
+        return frame
+
+
+def _config(cache_dir, offline: bool = False):
+    return load_config(
+        {
+            "instruments": {"long_vol": {"symbol": "UVXY"}, "short_vol": {"symbol": "SVIX"}},
+            "data": {
+                "provider": "yfinance",
+                "yfinance": {"cache_dir": str(cache_dir), "offline": offline, "revision_days": 5},
+            },
+            "backtest": {"start_date": "2020-01-01", "end_date": "2020-03-01"},
+        }
+    )
+
+
+@pytest.fixture
+def fake_yahoo(monkeypatch):
+    import yfinance as yf
+
+    fake = FakeYahoo()
+    monkeypatch.setattr(yf, "download", fake)
+    return fake
+
+
+def test_cache_serves_repeat_loads_and_tops_up_tail(tmp_path, fake_yahoo):
+    source = get_data_source(_config(tmp_path))
+    assert isinstance(source, YahooDataSource)
+
+    first = source.load(date(2020, 1, 1), date(2020, 2, 1))
+    assert fake_yahoo.calls == [(tuple(SYMBOLS), pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01"))]
+    assert first.spy.index[-1] == pd.Timestamp("2020-01-31")
+
+    again = YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 2, 1))
+    assert len(fake_yahoo.calls) == 1
+    pd.testing.assert_frame_equal(again.spy, first.spy, check_freq=False, check_names=False)
+
+    later = YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 3, 1))
+    assert len(fake_yahoo.calls) == 2
+    tickers, start, end = fake_yahoo.calls[-1]
+    assert tickers == tuple(SYMBOLS)
+    assert start == pd.Timestamp("2020-01-26")  # last bar (Jan 31) minus revision window
+    assert end == pd.Timestamp("2020-03-01")
+    assert later.spy.index[-1] == pd.Timestamp("2020-02-28")
+    assert not later.spy.index.has_duplicates
+
+
+def test_tail_revision_readjusts_cached_history(tmp_path, fake_yahoo):
+    YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 2, 1))
+    fake_yahoo.adj_factor = 0.98
+    data = YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 3, 1))
+
+    ratio = data.spy["adj_close"] / data.spy["close"]
+    assert ratio.to_numpy() == pytest.approx(0.98)
+
+
+def test_offline_mode_never_downloads(tmp_path, fake_yahoo):
+    with pytest.raises(RuntimeError, match="Offline mode"):
+        YahooDataSource(_config(tmp_path, offline=True)).load(date(2020, 1, 1), date(2020, 2, 1))
+
+    YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 2, 1))
+    calls = len(fake_yahoo.calls)
+    data = YahooDataSource(_config(tmp_path, offline=True)).load(date(2020, 1, 1), date(2020, 3, 1))
+    assert len(fake_yahoo.calls) == calls
+    assert data.spy.index[-1] == pd.Timestamp("2020-01-31")
+
+
+def test_plan_fetches_covers_head_and_tail():
+    coverage = Coverage(date(2020, 2, 1), date(2020, 3, 1))
+    ranges = plan_fetches(coverage, pd.Timestamp("2020-02-28"), date(2020, 1, 1), date(2020, 4, 1), 3)
+    assert ranges == [(date(2020, 1, 1), date(2020, 2, 1)), (date(2020, 2, 25), date(2020, 4, 1))]
+    assert plan_fetches(coverage, pd.Timestamp("2020-02-28"), date(2020, 2, 3), date(2020, 2, 20), 3) == []
+    # a later, non-overlapping window still fetches from the cached tail onwards
+    gap = plan_fetches(coverage, pd.Timestamp("2020-02-28"), date(2020, 6, 1), date(2020, 7, 1), 3)
+    assert gap == [(date(2020, 2, 25), date(2020, 7, 1))]
+
+
+def test_later_disjoint_window_fills_the_gap(tmp_path, fake_yahoo):
+    YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1), date(2020, 1, 15))
+    YahooDataSource(_config(tmp_path)).load(date(2020, 3, 1), date(2020, 3, 31))
+    assert fake_yahoo.calls[-1][1] == pd.Timestamp("2020-01-09")  # last bar (Jan 14) minus revision window
+
+    data = YahooDataSource(_config(tmp_path, offline=True)).load(date(2020, 1, 1), date(2020, 3, 31))
+    expected = _DATES[_DATES < pd.Timestamp("2020-03-31")]
+    assert list(data.spy.index) == list(expected)
+
+
+def test_todays_bar_is_requested_again_until_the_session_is_over(tmp_path, fake_yahoo, monkeypatch):
+    from vol_edge.data import sources
+
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return date(2020, 2, 14)
+
+    monkeypatch.setattr(sources, "date", Today)
+    first = YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1))
+    assert first.spy.index[-1] == pd.Timestamp("2020-02-14")  # the intraday bar
+    assert YahooDataSource(_config(tmp_path)).cache.coverage("SPY") == Coverage(date(2020, 1, 1), date(2020, 2, 14))
+
+    YahooDataSource(_config(tmp_path)).load(date(2020, 1, 1))
+    assert fake_yahoo.calls[-1][1:] == (pd.Timestamp("2020-02-09"), pd.Timestamp("2020-02-15"))
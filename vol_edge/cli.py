@@ -4,15 +4,31 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
+from typing import Callable
 
 from vol_edge.config import load_config
 from vol_edge.exec.backtest import run_backtest
-from vol_edge.reports import compute_metrics, build_daily_report
+from vol_edge.exec.checkpoint import run_incremental_backtest
+from vol_edge.exec.compare import comparison_table, run_strategy_comparison
+from vol_edge.exec.sweep import load_grid, parse_range, run_sweep
+from vol_edge.profiling import Profiler
+from vol_edge.reports import BlendRebalance, compute_metrics, build_daily_report, run_blend
 
 
-def _run_backtest(config_path: Path) -> None:
+def _run_backtest(config_path: Path, checkpoint: Path | None = None) -> None:
     config = load_config(config_path)
+    if checkpoint is not None:
+        incremental = run_incremental_backtest(config, checkpoint)
+        payload = {
+            "resumed": incremental.resumed,
+            "new_records": len(incremental.result.records),
+            "last_date": incremental.checkpoint.last_date.date().isoformat(),
+            "final_equity": incremental.checkpoint.last_equity,
+        }
+        print(json.dumps(payload, default=str))
+        return
     result = run_backtest(config)
     metrics = compute_metrics(result.equity_curve)
     payload = {
@@ -25,29 +41,176 @@ def _run_backtest(config_path: Path) -> None:
     print(json.dumps(payload, default=str))
 
 
+def _run_report(args: argparse.Namespace) -> None:
+    config = load_config(args.config)
+    append = False
+    if args.checkpoint is not None:
+        incremental = run_incremental_backtest(config, args.checkpoint)
+        df = build_daily_report(
+            incremental.result,
+            config,
+            previous_equity=incremental.previous_equity,
+            base_equity=incremental.checkpoint.first_equity,
+        )
+        append = incremental.resumed and args.output is not None and args.output.exists()
+    else:
+        result = run_backtest(config)
+        df = build_daily_report(result, config)
+    if args.output:
+        if append:
+            df.to_csv(args.output, mode="a", header=False, index=False)
+            print(f"Appended {len(df)} rows to {args.output}")
+        else:
+            df.to_csv(args.output, index=False)
+            print(f"Saved report to {args.output}")
+    else:
+        print(df.to_string(index=False))
+
+
+def _with_profile(args: argparse.Namespace, run: Callable[[], None]) -> None:
+    """Run ``run`` under a profiler when ``--profile``/``--profile-stats`` is set.
+
+    The breakdown goes to stderr so stdout stays machine-readable.
+    """
+
+    if not args.profile and not args.profile_stats:
+        run()
+        return
+    profiler = Profiler(cprofile=args.profile_stats is not None)
+    with profiler:
+        run()
+    if args.profile == "json":
+        print(json.dumps(profiler.to_dict()), file=sys.stderr)
+    elif args.profile == "table":
+        print(profiler.format_table(), file=sys.stderr)
+    if args.profile_stats:
+        profiler.dump_stats(args.profile_stats)
+        print(f"Saved hot-loop pstats to {args.profile_stats}", file=sys.stderr)
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        help="Print per-stage wall time, calls and peak memory to stderr",
+    )
+    parser.add_argument("--profile-stats", type=Path, help="Write a cProfile dump of the engine loop (pstats format)")
+
+
+def _parse_params(items: list[str]) -> dict[str, str]:
+    grid: dict[str, str] = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep or not name:
+            raise SystemExit(f"--param expects name=values, got {item!r}")
+        grid[name.strip()] = values
+    return grid
+
+
+def _run_sweep(args: argparse.Namespace) -> None:
+    config = load_config(args.config)
+    grid = load_grid(args.grid) if args.grid else {}
+    grid.update(_parse_params(args.param))
+    if not grid:
+        raise SystemExit("sweep needs --grid and/or --param")
+    table = run_sweep(config, grid, workers=args.workers)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Saved {len(table)} sweep results to {args.output}")
+    else:
+        print(table.to_string(index=False))
+
+
+def _run_blend(args: argparse.Namespace) -> None:
+    config = load_config(args.config)
+    result = run_backtest(config)
+    weights = [w / 100.0 for w in parse_range(args.weights)]
+    table = run_blend(result, weights, rebalance=args.rebalance, threshold=args.threshold)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Saved blend analysis to {args.output}")
+    else:
+        print(table.to_string(index=False))
+
+
+def _run_compare(args: argparse.Namespace) -> None:
+    config = load_config(args.config)
+    strategies = [name.strip() for name in args.strategies.split(",") if name.strip()] if args.strategies else None
+    results = run_strategy_comparison(config, strategies)
+    table = comparison_table(results).reset_index()
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Saved comparison to {args.output}")
+    else:
+        print(table.to_string(index=False))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Volatility Edge CLI")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     backtest_parser = subparsers.add_parser("backtest", help="Run a backtest")
     backtest_parser.add_argument("--config", required=True, type=Path)
+    backtest_parser.add_argument(
+        "--checkpoint", type=Path, help="Checkpoint directory; resume from it and process only new dates"
+    )
+    _add_profile_arguments(backtest_parser)
 
     report_parser = subparsers.add_parser("report", help="Generate daily report")
     report_parser.add_argument("--config", required=True, type=Path)
     report_parser.add_argument("--output", type=Path, help="Optional CSV output path")
+    report_parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Checkpoint directory; when resuming, only new rows are appended to --output",
+    )
+    _add_profile_arguments(report_parser)
+
+    blend_parser = subparsers.add_parser("blend", help="Blend the strategy with SPY across weights")
+    blend_parser.add_argument("--config", required=True, type=Path)
+    blend_parser.add_argument("--weights", default="0:100:5", help="SPY weights in percent as start:stop:step")
+    blend_parser.add_argument(
+        "--rebalance",
+        choices=[mode.value for mode in BlendRebalance],
+        default=BlendRebalance.DAILY.value,
+        help="daily: reset to target each day; drift: rebalance when SPY share leaves the band",
+    )
+    blend_parser.add_argument("--threshold", type=float, default=0.05, help="Drift band for --rebalance drift")
+    blend_parser.add_argument("--output", type=Path, help="Optional CSV output path")
+
+    compare_parser = subparsers.add_parser("compare", help="Backtest several strategies on shared signals")
+    compare_parser.add_argument("--config", required=True, type=Path)
+    compare_parser.add_argument(
+        "--strategies",
+        help="Comma-separated strategy names (default: passive,evrp,evrp_boc,evrp_boc_sizing)",
+    )
+    compare_parser.add_argument("--output", type=Path, help="Optional CSV output path")
+
+    sweep_parser = subparsers.add_parser("sweep", help="Backtest a grid of strategy parameters")
+    sweep_parser.add_argument("--config", required=True, type=Path)
+    sweep_parser.add_argument("--grid", type=Path, help="YAML mapping of strategy parameter -> values")
+    sweep_parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="Grid axis as name=v1,v2,... or name=start:stop:step (repeatable)",
+    )
+    sweep_parser.add_argument("--workers", type=int, help="Worker processes (default: all CPUs)")
+    sweep_parser.add_argument("--output", type=Path, help="Optional CSV output path")
 
     args = parser.parse_args()
     if args.command == "backtest":
-        _run_backtest(args.config)
+        _with_profile(args, lambda: _run_backtest(args.config, args.checkpoint))
+    elif args.command == "blend":
+        _run_blend(args)
+    elif args.command == "compare":
+        _run_compare(args)
+    elif args.command == "sweep":
+        _run_sweep(args)
     elif args.command == "report":
-        config = load_config(args.config)
-        result = run_backtest(config)
-        df = build_daily_report(result, config)
-        if args.output:
-            df.to_csv(args.output, index=False)
-            print(f"Saved report to {args.output}")
-        else:
-            print(df.to_string(index=False))
+        _with_profile(args, lambda: _run_report(args))
 
 
 if __name__ == "__main__":  # pragma: no cover
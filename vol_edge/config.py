@@ -5,10 +5,10 @@ from __future__ import annotations
 from datetime import date
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 import yaml
-from pydantic import BaseModel, Field, PositiveFloat, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, field_validator, model_validator
 
 
 class StrategyName(str, Enum):
@@ -20,6 +20,15 @@ class StrategyName(str, Enum):
     EVRP_BOC_SIZING = "evrp_boc_sizing"
 
 
+class RealizedVolEstimator(str, Enum):
+    """Realized-vol estimator feeding eRV30 (and so eVRP)."""
+
+    CLOSE_TO_CLOSE = "close_to_close"
+    PARKINSON = "parkinson"
+    GARMAN_KLASS = "garman_klass"
+    EWMA = "ewma"
+
+
 class InstrumentConfig(BaseModel):
     symbol: str
     exchange: Optional[str] = None
@@ -34,6 +43,9 @@ class InstrumentsConfig(BaseModel):
 
 class YFinanceConfig(BaseModel):
     session_tz: str = "America/New_York"
+    cache_dir: Optional[Path] = None  # per-symbol Parquet cache; disabled when unset
+    revision_days: int = Field(7, ge=0)  # calendar days of cached tail re-requested on top-up
+    offline: bool = False  # serve only from cache_dir, never call Yahoo
 
 
 class CsvPaths(BaseModel):
@@ -42,6 +54,7 @@ class CsvPaths(BaseModel):
     vix3m: Path
     long_vol: Path
     short_vol: Path
+    cache_dir: Optional[Path] = None  # Arrow copies keyed by path/mtime/size; disabled when unset
 
 
 class DataProvider(str, Enum):
@@ -50,6 +63,14 @@ class DataProvider(str, Enum):
     IBKR = "ibkr"
 
 
+class MissingDataPolicy(str, Enum):
+    """How to treat dates where a symbol has no price but SPY trades."""
+
+    FFILL = "ffill"
+    DROP = "drop"
+    FAIL = "fail"
+
+
 class IBKRConnectionConfig(BaseModel):
     host: str = "127.0.0.1"
     port: int = 7496
@@ -57,6 +78,15 @@ class IBKRConnectionConfig(BaseModel):
     connect_timeout: float = 10.0
     vix_symbol: str = "VIX"
     vix3m_symbol: str = "VIX3M"
+    # Historical-data pacing. IBKR enforces its hard 60-requests-per-10-minutes
+    # limit only for bars under 30s; 1-min requests are soft-throttled, and
+    # violations are retried with exponential backoff.
+    max_concurrent_requests: int = Field(4, ge=1)
+    pacing_requests: int = Field(60, ge=1)
+    pacing_window_seconds: float = Field(60.0, gt=0)
+    pacing_burst: int = Field(6, ge=1)
+    pacing_retries: int = Field(5, ge=0)
+    pacing_backoff_seconds: float = Field(15.0, ge=0)
 
 
 class DataConfig(BaseModel):
@@ -64,16 +94,56 @@ class DataConfig(BaseModel):
     yfinance: YFinanceConfig = Field(default_factory=YFinanceConfig)
     csv: Optional[CsvPaths] = None
     ibkr: IBKRConnectionConfig = Field(default_factory=IBKRConnectionConfig)
+    missing_data: MissingDataPolicy = MissingDataPolicy.FAIL
 
     @model_validator(mode="after")
     def _validate_payload(self) -> "DataConfig":
         if self.provider == DataProvider.CSV and self.csv is None:
             raise ValueError("csv provider requires csv paths")
+        if self.yfinance.offline and self.yfinance.cache_dir is None:
+            raise ValueError("yfinance offline mode requires yfinance.cache_dir")
         if self.provider == DataProvider.IBKR and not self.ibkr:
             raise ValueError("ibkr provider requires ibkr configuration")
         return self
 
 
+class EvrpSign(str, Enum):
+    POSITIVE = "positive"  # > 0
+    NEGATIVE = "negative"  # < 0
+    ZERO = "zero"
+    NON_NEGATIVE = "non_negative"  # >= 0
+    NON_POSITIVE = "non_positive"  # <= 0
+
+
+class RuleCondition(BaseModel):
+    """Row filter of a decision table; unset keys match everything."""
+
+    model_config = ConfigDict(extra="forbid")  # a misspelt key would silently widen the rule
+
+    evrp: Optional[EvrpSign] = None
+    term: Optional[Literal["contango", "backwardation"]] = None
+    vix_min: Optional[float] = None  # vix >= vix_min
+    vix_max: Optional[float] = None  # vix < vix_max
+
+
+class DecisionRule(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # a misspelt ``weights`` would turn the rule into a cash rule
+
+    when: RuleCondition = Field(default_factory=RuleCondition)
+    # role -> constant or size expression, e.g. "min(vix / divisor, cap)"
+    weights: Dict[str, Union[float, str]] = Field(default_factory=dict)
+
+
+class DecisionTable(BaseModel):
+    """Ordered rules; the first matching row decides the day, no match means cash."""
+
+    model_config = ConfigDict(extra="forbid")  # a misspelt option would silently keep its default
+
+    rules: List[DecisionRule]
+    drop_zero_weights: bool = True  # leave roles sized at exactly 0 out of the decision
+    params: Dict[str, float] = Field(default_factory=dict)  # extra names for size expressions
+
+
 class StrategyConfig(BaseModel):
     name: StrategyName = StrategyName.EVRP_BOC_SIZING
     rebalance_threshold_pct: float = Field(0.02, ge=0.0)
@@ -82,6 +152,23 @@ class StrategyConfig(BaseModel):
     max_vol_exposure_pct: float = Field(0.40, gt=0.0, le=1.0)
     size_rule_divisor: PositiveFloat = 100.0
     half_sizing_in_contango_when_neg_evrp: bool = True
+    erv30_estimator: RealizedVolEstimator = RealizedVolEstimator.CLOSE_TO_CLOSE
+    ewma_lambda: float = Field(0.94, gt=0.0, lt=1.0)
+    table: Optional[DecisionTable] = None  # replaces ``name`` when set; inline or a YAML path
+
+    @field_validator("table", mode="before")
+    @classmethod
+    def load_table_file(cls, value):
+        if isinstance(value, (str, Path)):
+            return yaml.safe_load(Path(value).read_text())
+        return value
+
+
+class BacktestEngine(str, Enum):
+    """Backtest engine implementations (identical results, different speed)."""
+
+    LOOP = "loop"
+    VECTORIZED = "vectorized"
 
 
 class BacktestConfig(BaseModel):
@@ -89,6 +176,7 @@ class BacktestConfig(BaseModel):
     end_date: Optional[date] = None
     initial_equity: PositiveFloat = 1_000_000.0
     benchmark_symbol: str = "SPY"
+    engine: BacktestEngine = BacktestEngine.LOOP
 
     @field_validator("end_date")
     @classmethod
@@ -144,14 +232,21 @@ def load_config(source: Union[str, Path, Dict[str, Any]]) -> AppConfig:
 __all__ = [
     "AppConfig",
     "BacktestConfig",
+    "BacktestEngine",
     "DataConfig",
     "DataProvider",
+    "DecisionRule",
+    "DecisionTable",
+    "EvrpSign",
     "IBKRConnectionConfig",
     "InstrumentConfig",
     "InstrumentsConfig",
     "LoggingConfig",
+    "MissingDataPolicy",
+    "RealizedVolEstimator",
     "ExecutionConfig",
     "RiskConfig",
+    "RuleCondition",
     "StrategyConfig",
     "StrategyName",
     "load_config",
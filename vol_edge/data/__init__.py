@@ -1,12 +1,25 @@
-"""Data source interfaces for Vol Edge."""
+"""Data source interfaces for Vol Edge.
+
+The IBKR backend (``ib_insync`` and its event loop) is imported on first
+attribute access, so daily CSV/Yahoo runs never load it.
+"""
+
+from importlib import import_module
 
 from .sources import MarketData, DataSource, CSVDataSource, YahooDataSource, get_data_source
-from .ibkr.client import IBKRClient
-from .ibkr import downloader as ibkr_downloader
-from .ibkr import snapshots as ibkr_snapshots
+from .panel import MarketPanel, MissingDataError, build_panel
+
+_LAZY = {
+    "IBKRClient": (".ibkr.client", "IBKRClient"),
+    "ibkr_downloader": (".ibkr.downloader", None),
+    "ibkr_snapshots": (".ibkr.snapshots", None),
+}
 
 __all__ = [
     "MarketData",
+    "MarketPanel",
+    "MissingDataError",
+    "build_panel",
     "DataSource",
     "CSVDataSource",
     "YahooDataSource",
@@ -15,3 +28,13 @@ __all__ = [
     "ibkr_downloader",
     "ibkr_snapshots",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    module = import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
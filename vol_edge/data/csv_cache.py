@@ -0,0 +1,78 @@
+"""Columnar ingestion cache for CSV price files.
+
+The first load of a CSV parses it once and writes an uncompressed Arrow IPC
+(Feather v2) copy named after a hash of the CSV's resolved path plus a hash
+of its mtime and size; editing or replacing the CSV therefore invalidates it
+automatically, and the superseded copy of that same source is removed.
+Later loads memory-map that file and slice the requested dates out of the
+sorted ``date`` column before anything is converted to pandas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+def parse_csv(path: Path) -> pd.DataFrame:
+    """Read a price CSV into a date-sorted frame with lower-case columns."""
+
+    df = pd.read_csv(path, parse_dates=["date"])
+    df = df.set_index("date").sort_index()
+    df.columns = [c.lower() for c in df.columns]
+    return df
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha1(token.encode()).hexdigest()[:16]
+
+
+def _source_key(path: Path) -> str:
+    """Identifies the CSV itself, so same-named files in other directories never collide."""
+
+    return f"{path.stem}-{_digest(str(path.resolve()))}"
+
+
+def _cache_key(path: Path) -> str:
+    stat = path.stat()
+    return _digest(f"{stat.st_mtime_ns}|{stat.st_size}")
+
+
+class CsvCache:
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+
+    def path_for(self, csv_path: Path) -> Path:
+        return self.base_dir / f"{_source_key(csv_path)}-{_cache_key(csv_path)}.arrow"
+
+    def _convert(self, csv_path: Path, target: Path) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(parse_csv(csv_path).reset_index(), preserve_index=False)
+        # unique per call: CSVDataSource converts on a thread pool, so the pid alone can collide
+        tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+        feather.write_feather(table, tmp, compression="uncompressed")
+        tmp.replace(target)
+        for stale in self.base_dir.glob(f"{_source_key(csv_path)}-*.arrow"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+
+    def load(self, csv_path: Path, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """Rows with ``start <= date <= end`` (either bound optional), indexed by date."""
+
+        csv_path = Path(csv_path)
+        target = self.path_for(csv_path)
+        if not target.exists():
+            self._convert(csv_path, target)
+        table = feather.read_table(str(target), memory_map=True)
+        dates = table.column("date").to_numpy()
+        lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left") if start is not None else 0
+        hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right") if end is not None else len(dates)
+        return table.slice(lo, max(hi - lo, 0)).to_pandas().set_index("date")
@@ -0,0 +1,82 @@
+"""Time-range bookkeeping for the IBKR minute cache.
+
+Coverage is a sorted list of disjoint half-open ``[start, end)`` UTC intervals
+that have already been requested from IBKR, whether or not bars came back
+(weekends, holidays and halts legitimately return nothing). It lives in a
+JSON manifest next to each symbol's minute-store directory.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+Interval = Tuple[pd.Timestamp, pd.Timestamp]
+
+_BAR = pd.Timedelta(minutes=1)
+
+
+def _utc(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted((_utc(s), _utc(e)) for s, e in intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(coverage: List[Interval], start: datetime, end: datetime) -> List[Interval]:
+    """Parts of ``[start, end)`` not already covered."""
+
+    cursor, stop = _utc(start), _utc(end)
+    gaps: List[Interval] = []
+    for cov_start, cov_end in merge_intervals(coverage):
+        if cov_end <= cursor:
+            continue
+        if cov_start >= stop:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+    if cursor < stop:
+        gaps.append((cursor, stop))
+    return gaps
+
+
+def manifest_path(cache_dir: Path) -> Path:
+    return cache_dir.with_name(f"{cache_dir.name}.coverage.json")
+
+
+def load_coverage(cache_dir: Path, bounds: Optional[Interval]) -> List[Interval]:
+    """Read the manifest; a cache written before manifests existed covers its own bar span.
+
+    ``bounds`` is the first and last cached bar, as returned by ``MinuteStore.bounds``.
+    """
+
+    manifest = manifest_path(cache_dir)
+    if manifest.exists():
+        payload = json.loads(manifest.read_text())
+        return merge_intervals([(pd.Timestamp(s), pd.Timestamp(e)) for s, e in payload["intervals"]])
+    if bounds is None:
+        return []
+    return [(_utc(bounds[0]), _utc(bounds[1]) + _BAR)]
+
+
+def save_coverage(cache_dir: Path, intervals: List[Interval]) -> None:
+    manifest = manifest_path(cache_dir)
+    payload = {"intervals": [[s.isoformat(), e.isoformat()] for s, e in merge_intervals(intervals)]}
+    tmp = manifest.with_name(f"{manifest.name}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    tmp.replace(manifest)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pandas as pd
 from ib_insync import BarData, Contract, IB
@@ -12,6 +12,9 @@ import yfinance as yf
 
 from vol_edge.config import AppConfig
 from .client import IBKRClient
+from .coverage import load_coverage, manifest_path, missing_intervals, save_coverage
+from .minute_store import MinuteStore, migrate_legacy
+from .scheduler import ChunkRequest, ChunkResult, HistoricalScheduler, bars_to_frame, duration_str
 
 _MAX_DURATION_DAYS = 7  # IBKR limits for 1-min bars when requesting 1-min data
 
@@ -49,46 +52,131 @@ def _what_to_show(contract: Contract) -> str:
 
 
 def fetch_minute_bars(ib: IB, contract: Contract, start: datetime, end: datetime) -> pd.DataFrame:
+    """Blocking, one-chunk-at-a-time download; see ``load_or_fetch_many`` for the concurrent path."""
+
     frames = []
     data_type = _what_to_show(contract)
     use_rth = getattr(contract, "secType", "") != "IND"
     for chunk_start, chunk_end in _historical_chunks(start, end):
-        duration = f"{(chunk_end - chunk_start).days} D"
         bars: list[BarData] = ib.reqHistoricalData(
             contract,
             endDateTime=chunk_end.astimezone(timezone.utc),
-            durationStr=duration,
+            durationStr=duration_str(chunk_start, chunk_end),
             barSizeSetting="1 min",
             whatToShow=data_type,
             useRTH=use_rth,
             keepUpToDate=False,
             formatDate=1,
         )
-        if not bars:
-            continue
-        frame = pd.DataFrame(
-            {
-                "date": [bar.date for bar in bars],
-                "open": [bar.open for bar in bars],
-                "high": [bar.high for bar in bars],
-                "low": [bar.low for bar in bars],
-                "close": [bar.close for bar in bars],
-                "volume": [getattr(bar, "volume", 0) for bar in bars],
-            }
-        )
-        frames.append(frame)
+        if bars:
+            frames.append(bars_to_frame(bars))
     if not frames:
-        return pd.DataFrame(columns=["date", "open", "high", "low", "close", "volume"])
+        return bars_to_frame([])
     df = pd.concat(frames)
-    df = df.drop_duplicates(subset="date")
-    df["date"] = pd.to_datetime(df["date"], utc=True).dt.tz_convert("America/New_York")
-    df = df.set_index("date").sort_index()
-    return df
+    return df[~df.index.duplicated(keep="first")].sort_index()
 
 
 def cache_path(symbol: str, base_dir: Path = Path("data/ibkr_cache")) -> Path:
+    """Directory holding ``symbol``'s partitioned minute store."""
+
     base_dir.mkdir(parents=True, exist_ok=True)
-    return base_dir / f"{symbol}_1min.parquet"
+    return base_dir / f"{symbol}_1min"
+
+
+def _open_store(path: Path) -> MinuteStore:
+    store = MinuteStore(path)
+    legacy = path.with_name(f"{path.name}.parquet")
+    if legacy.exists():
+        if not manifest_path(path).exists():
+            # pin the legacy span as covered before its file disappears
+            bars = pd.read_parquet(legacy, columns=[])
+            span = (pd.Timestamp(bars.index[0]), pd.Timestamp(bars.index[-1])) if len(bars) else None
+            save_coverage(path, load_coverage(path, span))
+        migrate_legacy(legacy, store)
+    return store
+
+
+def _chunk_requests(symbol: str, contract: Contract, gaps: Iterable[Tuple[datetime, datetime]]) -> List[ChunkRequest]:
+    return [
+        ChunkRequest(
+            symbol=symbol,
+            contract=contract,
+            start=chunk_start,
+            end=chunk_end,
+            what_to_show=_what_to_show(contract),
+            use_rth=getattr(contract, "secType", "") != "IND",
+        )
+        for gap_start, gap_end in gaps
+        for chunk_start, chunk_end in _historical_chunks(gap_start, gap_end)
+    ]
+
+
+def _run_chunks(app_config: AppConfig, chunks: List[ChunkRequest], on_result: Callable[[ChunkResult], None]) -> None:
+    """Download ``chunks`` over one connection, handing each to ``on_result`` as it completes."""
+
+    with IBKRClient(app_config.data.ibkr) as ib:
+        ib.RaiseRequestErrors = True  # surface pacing violations as exceptions for retry
+        scheduler = HistoricalScheduler.from_config(ib, app_config.data.ibkr)
+
+        async def consume() -> None:
+            async for result in scheduler.stream(chunks):
+                on_result(result)
+
+        ib.run(consume())
+
+
+def sync_minutes(
+    requests: Sequence[Tuple[str, Contract]],
+    app_config: AppConfig,
+    start: datetime,
+    end: datetime,
+) -> Dict[str, MinuteStore]:
+    """Download whatever part of ``[start, end]`` each symbol's store is missing.
+
+    Requested ranges are recorded in a coverage manifest beside each store, so
+    a daily top-up fetches just the minutes since the last run. All gaps,
+    across symbols, are fetched concurrently over one connection. Each chunk is
+    written to the store and its range added to the manifest as soon as it
+    arrives, so memory stays bounded by the chunks in flight and an
+    interrupted backfill resumes after the last completed chunk. A "no data"
+    answer (weekends, dates before a listing) counts as covered; chunks IBKR
+    otherwise rejects are not marked as covered and are retried next time.
+    """
+
+    horizon = min(pd.Timestamp(end), pd.Timestamp.now(tz="UTC"))
+    plans = {}
+    chunks: List[ChunkRequest] = []
+    for symbol, contract in requests:
+        path = cache_path(symbol)
+        store = _open_store(path)
+        coverage = load_coverage(path, store.bounds())
+        gaps = missing_intervals(coverage, start, horizon) if pd.Timestamp(start) < horizon else []
+        plans[symbol] = (path, store, coverage)
+        chunks.extend(_chunk_requests(symbol, contract, gaps))
+
+    def checkpoint(result: ChunkResult) -> None:
+        path, store, coverage = plans[result.request.symbol]
+        store.write(result.bars)
+        if result.ok:
+            coverage.append((result.request.start, result.request.end))
+            save_coverage(path, coverage)
+
+    if chunks:
+        _run_chunks(app_config, chunks, checkpoint)
+    return {symbol: store for symbol, (_, store, _) in plans.items()}
+
+
+def load_or_fetch_many(
+    requests: Sequence[Tuple[str, Contract]],
+    app_config: AppConfig,
+    start: datetime,
+    end: datetime,
+    columns: Optional[Sequence[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Minute bars for ``[start, end]`` per symbol; only the months in range are read from disk."""
+
+    stores = sync_minutes(requests, app_config, start, end)
+    return {symbol: store.read(start, end, columns=columns) for symbol, store in stores.items()}
 
 
 def load_or_fetch(
@@ -98,18 +186,9 @@ def load_or_fetch(
     start: datetime,
     end: datetime,
     allow_empty: bool = False,
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
-    path = cache_path(symbol)
-    if path.exists():
-        df = pd.read_parquet(path)
-        df.index = pd.to_datetime(df.index)
-        return df
-    with IBKRClient(app_config.data.ibkr) as ib:
-        df = fetch_minute_bars(ib, contract, start, end)
-    if not df.empty:
-        df.to_parquet(path)
-    elif allow_empty and path.exists():
-        path.unlink(missing_ok=True)
+    df = load_or_fetch_many([(symbol, contract)], app_config, start, end, columns=columns)[symbol]
     if df.empty and not allow_empty:
         raise RuntimeError(f"No data returned for {symbol}")
     return df
@@ -123,6 +202,11 @@ def load_vix3m_with_fallback(app_config: AppConfig, start: datetime, end: dateti
         df = pd.DataFrame()
     if not df.empty:
         return df
+    return fetch_vix3m_daily(start, end)
+
+
+def fetch_vix3m_daily(start: datetime, end: datetime) -> pd.DataFrame:
+    """Yahoo daily VIX3M closes, stamped at 16:00 New York, for when IBKR has no minutes."""
 
     daily = yf.download(
         "^VIX3M",
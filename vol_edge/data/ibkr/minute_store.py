@@ -0,0 +1,212 @@
+"""Partitioned on-disk store for IBKR minute bars.
+
+Each symbol is a directory of ``year=YYYY/month=MM/part.parquet`` files
+(UTC months). Timestamps are stored as int64 UTC epoch nanoseconds, prices as
+float32 and volume as int32, delta/byte-stream-split encoded and
+zstd-compressed, which keeps both the files and the frames read from them
+several times smaller than the tz-aware float64 frames they replace.
+Reads pick only the month files overlapping the requested range and push the
+timestamp filter down to Parquet; writes rewrite only the months they touch.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+SCHEMA_VERSION = 1
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+SCHEMA = pa.schema(
+    [("ts", pa.int64())] + [(name, pa.float32()) for name in PRICE_COLUMNS] + [("volume", pa.int32())],
+    metadata={b"vol_edge.schema_version": str(SCHEMA_VERSION).encode()},
+)
+
+# Minute timestamps and volumes are near-monotone integers; float prices compress
+# far better with their bytes split into streams before zstd.
+_ENCODINGS = {"ts": "DELTA_BINARY_PACKED", "volume": "DELTA_BINARY_PACKED"}
+_ENCODINGS.update({name: "BYTE_STREAM_SPLIT" for name in PRICE_COLUMNS})
+
+_SCHEMA_FILE = "schema.json"
+_NY_TZ = "America/New_York"
+
+
+def _epoch_ns(ts) -> int:
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.value)
+
+
+def _month_keys(epoch_ns: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for each timestamp."""
+
+    return epoch_ns.astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+
+
+def _empty_frame(columns: Sequence[str]) -> pd.DataFrame:
+    index = pd.DatetimeIndex([], tz=_NY_TZ, name="date")
+    return pd.DataFrame({name: pd.Series([], dtype=SCHEMA.field(name).type.to_pandas_dtype()) for name in columns}, index=index)
+
+
+def frame_to_table(frame: pd.DataFrame) -> pa.Table:
+    """OHLCV frame with a datetime index (naive means UTC) -> compact, ts-sorted table."""
+
+    index = pd.DatetimeIndex(frame.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    arrays = [pa.array(index.asi8, pa.int64())]
+    for name in PRICE_COLUMNS:
+        values = frame[name] if name in frame.columns else np.nan
+        arrays.append(pa.array(pd.to_numeric(pd.Series(values, index=frame.index)).to_numpy(np.float32), pa.float32()))
+    volume = pd.to_numeric(frame["volume"], errors="coerce") if "volume" in frame.columns else pd.Series(0, index=frame.index)
+    arrays.append(pa.array(volume.fillna(0).to_numpy(np.int64).astype(np.int32), pa.int32()))
+    table = pa.Table.from_arrays(arrays, schema=SCHEMA)
+    return table.sort_by("ts")
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """Inverse of :func:`frame_to_table`: columns keep their compact dtypes."""
+
+    ts = table.column("ts").to_numpy()
+    index = pd.DatetimeIndex(ts.view("datetime64[ns]"), name="date").tz_localize("UTC").tz_convert(_NY_TZ)
+    columns = {name: table.column(name).to_numpy() for name in table.column_names if name != "ts"}
+    return pd.DataFrame(columns, index=index)
+
+
+class MinuteStore:
+    """One symbol's partitioned minute history rooted at ``root``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._check_schema()
+
+    def _check_schema(self) -> None:
+        marker = self.root / _SCHEMA_FILE
+        if not marker.exists():
+            return
+        version = json.loads(marker.read_text()).get("schema_version")
+        if version != SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Minute store {self.root} has schema version {version}, expected {SCHEMA_VERSION}; "
+                "delete it to rebuild from IBKR"
+            )
+
+    def _write_schema(self) -> None:
+        marker = self.root / _SCHEMA_FILE
+        if not marker.exists():
+            payload = {"schema_version": SCHEMA_VERSION, "columns": {f.name: str(f.type) for f in SCHEMA}}
+            marker.write_text(json.dumps(payload, indent=2))
+
+    def partition_path(self, month_key: int) -> Path:
+        year, month = divmod(int(month_key), 12)
+        return self.root / f"year={1970 + year}" / f"month={month + 1:02d}" / "part.parquet"
+
+    def months(self) -> List[int]:
+        """Month keys of the partitions on disk, ascending."""
+
+        keys = []
+        for path in self.root.glob("year=*/month=*/part.parquet"):
+            year = int(path.parent.parent.name.split("=", 1)[1])
+            month = int(path.parent.name.split("=", 1)[1])
+            keys.append((year - 1970) * 12 + month - 1)
+        return sorted(keys)
+
+    def _files(self, lo: Optional[int], hi: Optional[int]) -> List[Path]:
+        months = self.months()
+        if lo is not None:
+            first = int(_month_keys(np.array([lo]))[0])
+            months = [key for key in months if key >= first]
+        if hi is not None:
+            last = int(_month_keys(np.array([hi]))[0])
+            months = [key for key in months if key <= last]
+        return [self.partition_path(key) for key in months]
+
+    def read(
+        self,
+        start=None,
+        end=None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Bars with ``start <= ts <= end`` (either bound optional), indexed in New York time."""
+
+        columns = list(columns) if columns is not None else PRICE_COLUMNS + ["volume"]
+        lo = _epoch_ns(start) if start is not None else None
+        hi = _epoch_ns(end) if end is not None else None
+        files = self._files(lo, hi)
+        if not files:
+            return _empty_frame(columns)
+        predicate = None
+        if lo is not None:
+            predicate = ds.field("ts") >= lo
+        if hi is not None:
+            upper = ds.field("ts") <= hi
+            predicate = upper if predicate is None else predicate & upper
+        dataset = ds.dataset([str(path) for path in files], schema=SCHEMA, format="parquet")
+        table = dataset.to_table(columns=["ts"] + columns, filter=predicate)
+        ts = table.column("ts").to_numpy()
+        if len(ts) > 1 and (ts[1:] < ts[:-1]).any():  # fragments may come back out of order
+            table = table.sort_by("ts")
+        return table_to_frame(table)
+
+    def bounds(self) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last stored bar (UTC), reading only the ``ts`` column of the edge months."""
+
+        months = self.months()
+        if not months:
+            return None
+        first = pq.read_table(self.partition_path(months[0]), columns=["ts"]).column("ts").to_numpy()
+        last = pq.read_table(self.partition_path(months[-1]), columns=["ts"]).column("ts").to_numpy()
+        if not len(first) or not len(last):
+            return None
+        return pd.Timestamp(int(first.min()), tz="UTC"), pd.Timestamp(int(last.max()), tz="UTC")
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """Merge ``frame`` into the store; on duplicate timestamps the new bar wins."""
+
+        if frame is None or frame.empty:
+            return
+        table = frame_to_table(frame)
+        keys = _month_keys(table.column("ts").to_numpy())
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._write_schema()
+        for key in np.unique(keys):
+            mask = pa.array(keys == key)
+            self._merge_partition(int(key), table.filter(mask))
+
+    def _merge_partition(self, month_key: int, fresh: pa.Table) -> None:
+        path = self.partition_path(month_key)
+        combined = pa.concat_tables([pq.read_table(path, schema=SCHEMA), fresh]) if path.exists() else fresh
+        ts = combined.column("ts").to_numpy()
+        # keep the last occurrence of each timestamp, i.e. the fresh bar; np.unique also sorts
+        _, first_from_end = np.unique(ts[::-1], return_index=True)
+        merged = combined.take(pa.array(len(ts) - 1 - first_from_end))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        pq.write_table(
+            merged.replace_schema_metadata(SCHEMA.metadata),
+            tmp,
+            compression="zstd",
+            use_dictionary=False,
+            column_encoding=_ENCODINGS,
+        )
+        tmp.replace(path)
+
+
+def migrate_legacy(legacy_file: Path, store: MinuteStore) -> Optional[pd.DataFrame]:
+    """Move a pre-partitioning ``<symbol>_1min.parquet`` into ``store``; returns the bars it held."""
+
+    if not legacy_file.exists():
+        return None
+    legacy = pd.read_parquet(legacy_file)
+    legacy.index = pd.to_datetime(legacy.index)
+    store.write(legacy)
+    legacy_file.unlink()
+    return legacy
+
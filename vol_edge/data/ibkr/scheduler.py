@@ -0,0 +1,224 @@
+"""Concurrent, pacing-aware historical-data requests on one IBKR connection.
+
+``HistoricalScheduler`` keeps up to ``max_in_flight`` ``reqHistoricalDataAsync``
+calls outstanding across all symbols, draws one token per request from a
+:class:`TokenBucket`, and retries pacing violations with exponential backoff.
+A "query returned no data" answer comes back as an empty, successful chunk.
+Anything exposing ``reqHistoricalDataAsync`` works as ``ib``, so tests drive it
+with a fake.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from vol_edge.config import IBKRConnectionConfig
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Error 162 is used both for pacing violations and for "query returned no data",
+# so the message text is checked as well as the code.
+_PACING_CODES = {420}
+_NO_DATA_CODE = 162
+
+
+def bars_to_frame(bars: Sequence) -> pd.DataFrame:
+    """``BarData`` list -> OHLCV frame indexed by America/New_York timestamps."""
+
+    if not bars:
+        return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], tz="America/New_York", name="date"))
+    frame = pd.DataFrame(
+        {
+            "date": [bar.date for bar in bars],
+            "open": [bar.open for bar in bars],
+            "high": [bar.high for bar in bars],
+            "low": [bar.low for bar in bars],
+            "close": [bar.close for bar in bars],
+            "volume": [getattr(bar, "volume", 0) for bar in bars],
+        }
+    )
+    frame["date"] = pd.to_datetime(frame["date"], utc=True).dt.tz_convert("America/New_York")
+    return frame.drop_duplicates(subset="date").set_index("date").sort_index()
+
+
+def duration_str(start: datetime, end: datetime) -> str:
+    """IBKR ``durationStr`` spanning at least ``[start, end)``; sub-day spans use seconds."""
+
+    seconds = (end - start).total_seconds()
+    if seconds < 86400:
+        return f"{max(int(math.ceil(seconds)), 60)} S"
+    return f"{int(math.ceil(seconds / 86400))} D"
+
+
+def is_pacing_violation(exc: BaseException) -> bool:
+    code = getattr(exc, "code", None)
+    message = str(getattr(exc, "message", exc)).lower()
+    return code in _PACING_CODES or "pacing" in message
+
+
+def is_no_data(exc: BaseException) -> bool:
+    """IBKR's "HMDS query returned no data": a span with no bars, e.g. a weekend or pre-listing dates."""
+
+    if getattr(exc, "code", None) != _NO_DATA_CODE or is_pacing_violation(exc):
+        return False
+    return "returned no data" in str(getattr(exc, "message", exc)).lower()
+
+
+class TokenBucket:
+    """Allows bursts of ``capacity`` requests, refilling at ``rate`` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("TokenBucket needs rate > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:  # FIFO: waiters are served in arrival order
+            self._refill()
+            while self._tokens < 1.0:
+                await self._sleep((1.0 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1.0
+
+
+@dataclass(frozen=True)
+class ChunkRequest:
+    symbol: str
+    contract: object
+    start: datetime
+    end: datetime
+    what_to_show: str = "TRADES"
+    use_rth: bool = True
+
+
+@dataclass
+class ChunkResult:
+    request: ChunkRequest
+    bars: pd.DataFrame
+    ok: bool  # False when IBKR rejected the request (other than pacing or "no data")
+    error: Optional[str] = None
+
+
+class HistoricalScheduler:
+    def __init__(
+        self,
+        ib,
+        bucket: TokenBucket,
+        max_in_flight: int = 4,
+        max_retries: int = 5,
+        backoff_seconds: float = 15.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.ib = ib
+        self.bucket = bucket
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, ib, config: IBKRConnectionConfig) -> "HistoricalScheduler":
+        bucket = TokenBucket(config.pacing_requests / config.pacing_window_seconds, config.pacing_burst)
+        return cls(
+            ib,
+            bucket,
+            max_in_flight=config.max_concurrent_requests,
+            max_retries=config.pacing_retries,
+            backoff_seconds=config.pacing_backoff_seconds,
+        )
+
+    async def _fetch(self, request: ChunkRequest, slots: asyncio.Semaphore) -> ChunkResult:
+        attempt = 0
+        async with slots:
+            while True:
+                await self.bucket.acquire()
+                try:
+                    bars = await self.ib.reqHistoricalDataAsync(
+                        request.contract,
+                        endDateTime=request.end.astimezone(timezone.utc),
+                        durationStr=duration_str(request.start, request.end),
+                        barSizeSetting="1 min",
+                        whatToShow=request.what_to_show,
+                        useRTH=request.use_rth,
+                        formatDate=1,
+                        # ib_insync's default 60 s timeout returns [] instead of raising,
+                        # which would be recorded as an empty-but-covered chunk.
+                        timeout=0,
+                    )
+                except Exception as exc:  # ib_insync raises RequestError when RaiseRequestErrors is set
+                    if is_pacing_violation(exc):
+                        if attempt >= self.max_retries:
+                            raise
+                        await self._sleep(self.backoff_seconds * 2**attempt)
+                        attempt += 1
+                        continue
+                    if getattr(exc, "code", None) is None:
+                        raise  # connection/programming errors, not an IBKR request rejection
+                    if is_no_data(exc):
+                        return ChunkResult(request, bars_to_frame([]), ok=True)  # nothing to fetch; covered
+                    return ChunkResult(request, bars_to_frame([]), ok=False, error=str(exc))
+                return ChunkResult(request, bars_to_frame(bars or []), ok=True)
+
+    async def run(self, requests: Iterable[ChunkRequest]) -> List[ChunkResult]:
+        """Fetch every chunk; results come back in request order."""
+
+        slots = asyncio.Semaphore(self.max_in_flight)
+        return list(await asyncio.gather(*(self._fetch(request, slots) for request in requests)))
+
+    async def stream(self, requests: Iterable[ChunkRequest]) -> AsyncIterator[ChunkResult]:
+        """Yield each chunk as soon as it completes, so callers can persist and drop it.
+
+        Requests are drawn from ``requests`` lazily, at most ``max_in_flight``
+        at a time, and a result is no longer referenced here once yielded, so
+        memory stays at a few chunks however long the history. If the consumer
+        stops or a fetch raises, the outstanding requests are cancelled.
+        """
+
+        slots = asyncio.Semaphore(self.max_in_flight)
+        queue = iter(requests)
+        pending: set = set()
+
+        def refill() -> None:
+            for request in itertools.islice(queue, self.max_in_flight - len(pending)):
+                pending.add(asyncio.ensure_future(self._fetch(request, slots)))
+
+        try:
+            refill()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                refill()  # keep IBKR busy while the consumer handles this batch
+                while done:
+                    result = done.pop().result()
+                    yield result
+                    del result
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,189 @@
+"""Materialized signal snapshots, keyed by snapshot time and source fingerprint.
+
+``build_signal_snapshots`` output is saved per snapshot time as
+``snapshots/snapshots_HHMM.parquet`` beside the minute stores. A JSON manifest
+holds the covered date range and a fingerprint of its inputs: the size and
+mtime of every SPY/VIX/VIX3M minute partition, plus whether VIX3M came from
+IBKR minutes or the Yahoo daily fallback. The source is decided over the
+covered window; for the fallback, VIX3M is fingerprinted by a per-month
+digest of the Yahoo closes, so a Yahoo revision invalidates the rows built
+from it.
+
+Snapshots only look backwards in time, so cached rows stay valid up to the
+first month whose partition changed. Only that tail and any days past the
+cached range are rebuilt. A daily top-up therefore recomputes at most the
+current month. A changed VIX3M source, an earlier start or a different
+manifest version rebuilds everything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, time, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from vol_edge.config import AppConfig
+
+from . import snapshots as snap
+from .downloader import cache_path
+from .minute_store import MinuteStore
+
+_MANIFEST_VERSION = 2
+_SOURCES = ("SPY", "^VIX", "^VIX3M")
+
+
+def _partition_stats(symbol: str) -> Dict[str, list]:
+    store = MinuteStore(cache_path(symbol))
+    stats = {}
+    for key in store.months():
+        stat = store.partition_path(key).stat()
+        stats[str(key)] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def _month_key(ts) -> int:
+    ts = pd.Timestamp(ts).tz_convert("UTC")
+    return (ts.year - 1970) * 12 + ts.month - 1
+
+
+def _has_minutes(symbol: str, start, end) -> bool:
+    """Whether any of ``symbol``'s minute partitions falls in ``[start, end]``."""
+
+    lo, hi = _month_key(start), _month_key(end)
+    return any(lo <= key <= hi for key in MinuteStore(cache_path(symbol)).months())
+
+
+def _daily_stats(frame: pd.DataFrame) -> Dict[str, list]:
+    """Per-month digest of daily closes, keyed like ``_partition_stats``."""
+
+    index = frame.index.tz_convert("UTC")
+    keys = (index.year - 1970) * 12 + index.month - 1
+    stamps = index.asi8
+    closes = frame["close"].to_numpy(dtype=float)
+    stats = {}
+    for key in np.unique(keys):
+        rows = keys == key
+        digest = hashlib.sha1(stamps[rows].tobytes() + closes[rows].tobytes()).hexdigest()
+        stats[str(key)] = [digest]
+    return stats
+
+
+def _month_start(month_key: int) -> date:
+    year, month = divmod(month_key, 12)
+    return date(1970 + year, month + 1, 1)
+
+
+def _first_changed(old: Dict[str, Dict[str, list]], new: Dict[str, Dict[str, list]]) -> Optional[date]:
+    """Start of the earliest month whose partition was added, removed or rewritten."""
+
+    changed = [
+        int(key)
+        for symbol in _SOURCES
+        for key in set(old.get(symbol, {})) | set(new.get(symbol, {}))
+        if old.get(symbol, {}).get(key) != new.get(symbol, {}).get(key)
+    ]
+    return _month_start(min(changed)) if changed else None
+
+
+def _fingerprint(start: date, end: date) -> Tuple[str, Dict[str, Dict[str, list]], Optional[pd.DataFrame]]:
+    """VIX3M source over ``[start, end]``, the input fingerprint, and the Yahoo series when it is the source."""
+
+    window = snap._minute_window(start, end)
+    inputs = {symbol: _partition_stats(symbol) for symbol in ("SPY", "^VIX")}
+    if _has_minutes("^VIX3M", *window):
+        inputs["^VIX3M"] = _partition_stats("^VIX3M")
+        return "ibkr", inputs, None
+    vix3m = snap._load_vix3m_daily(*window)
+    inputs["^VIX3M"] = _daily_stats(vix3m)
+    return "yahoo", inputs, vix3m
+
+
+class SnapshotCache:
+    def __init__(self, base_dir: Path = Path("data/ibkr_cache/snapshots")):
+        self.base_dir = Path(base_dir)
+
+    def _paths(self, snapshot_time: time) -> tuple[Path, Path]:
+        stem = f"snapshots_{snapshot_time.strftime('%H%M')}"
+        return self.base_dir / f"{stem}.parquet", self.base_dir / f"{stem}.json"
+
+    def _read(self, snapshot_time: time) -> tuple[Optional[dict], Optional[pd.DataFrame]]:
+        data_path, manifest_path = self._paths(snapshot_time)
+        if not manifest_path.exists() or not data_path.exists():
+            return None, None
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != _MANIFEST_VERSION:
+            return None, None
+        return manifest, pd.read_parquet(data_path)
+
+    def _write(self, snapshot_time: time, frame: pd.DataFrame, manifest: dict) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        data_path, manifest_path = self._paths(snapshot_time)
+        for path, write in (
+            (data_path, lambda tmp: frame.to_parquet(tmp)),
+            (manifest_path, lambda tmp: tmp.write_text(json.dumps(manifest, indent=2))),
+        ):
+            tmp = path.with_name(f"{path.name}.tmp")
+            write(tmp)
+            tmp.replace(path)
+
+    def load(
+        self,
+        config: AppConfig,
+        start: date,
+        end: date,
+        snapshot_time: time = snap.SNAPSHOT_TIME,
+    ) -> pd.DataFrame:
+        """``build_signal_snapshots(config, start, end, snapshot_time)``, served from disk where still valid."""
+
+        start_dt, end_dt = snap._minute_window(start, end)
+        snap._prefetch_minutes(config, start_dt, end_dt)  # the only sync; the build reads these stores as-is
+        manifest, cached = self._read(snapshot_time)
+        if manifest is not None and date.fromisoformat(manifest["start"]) > start:
+            manifest = None
+        if manifest is not None:
+            cached_end = date.fromisoformat(manifest["end"])
+            cover_start, cover_end = date.fromisoformat(manifest["start"]), max(end, cached_end)
+            vix3m_source, inputs, vix3m = _fingerprint(cover_start, cover_end)
+            if manifest["vix3m_source"] == vix3m_source:
+                changed = _first_changed(manifest["inputs"], inputs)
+                rebuild_from = min(changed or date.max, cached_end + timedelta(days=1))
+                cached = cached.loc[: pd.Timestamp(rebuild_from) - pd.Timedelta(days=1)]
+            else:
+                manifest = None  # a changed VIX3M source rebuilds everything
+        if manifest is None:
+            cover_start, cover_end, rebuild_from, cached = start, end, start, None
+            vix3m_source, inputs, vix3m = _fingerprint(start, end)
+
+        if rebuild_from <= cover_end:
+            fresh = snap.build_signal_snapshots(
+                config, max(rebuild_from, cover_start), cover_end, snapshot_time, sync=False, vix3m=vix3m
+            )
+            frame = fresh if cached is None or cached.empty else pd.concat([cached, fresh])
+            manifest = {
+                "version": _MANIFEST_VERSION,
+                "snapshot_time": snapshot_time.isoformat("minutes"),
+                "start": cover_start.isoformat(),
+                "end": cover_end.isoformat(),
+                "vix3m_source": vix3m_source,
+                "inputs": inputs,
+            }
+            self._write(snapshot_time, frame, manifest)
+        else:
+            frame = cached
+        return frame.loc[pd.Timestamp(start) : pd.Timestamp(end)]
+
+
+def load_signal_snapshots(
+    config: AppConfig,
+    start: date,
+    end: date,
+    snapshot_time: time = snap.SNAPSHOT_TIME,
+) -> pd.DataFrame:
+    """Cached ``build_signal_snapshots``; see :class:`SnapshotCache`."""
+
+    return SnapshotCache().load(config, start, end, snapshot_time)
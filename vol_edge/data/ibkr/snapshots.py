@@ -1,58 +1,72 @@
-"""Build 15:45 ET signal snapshots from cached minute data."""
+"""Build 15:45 ET signal snapshots (or a surface over several times) from cached minute data."""
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Optional, Sequence, Tuple, Union
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
 from vol_edge.config import AppConfig
 
 from .downloader import (
-    load_or_fetch,
-    load_vix3m_with_fallback,
+    sync_minutes,
+    fetch_vix3m_daily,
     cache_path,
     _contract,
     _vix_contract,
 )
+from .minute_store import MinuteStore
 
 NY_TZ = ZoneInfo("America/New_York")
 SNAPSHOT_TIME = time(15, 45)
+CLOSE_TIME = time(16, 0)  # as-of 16:00 picks the 15:59 bar, i.e. the closing print
+SURFACE_TIMES: Tuple[time, ...] = (time(15, 30), time(15, 40), SNAPSHOT_TIME, time(15, 50), CLOSE_TIME)
+SNAPSHOT_FIELDS: Tuple[str, ...] = ("spy", "vix", "vix3m")
+_HOUR_NS = 3_600_000_000_000
 
 
-def _target_timestamp(trading_day: date, snapshot_time: time = SNAPSHOT_TIME) -> datetime:
-    return datetime.combine(trading_day, snapshot_time, tzinfo=NY_TZ)
+def _target_timestamps(days: np.ndarray, snapshot_times: Union[time, Sequence[time]] = SNAPSHOT_TIME) -> pd.DatetimeIndex:
+    """New York ``snapshot_times`` on ``days`` (``datetime64[D]``); one time, or one per day."""
 
+    if isinstance(snapshot_times, time):
+        snapshot_times = [snapshot_times] * len(days)
+    offsets = pd.to_timedelta([t.hour * 3600 + t.minute * 60 + t.second for t in snapshot_times], unit="s")
+    return (pd.DatetimeIndex(days) + offsets).tz_localize(NY_TZ)
 
-def _sample_at(df: pd.DataFrame, timestamp: datetime) -> pd.Series | None:
+
+def _local_days(index: pd.DatetimeIndex) -> np.ndarray:
+    """Distinct New York calendar days (``datetime64[D]``) of a tz-aware index.
+
+    New York's UTC offset is a whole number of hours, so every bar shares its
+    local day with its UTC hour; localizing the distinct hours is far cheaper
+    than localizing every minute.
+    """
+
+    hours = np.unique(index.asi8 // _HOUR_NS) * _HOUR_NS
+    local = pd.DatetimeIndex(hours.view("datetime64[ns]")).tz_localize("UTC").tz_convert(NY_TZ).tz_localize(None)
+    return np.unique(local.to_numpy().astype("datetime64[D]"))
+
+
+def _asof_close(df: pd.DataFrame, targets: pd.DatetimeIndex) -> np.ndarray:
+    """Close of the last bar at or before each target; NaN where there is none."""
+
+    out = np.full(len(targets), np.nan)
     if df.empty:
-        return None
-    if timestamp in df.index:
-        row = df.loc[timestamp]
-        return row if isinstance(row, pd.Series) else row.iloc[0]
-    subset = df.loc[:timestamp]
-    if subset.empty:
-        return None
-    if isinstance(subset, pd.Series):
-        return subset.iloc[-1]
-    return subset.iloc[-1]
-
-
-def _close_value(row: pd.Series | float) -> float:
-    if isinstance(row, pd.Series):
-        value = row.get("close", row.iloc[-1])
-        if isinstance(value, pd.Series):
-            value = value.iloc[0]
-        return float(value)
-    return float(row)
-
-
-def _prepare_minutes(symbol: str, contract_builder, config: AppConfig, start: datetime, end: datetime) -> pd.DataFrame:
-    contract = contract_builder(symbol)
-    df = load_or_fetch(symbol, contract, config, start, end)
-    if "adj_close" in df.columns:
-        df["close"] = df.get("close", df["adj_close"])
+        return out
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    closes = (df["close"] if "close" in df.columns else df.iloc[:, -1]).to_numpy(dtype=float)
+    pos = df.index.searchsorted(targets, side="right") - 1
+    found = pos >= 0
+    out[found] = closes[pos[found]]
+    return out
+
+
+def _to_new_york(df: pd.DataFrame) -> pd.DataFrame:
     if not df.index.tz:
         df.index = pd.to_datetime(df.index).tz_localize(NY_TZ)
     else:
@@ -60,49 +74,124 @@ def _prepare_minutes(symbol: str, contract_builder, config: AppConfig, start: da
     return df
 
 
+def _prepare_minutes(symbol: str, store: MinuteStore, start: datetime, end: datetime) -> pd.DataFrame:
+    df = store.read(start, end, columns=["close"])
+    if df.empty:
+        raise RuntimeError(f"No data returned for {symbol}")
+    return _to_new_york(df)
+
+
+def _load_vix3m(store: MinuteStore, start: datetime, end: datetime) -> pd.DataFrame:
+    """VIX3M minutes from the store, or Yahoo daily closes when IBKR has none."""
+
+    df = store.read(start, end, columns=["close"])
+    return _to_new_york(df if not df.empty else fetch_vix3m_daily(start, end))
+
+
+def _load_vix3m_daily(start: datetime, end: datetime) -> pd.DataFrame:
+    return _to_new_york(fetch_vix3m_daily(start, end))
+
+
+def _minute_window(start: date, end: date, padding_days: int = 30) -> Tuple[datetime, datetime]:
+    """UTC bounds of the minutes a snapshot build over ``[start, end]`` reads."""
+
+    start_dt = datetime.combine(start - timedelta(days=padding_days), time(0), tzinfo=NY_TZ).astimezone(timezone.utc)
+    end_dt = datetime.combine(end + timedelta(days=1), time(0), tzinfo=NY_TZ).astimezone(timezone.utc)
+    return start_dt, end_dt
+
+
+def _prefetch_minutes(config: AppConfig, start: datetime, end: datetime) -> Dict[str, MinuteStore]:
+    """Fill SPY/VIX/VIX3M cache gaps concurrently over one connection before sampling."""
+
+    return sync_minutes(
+        [("SPY", _contract("SPY")), ("^VIX", _vix_contract("^VIX")), ("^VIX3M", _vix_contract("VIX3M"))],
+        config,
+        start,
+        end,
+    )
+
+
+def _open_stores() -> Dict[str, MinuteStore]:
+    return {symbol: MinuteStore(cache_path(symbol)) for symbol in ("SPY", "^VIX", "^VIX3M")}
+
+
+@dataclass
+class SnapshotSurface:
+    """Signal snapshots at several intraday times, as a ``dates x times x fields`` array.
+
+    NaN marks a (date, time, field) with no bar at or before that time.
+    """
+
+    dates: pd.DatetimeIndex
+    times: Tuple[time, ...]
+    values: np.ndarray
+    fields: Tuple[str, ...] = SNAPSHOT_FIELDS
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def frame(self, snapshot_time: time = SNAPSHOT_TIME) -> pd.DataFrame:
+        """One time slice in ``build_signal_snapshots`` form: complete rows only."""
+
+        if snapshot_time not in self.times:
+            raise KeyError(f"{snapshot_time} not sampled; surface has {[t.isoformat('minutes') for t in self.times]}")
+        df = pd.DataFrame(self.values[:, self.times.index(snapshot_time), :], index=self.dates, columns=list(self.fields))
+        df = df.dropna()
+        if df.empty:
+            return pd.DataFrame(columns=list(self.fields)).set_index(pd.Index([], name="date"))
+        return df
+
+    def field(self, name: str) -> pd.DataFrame:
+        """``dates x times`` frame of one field, e.g. to compare VIX across sampling times."""
+
+        return pd.DataFrame(self.values[:, :, self.fields.index(name)], index=self.dates, columns=list(self.times))
+
+
+def build_snapshot_surface(
+    config: AppConfig,
+    start: date,
+    end: date,
+    times: Sequence[time] = SURFACE_TIMES,
+    sync: bool = True,
+    vix3m: Optional[pd.DataFrame] = None,
+) -> SnapshotSurface:
+    """Sample every time in ``times`` from one load of the cached minutes.
+
+    The minute stores are topped up once, then read directly; pass
+    ``sync=False`` when the caller has already synced them for this window.
+    ``vix3m`` supplies VIX3M bars already loaded by the caller (the snapshot
+    cache passes the Yahoo fallback series it fingerprinted).
+    """
+
+    times = tuple(sorted(set(times)))
+    start_dt, end_dt = _minute_window(start, end)
+
+    stores = _prefetch_minutes(config, start_dt, end_dt) if sync else _open_stores()
+    spy_minutes = _prepare_minutes("SPY", stores["SPY"], start_dt, end_dt)
+    vix_minutes = _prepare_minutes("^VIX", stores["^VIX"], start_dt, end_dt)
+    vix3m_df = vix3m if vix3m is not None else _load_vix3m(stores["^VIX3M"], start_dt, end_dt)
+
+    trading_days = _local_days(spy_minutes.index)
+    trading_days = trading_days[
+        (trading_days >= np.datetime64(start, "D")) & (trading_days <= np.datetime64(end, "D"))
+    ]
+    # day-major, time-minor: already ascending, so one searchsorted per symbol covers every time
+    targets = _target_timestamps(np.repeat(trading_days, len(times)), np.tile(times, len(trading_days)))
+    values = np.stack(
+        [_asof_close(frame, targets) for frame in (spy_minutes, vix_minutes, vix3m_df)],
+        axis=-1,
+    ).reshape(len(trading_days), len(times), len(SNAPSHOT_FIELDS))
+    dates = pd.DatetimeIndex(trading_days.astype("datetime64[ns]"), name="date")
+    return SnapshotSurface(dates=dates, times=times, values=values)
+
+
 def build_signal_snapshots(
     config: AppConfig,
     start: date,
     end: date,
     snapshot_time: time = SNAPSHOT_TIME,
+    sync: bool = True,
+    vix3m: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
-    padding_days = 30
-    start_dt = datetime.combine(start - timedelta(days=padding_days), time(0), tzinfo=NY_TZ).astimezone(timezone.utc)
-    end_dt = datetime.combine(end + timedelta(days=1), time(0), tzinfo=NY_TZ).astimezone(timezone.utc)
-
-    spy_minutes = _prepare_minutes("SPY", _contract, config, start_dt, end_dt)
-    vix_minutes = _prepare_minutes("^VIX", _vix_contract, config, start_dt, end_dt)
-    vix3m_df = load_vix3m_with_fallback(config, start_dt, end_dt)
-    if not vix3m_df.index.tz:
-        vix3m_df.index = pd.to_datetime(vix3m_df.index).tz_localize(NY_TZ)
-    else:
-        vix3m_df.index = pd.to_datetime(vix3m_df.index).tz_convert(NY_TZ)
-
-    trading_days = sorted(set(spy_minutes.index.date))
-    records: list[dict] = []
-
-    for day in trading_days:
-        if day < start or day > end:
-            continue
-        target_ts = _target_timestamp(day, snapshot_time)
-        spy_row = _sample_at(spy_minutes, target_ts)
-        if spy_row is None:
-            continue
-        vix_row = _sample_at(vix_minutes, target_ts)
-        vix3m_row = _sample_at(vix3m_df, target_ts)
-        if vix_row is None or vix3m_row is None:
-            continue
-        records.append(
-            {
-                "date": pd.Timestamp(day),
-                "spy": _close_value(spy_row),
-                "vix": _close_value(vix_row),
-                "vix3m": _close_value(vix3m_row),
-            }
-        )
-
-    if not records:
-        return pd.DataFrame(columns=["spy", "vix", "vix3m"]).set_index(pd.Index([], name="date"))
-
-    df = pd.DataFrame(records).set_index("date").sort_index()
-    return df
+    surface = build_snapshot_surface(config, start, end, times=(snapshot_time,), sync=sync, vix3m=vix3m)
+    return surface.frame(snapshot_time)
@@ -0,0 +1,111 @@
+"""Date-aligned price panel built once from ``MarketData``."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+import pandas as pd
+
+from vol_edge.config import MissingDataPolicy
+from vol_edge.profiling import profiled
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .sources import MarketData
+
+PANEL_SYMBOLS: Tuple[str, ...] = ("spy", "vix", "vix3m", "long_vol", "short_vol")
+PANEL_FIELDS: Tuple[str, ...] = ("close", "adj_close", "open", "high", "low")
+
+
+class MissingDataError(ValueError):
+    """Raised under ``MissingDataPolicy.FAIL`` when a symbol lacks a trading date."""
+
+
+@dataclass
+class MarketPanel:
+    """Prices on one trading-date index (SPY's), as a ``dates x symbols x fields`` array.
+
+    ``adj_close`` falls back to ``close`` wherever the adjusted print is missing,
+    so it is always the price the engines trade and value positions at.
+    ``open``/``high``/``low`` are the raw prints (NaN where a source lacks them)
+    and only feed the range-based realized-vol estimators.
+    """
+
+    dates: pd.DatetimeIndex
+    values: np.ndarray
+    policy: MissingDataPolicy
+    symbols: Tuple[str, ...] = PANEL_SYMBOLS
+    fields: Tuple[str, ...] = PANEL_FIELDS
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def column(self, symbol: str, field: str = "adj_close") -> np.ndarray:
+        return self.values[:, self.symbols.index(symbol), self.fields.index(field)]
+
+    def series(self, symbol: str, field: str = "adj_close") -> pd.Series:
+        return pd.Series(self.column(symbol, field), index=self.dates, name=symbol)
+
+    def bars(self, symbol: str) -> pd.DataFrame:
+        """One symbol's fields as a frame on the panel dates."""
+
+        return pd.DataFrame(self.values[:, self.symbols.index(symbol), :], index=self.dates, columns=list(self.fields))
+
+    def offset(self, ts: pd.Timestamp) -> int:
+        """Integer position of ``ts``; raises ``KeyError`` for non-trading dates."""
+
+        return self.dates.get_loc(pd.Timestamp(ts))
+
+    def since(self, start: pd.Timestamp) -> "MarketPanel":
+        begin = self.dates.searchsorted(pd.Timestamp(start))
+        return MarketPanel(dates=self.dates[begin:], values=self.values[begin:], policy=self.policy)
+
+
+def _frame_values(df: pd.DataFrame, dates: pd.DatetimeIndex) -> np.ndarray:
+    def numeric(name: str) -> np.ndarray:
+        if name not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+
+    close = numeric("close")
+    adj = numeric("adj_close") if "adj_close" in df.columns else close
+    adj = np.where(np.isnan(adj), close, adj)
+    values = np.column_stack([close, adj] + [numeric(name) for name in PANEL_FIELDS[2:]])
+    index = df.index
+    if index.has_duplicates:
+        keep = ~index.duplicated(keep="last")
+        index, values = index[keep], values[keep]
+    rows = index.get_indexer(dates)
+    out = values[rows]
+    out[rows < 0] = np.nan
+    return out
+
+
+@profiled("data.panel")
+def build_panel(data: "MarketData", policy: MissingDataPolicy = MissingDataPolicy.FAIL) -> MarketPanel:
+    """Align every symbol to SPY's trading dates and apply the missing-data policy."""
+
+    policy = MissingDataPolicy(policy)
+    spy = data.spy[~data.spy.index.duplicated(keep="last")].sort_index()
+    dates = pd.DatetimeIndex(spy.index)
+    values = np.stack([_frame_values(getattr(data, sym), dates) for sym in PANEL_SYMBOLS], axis=1)
+
+    price_missing = np.isnan(values[:, :, PANEL_FIELDS.index("adj_close")])
+    if policy is MissingDataPolicy.FAIL and price_missing.any():
+        details = []
+        for j, sym in enumerate(PANEL_SYMBOLS):
+            gaps = dates[price_missing[:, j]]
+            if len(gaps):
+                details.append(f"{sym} ({len(gaps)} dates, first {gaps[0].date()})")
+        raise MissingDataError(f"Missing prices on SPY trading dates: {', '.join(details)}")
+    if policy is MissingDataPolicy.FFILL:
+        flat = pd.DataFrame(values.reshape(len(dates), -1)).ffill().to_numpy()
+        values = flat.reshape(values.shape)
+        price_missing = np.isnan(values[:, :, PANEL_FIELDS.index("adj_close")])
+    # DROP, and FFILL for leading gaps that have nothing to carry forward.
+    keep = ~price_missing.any(axis=1)
+    if not keep.all():
+        dates = dates[keep]
+        values = values[keep]
+    return MarketPanel(dates=dates, values=np.ascontiguousarray(values), policy=policy)
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Protocol
+from typing import Dict, List, Optional, Protocol, Tuple
 
 import pandas as pd
-import yfinance as yf
 
-from vol_edge.config import AppConfig, DataProvider
+from vol_edge.config import AppConfig, DataProvider, MissingDataPolicy
+from vol_edge.profiling import profiled
+
+from .csv_cache import CsvCache, parse_csv
+from .panel import MarketPanel, build_panel
+from .yahoo_cache import Coverage, YahooCache, merge_bars, plan_fetches
 
 
 @dataclass
@@ -20,6 +25,19 @@ class MarketData:
     vix3m: pd.DataFrame
     long_vol: pd.DataFrame
     short_vol: pd.DataFrame
+    panel: Optional[MarketPanel] = field(default=None, repr=False, compare=False)
+
+    def aligned(self, policy: MissingDataPolicy = MissingDataPolicy.FAIL) -> MarketPanel:
+        """Return the date-aligned panel, building (and caching) it on first use.
+
+        The cache assumes the frames are not mutated afterwards; build a new
+        ``MarketData`` rather than editing one in place.
+        """
+
+        policy = MissingDataPolicy(policy)
+        if self.panel is None or self.panel.policy is not policy:
+            self.panel = build_panel(self, policy)
+        return self.panel
 
 
 class DataSource(Protocol):
@@ -37,71 +55,147 @@ def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     return out[_REQUIRED_COLS]
 
 
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(columns=_REQUIRED_COLS, index=pd.DatetimeIndex([], name="date"), dtype=float)
+
+
 def _load_csv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, parse_dates=["date"])
-    df = df.set_index("date").sort_index()
-    df.columns = [c.lower() for c in df.columns]
-    return _ensure_columns(df)
+    return _ensure_columns(parse_csv(path))
+
+
+_CSV_ROLES = ("spy", "vix", "vix3m", "long_vol", "short_vol")
 
 
 class CSVDataSource:
+    """Daily bars from five CSV files, read concurrently.
+
+    With ``data.csv.cache_dir`` set, each CSV is converted once to a
+    memory-mapped Arrow file and only the requested date range is materialized.
+    """
+
     def __init__(self, config: AppConfig):
         if not config.data.csv:
             raise ValueError("CSV paths missing in config")
         self.paths = config.data.csv
+        self.missing_data = config.data.missing_data
+        self.cache = CsvCache(self.paths.cache_dir) if self.paths.cache_dir is not None else None
+
+    def _load_one(self, path: Path, start: date, end: date | None) -> pd.DataFrame:
+        if self.cache is not None:
+            return _ensure_columns(self.cache.load(path, start, end))
+        return _load_csv(path).loc[slice(pd.Timestamp(start), pd.Timestamp(end) if end else None)]
 
+    @profiled("data.load")
     def load(self, start: date, end: date | None = None) -> MarketData:
-        spy = _load_csv(self.paths.spy)
-        vix = _load_csv(self.paths.vix)
-        vix3m = _load_csv(self.paths.vix3m)
-        long_vol = _load_csv(self.paths.long_vol)
-        short_vol = _load_csv(self.paths.short_vol)
-        slice_ = slice(pd.Timestamp(start), pd.Timestamp(end) if end else None)
-        return MarketData(
-            spy=spy.loc[slice_],
-            vix=vix.loc[slice_],
-            vix3m=vix3m.loc[slice_],
-            long_vol=long_vol.loc[slice_],
-            short_vol=short_vol.loc[slice_],
-        )
+        paths = [getattr(self.paths, role) for role in _CSV_ROLES]
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            frames = list(pool.map(lambda path: self._load_one(path, start, end), paths))
+        data = MarketData(**dict(zip(_CSV_ROLES, frames)))
+        data.aligned(self.missing_data)
+        return data
+
+
+def _download(symbols: List[str], start: date, end: date | None) -> Dict[str, pd.DataFrame]:
+    import yfinance as yf  # deferred so CSV runs never pay for yfinance's import
+
+    data = yf.download(symbols, start=start, end=end, auto_adjust=False, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        return {sym: _normalize_from_multiindex(data, sym) for sym in symbols}
+    return {symbols[0]: _ensure_columns(data.rename(columns=_YAHOO_COLUMNS))}  # single symbol fetch
 
 
 class YahooDataSource:
+    """Daily bars from Yahoo, optionally through a per-symbol Parquet cache.
+
+    With ``data.yfinance.cache_dir`` set, later loads read the cache and only
+    download the missing head/tail (plus ``revision_days`` of overlap); with
+    ``offline`` they never touch the network.
+    """
+
     def __init__(self, config: AppConfig):
         self.config = config
+        settings = config.data.yfinance
+        self.cache = YahooCache(settings.cache_dir) if settings.cache_dir is not None else None
 
-    def load(self, start: date, end: date | None = None) -> MarketData:
-        symbols = [
+    def _symbols(self) -> List[str]:
+        return [
             "SPY",
             "^VIX",
             "^VIX3M",
             self.config.instruments.long_vol.symbol,
             self.config.instruments.short_vol.symbol,
         ]
-        data = yf.download(symbols, start=start, end=end, auto_adjust=False, progress=False)
-        if isinstance(data.columns, pd.MultiIndex):
-            frames = {sym: _normalize_from_multiindex(data, sym) for sym in symbols}
+
+    def _load_cached(self, symbols: List[str], start: date, end: date | None) -> Dict[str, pd.DataFrame]:
+        settings = self.config.data.yfinance
+        # yfinance's ``end`` is exclusive; an open end means "through today".
+        today = date.today()
+        horizon = today + timedelta(days=1)
+        stop = min(end, horizon) if end is not None else horizon
+        # Today's bar may still be forming, so it is never recorded as covered
+        # and the next run requests it again.
+        covered_end = min(stop, today)
+        cached = {sym: self.cache.read(sym) for sym in symbols}
+
+        if settings.offline:
+            missing = [sym for sym, frame in cached.items() if frame is None]
+            if missing:
+                raise RuntimeError(f"Offline mode: no cached Yahoo data for {', '.join(missing)}")
+        else:
+            # Symbols needing the same ranges share one yf.download call.
+            groups: Dict[Tuple[Tuple[date, date], ...], List[str]] = {}
+            for sym in symbols:
+                frame = cached[sym]
+                last_bar = frame.index[-1] if frame is not None and len(frame) else None
+                ranges = plan_fetches(self.cache.coverage(sym), last_bar, start, stop, settings.revision_days)
+                if ranges:
+                    groups.setdefault(tuple(ranges), []).append(sym)
+            for ranges, group in groups.items():
+                for fetch_start, fetch_end in ranges:
+                    fresh = _download(group, fetch_start, fetch_end)
+                    for sym in group:
+                        cached[sym] = merge_bars(cached[sym], fresh.get(sym, _empty_bars()))
+                for sym in group:
+                    previous = self.cache.coverage(sym)
+                    coverage = Coverage(start, covered_end)
+                    if previous is not None:
+                        coverage = Coverage(min(start, previous.start), max(covered_end, previous.end))
+                    self.cache.write(sym, cached[sym], coverage)
+
+        window = slice(pd.Timestamp(start), pd.Timestamp(stop) - pd.Timedelta(days=1))
+        return {sym: _ensure_columns(frame.loc[window]) for sym, frame in cached.items()}
+
+    @profiled("data.load")
+    def load(self, start: date, end: date | None = None) -> MarketData:
+        symbols = self._symbols()
+        if self.cache is not None:
+            frames = self._load_cached(symbols, start, end)
         else:
-            frames = {"SPY": _ensure_columns(data)}  # fallback for single symbol fetch
-        return MarketData(
+            frames = _download(symbols, start, end)
+        data = MarketData(
             spy=frames["SPY"],
             vix=frames["^VIX"],
             vix3m=frames["^VIX3M"],
             long_vol=frames[self.config.instruments.long_vol.symbol],
             short_vol=frames[self.config.instruments.short_vol.symbol],
         )
+        data.aligned(self.config.data.missing_data)
+        return data
+
+
+_YAHOO_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume",
+}
 
 
 def _normalize_from_multiindex(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
     cols = df.xs(symbol, axis=1, level=1)
-    cols = cols.rename(columns={
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Adj Close": "adj_close",
-        "Volume": "volume",
-    })
+    cols = cols.rename(columns=_YAHOO_COLUMNS)
     cols.index = cols.index.tz_localize(None)
     return _ensure_columns(cols)
 
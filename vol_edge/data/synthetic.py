@@ -0,0 +1,204 @@
+"""Seeded synthetic market data for tests and benchmarks.
+
+Clearly synthetic: a two-state Markov regime (contango / backwardation)
+drives a mean-reverting log-VIX, the VIX3M spread sign, SPY volatility and the
+roll yield of the long/short vol ETNs. Good enough to exercise every strategy
+branch at realistic sizes; not a market model.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .sources import MarketData
+
+TRADING_DAYS = 252
+MINUTES_PER_DAY = 390
+MINUTE_SYMBOLS = ("SPY", "^VIX", "^VIX3M")
+
+
+@dataclass(frozen=True)
+class RegimeParams:
+    """Per-regime dynamics; index 0 = contango, 1 = backwardation."""
+
+    switch_prob: tuple = (0.02, 0.10)  # P(leave regime) per day
+    vix_mean: tuple = (16.0, 32.0)
+    vix_vol: tuple = (0.06, 0.10)
+    vix3m_spread: tuple = (0.08, -0.08)  # log(VIX3M / VIX)
+    roll_yield: tuple = (0.004, -0.002)  # daily drag on long-vol ETN
+    vix_reversion: float = 0.05
+    spy_drift: float = 0.0003
+    spy_vix_corr: float = -0.7
+
+
+def _regimes(rng: np.random.Generator, n: int, params: RegimeParams) -> np.ndarray:
+    draws = rng.random(n)
+    states = np.empty(n, dtype=np.int8)
+    state = 0
+    for t in range(n):
+        if draws[t] < params.switch_prob[state]:
+            state = 1 - state
+        states[t] = state
+    return states
+
+
+def _ohlc_frame(rng: np.random.Generator, dates: pd.DatetimeIndex, close: np.ndarray, noise: float) -> pd.DataFrame:
+    prev = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev * np.exp(rng.normal(0.0, noise / 4, len(close)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, noise / 2, len(close))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, noise / 2, len(close))))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "adj_close": close,
+            "volume": rng.integers(1_000_000, 50_000_000, len(close)),
+        },
+        index=pd.DatetimeIndex(dates, name="date"),
+    )
+
+
+def _daily_paths(years: float, seed: int, start: str, params: RegimeParams) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    n = max(int(round(years * TRADING_DAYS)), 2)
+    regime = _regimes(rng, n, params)
+    mean = np.log(np.asarray(params.vix_mean))[regime]
+    shock_vol = np.asarray(params.vix_vol)[regime]
+
+    z_vix = rng.standard_normal(n)
+    log_vix = np.empty(n)
+    log_vix[0] = mean[0]
+    for t in range(1, n):
+        log_vix[t] = log_vix[t - 1] + params.vix_reversion * (mean[t] - log_vix[t - 1]) + shock_vol[t] * z_vix[t]
+    vix = np.exp(log_vix)
+    spread = np.asarray(params.vix3m_spread)[regime] + rng.normal(0.0, 0.02, n)
+    vix3m = vix * np.exp(spread)
+
+    sigma = vix / 100 / np.sqrt(TRADING_DAYS) * 0.85
+    corr = params.spy_vix_corr
+    z_spy = corr * z_vix + np.sqrt(1 - corr**2) * rng.standard_normal(n)
+    spy_ret = params.spy_drift - 0.5 * sigma**2 + sigma * z_spy
+    spy_ret[0] = 0.0
+    spy = 250.0 * np.exp(np.cumsum(spy_ret))
+
+    dlog_vix = np.concatenate([[0.0], np.diff(log_vix)])
+    roll = np.asarray(params.roll_yield)[regime]
+    long_ret = np.clip(1.5 * 0.5 * dlog_vix - roll, -0.9, None)
+    short_ret = np.clip(-0.5 * dlog_vix + roll * 0.6, -0.9, None)
+    long_ret[0] = short_ret[0] = 0.0
+    return {
+        "dates": pd.bdate_range(start, periods=n),
+        "regime": regime,
+        "spy": spy,
+        "vix": vix,
+        "vix3m": vix3m,
+        "long_vol": 20.0 * np.cumprod(1 + long_ret),
+        "short_vol": 40.0 * np.cumprod(1 + short_ret),
+        "rng": rng,
+    }
+
+
+def generate_daily_market_data(
+    years: float,
+    seed: int = 0,
+    start: str = "2008-01-02",
+    params: Optional[RegimeParams] = None,
+) -> MarketData:
+    """Business-daily SPY/VIX/VIX3M/ETN OHLCV frames covering ``years`` years."""
+
+    paths = _daily_paths(years, seed, start, params or RegimeParams())
+    rng = paths["rng"]
+    dates = paths["dates"]
+    return MarketData(
+        spy=_ohlc_frame(rng, dates, paths["spy"], 0.008),
+        vix=_ohlc_frame(rng, dates, paths["vix"], 0.05),
+        vix3m=_ohlc_frame(rng, dates, paths["vix3m"], 0.03),
+        long_vol=_ohlc_frame(rng, dates, paths["long_vol"], 0.04),
+        short_vol=_ohlc_frame(rng, dates, paths["short_vol"], 0.03),
+    )
+
+
+def _minute_frame(
+    rng: np.random.Generator,
+    index: pd.DatetimeIndex,
+    prev_close: np.ndarray,
+    close: np.ndarray,
+    daily_vol: np.ndarray,
+) -> pd.DataFrame:
+    days = len(close)
+    steps = np.arange(1, MINUTES_PER_DAY + 1) / MINUTES_PER_DAY
+    walk = np.cumsum(rng.standard_normal((days, MINUTES_PER_DAY)), axis=1)
+    walk *= (daily_vol / np.sqrt(MINUTES_PER_DAY))[:, None]
+    bridge = walk - steps[None, :] * walk[:, -1:]
+    log_path = np.log(prev_close)[:, None] + steps[None, :] * np.log(close / prev_close)[:, None] + bridge
+    closes = np.exp(log_path)
+    opens = np.concatenate([prev_close[:, None], closes[:, :-1]], axis=1)
+    wiggle = np.abs(rng.normal(0.0, 1e-4, (days, MINUTES_PER_DAY)))
+    return pd.DataFrame(
+        {
+            "open": opens.ravel(),
+            "high": (np.maximum(opens, closes) * (1 + wiggle)).ravel(),
+            "low": (np.minimum(opens, closes) * (1 - wiggle)).ravel(),
+            "close": closes.ravel(),
+            "volume": rng.integers(1_000, 200_000, days * MINUTES_PER_DAY),
+        },
+        index=index,
+    )
+
+
+def generate_minute_bars(
+    years: float,
+    seed: int = 0,
+    start: str = "2015-01-02",
+    params: Optional[RegimeParams] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Regular-hours 1-minute bars for SPY, ^VIX and ^VIX3M.
+
+    Each day is a Brownian bridge from the previous close to the daily close of
+    the matching ``generate_daily_market_data`` path, labelled 09:30…15:59 ET
+    like IBKR's bar start times.
+    """
+
+    paths = _daily_paths(years, seed, start, params or RegimeParams())
+    rng = paths["rng"]
+    dates = paths["dates"]
+    offsets = pd.to_timedelta(np.arange(MINUTES_PER_DAY), unit="min") + pd.Timedelta(hours=9, minutes=30)
+    naive = (dates.values[:, None] + offsets.values[None, :]).ravel()
+    index = pd.DatetimeIndex(naive, name="date").tz_localize("America/New_York")
+
+    bars: Dict[str, pd.DataFrame] = {}
+    for symbol, key, vol in (("SPY", "spy", 0.01), ("^VIX", "vix", 0.06), ("^VIX3M", "vix3m", 0.03)):
+        close = paths[key]
+        prev = np.concatenate([[close[0]], close[:-1]])
+        bars[symbol] = _minute_frame(rng, index, prev, close, np.full(len(close), vol))
+    return bars
+
+
+def write_minute_cache(
+    bars: Dict[str, pd.DataFrame],
+    base_dir: Path = Path("data/ibkr_cache"),
+    padding: pd.Timedelta = pd.Timedelta(days=60),
+) -> None:
+    """Persist minute bars where the IBKR downloader looks for its cache.
+
+    Coverage is recorded ``padding`` either side of the bars so lookback
+    padding in snapshot builds never triggers a download.
+    """
+
+    from .ibkr.coverage import save_coverage
+    from .ibkr.downloader import cache_path
+    from .ibkr.minute_store import MinuteStore
+
+    for symbol, frame in bars.items():
+        path = cache_path(symbol, Path(base_dir))
+        MinuteStore(path).write(frame)
+        start = frame.index[0].tz_convert("UTC") - padding
+        end = frame.index[-1].tz_convert("UTC") + padding
+        save_coverage(path, [(start, end)])
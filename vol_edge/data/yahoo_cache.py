@@ -0,0 +1,133 @@
+"""On-disk per-symbol cache for Yahoo daily bars.
+
+Each symbol is one Parquet file; ``manifest.json`` records the half-open
+``[start, end)`` range that has been requested from Yahoo for it, so ranges
+where Yahoo simply has no bars (before an ETN's inception, holidays at the
+tail) are not re-requested on every run.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+_MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class Coverage:
+    start: date
+    end: date  # exclusive, like yfinance's ``end``
+
+
+def _file_name(symbol: str) -> str:
+    return symbol.replace("^", "_").replace("/", "_") + ".parquet"
+
+
+class YahooCache:
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self._coverage = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Coverage]:
+        path = self.base_dir / _MANIFEST
+        if not path.exists():
+            return {}
+        payload = json.loads(path.read_text())
+        return {
+            symbol: Coverage(date.fromisoformat(item["start"]), date.fromisoformat(item["end"]))
+            for symbol, item in payload.items()
+        }
+
+    def _write_manifest(self) -> None:
+        payload = {
+            symbol: {"start": cov.start.isoformat(), "end": cov.end.isoformat()}
+            for symbol, cov in sorted(self._coverage.items())
+        }
+        tmp = self.base_dir / f"{_MANIFEST}.tmp"
+        tmp.write_text(json.dumps(payload, indent=2))
+        tmp.replace(self.base_dir / _MANIFEST)
+
+    def coverage(self, symbol: str) -> Optional[Coverage]:
+        return self._coverage.get(symbol)
+
+    def read(self, symbol: str) -> Optional[pd.DataFrame]:
+        path = self.base_dir / _file_name(symbol)
+        if symbol not in self._coverage or not path.exists():
+            return None
+        return pd.read_parquet(path)
+
+    def write(self, symbol: str, frame: pd.DataFrame, coverage: Coverage) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.base_dir / f"{_file_name(symbol)}.tmp"
+        frame.to_parquet(tmp)
+        tmp.replace(self.base_dir / _file_name(symbol))
+        self._coverage[symbol] = coverage
+        self._write_manifest()
+
+
+def plan_fetches(
+    coverage: Optional[Coverage],
+    last_bar: Optional[pd.Timestamp],
+    start: date,
+    end: date,
+    revision_days: int,
+) -> List[Tuple[date, date]]:
+    """Half-open ranges still to download so the cache covers ``[start, end)``.
+
+    The tail is re-requested from ``revision_days`` calendar days before the
+    last cached bar, so late corrections and dividend adjustments are seen.
+    Ranges always extend to meet the cached one, even when ``[start, end)``
+    lies wholly before or after it: coverage is a single interval, so any
+    gap between the two would otherwise be recorded as covered.
+    """
+
+    if coverage is None:
+        return [(start, end)]
+    ranges: List[Tuple[date, date]] = []
+    if start < coverage.start:
+        ranges.append((start, coverage.start))
+    if end > coverage.end:
+        anchor = last_bar.date() if last_bar is not None else coverage.end
+        tail_start = min(anchor, coverage.end) - timedelta(days=revision_days)
+        ranges.append((tail_start, end))
+    return ranges
+
+
+def _adj_factor(frame: pd.DataFrame, ts: pd.Timestamp) -> float:
+    close, adj = frame.at[ts, "close"], frame.at[ts, "adj_close"]
+    if pd.isna(close) or pd.isna(adj) or float(close) == 0.0:
+        return float("nan")
+    return float(adj) / float(close)
+
+
+def merge_bars(cached: Optional[pd.DataFrame], fresh: pd.DataFrame) -> pd.DataFrame:
+    """Overlay ``fresh`` on ``cached``; re-adjust history if Yahoo's adj-close factor moved.
+
+    Yahoo back-adjusts the whole ``adj_close`` history after a dividend or
+    split. When the first overlapping bar's close/adj_close ratio differs, the
+    older cached ``adj_close`` values are rescaled by the same factor. Columns
+    come back numeric so the Parquet round trip is lossless.
+    """
+
+    fresh = fresh.apply(pd.to_numeric, errors="coerce")
+    if cached is None or cached.empty:
+        return fresh.sort_index()
+    if fresh.empty:
+        return cached
+    overlap = fresh.index.intersection(cached.index)
+    if len(overlap):
+        first = overlap[0]
+        old_factor = _adj_factor(cached, first)
+        new_factor = _adj_factor(fresh, first)
+        if pd.notna(old_factor) and pd.notna(new_factor) and abs(new_factor / old_factor - 1.0) > 1e-9:
+            cached = cached.copy()
+            older = cached.index < first
+            cached.loc[older, "adj_close"] = cached.loc[older, "adj_close"].astype(float) * (new_factor / old_factor)
+    merged = pd.concat([cached, fresh])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from vol_edge.config import AppConfig, DataProvider
-from vol_edge.data import MarketData, get_data_source
-from vol_edge.data.ibkr.snapshots import build_signal_snapshots
+from vol_edge.config import AppConfig, BacktestEngine, DataProvider, RealizedVolEstimator
+from vol_edge.data import MarketData, MarketPanel, get_data_source
 from vol_edge.portfolio import PortfolioState, RebalanceEngine
+from vol_edge.profiling import stage
 from vol_edge.signals import (
+    TERM_STATES,
     TermStructureState,
     compute_erv30,
+    compute_erv30_series,
     compute_evrp,
+    compute_realized_vol_estimators,
     compute_term_structure_state,
 )
 from vol_edge.strategies import StrategyContext, build_strategy
@@ -33,109 +37,330 @@ class DailyRecord:
     term_structure: TermStructureState
 
 
+def _weights_dict(symbols: Sequence[str], row: np.ndarray) -> Dict[str, float]:
+    return {sym: float(w) for sym, w in zip(symbols, row.tolist()) if w == w}
+
+
 @dataclass
+class RecordTable:
+    """Struct-of-arrays daily audit trail.
+
+    Weight matrices are ``dates x symbols``; NaN marks a symbol that is absent
+    from that day's target/holdings dict (``DailyRecord`` semantics), 0.0 a
+    symbol present at zero weight. ``term_structure`` holds int8 codes
+    (0 = contango, 1 = backwardation).
+    """
+
+    dates: pd.DatetimeIndex
+    symbols: Tuple[str, ...]
+    equity: np.ndarray
+    target_weights: np.ndarray
+    actual_weights: np.ndarray
+    vix: np.ndarray
+    vix3m: np.ndarray
+    erv30: np.ndarray
+    evrp: np.ndarray
+    term_structure: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def record(self, i: int) -> DailyRecord:
+        return DailyRecord(
+            date=self.dates[i],
+            equity=float(self.equity[i]),
+            target_weights=_weights_dict(self.symbols, self.target_weights[i]),
+            actual_weights=_weights_dict(self.symbols, self.actual_weights[i]),
+            vix=float(self.vix[i]),
+            vix3m=float(self.vix3m[i]),
+            erv30=float(self.erv30[i]),
+            evrp=float(self.evrp[i]),
+            term_structure=TERM_STATES[self.term_structure[i]],
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per date; weights as ``target_<symbol>`` / ``weight_<symbol>`` columns."""
+
+        frame = pd.DataFrame(
+            {
+                "equity": self.equity,
+                "vix": self.vix,
+                "vix3m": self.vix3m,
+                "erv30": self.erv30,
+                "evrp": self.evrp,
+                "term_structure": pd.Categorical.from_codes(
+                    self.term_structure, categories=[state.value for state in TERM_STATES]
+                ),
+            },
+            index=pd.Index(self.dates, name="date"),
+        )
+        for j, sym in enumerate(self.symbols):
+            frame[f"target_{sym}"] = self.target_weights[:, j]
+            frame[f"weight_{sym}"] = self.actual_weights[:, j]
+        return frame
+
+    @classmethod
+    def from_records(cls, records: Sequence[DailyRecord], symbols: Sequence[str] = ()) -> "RecordTable":
+        symbols = list(symbols)
+        for rec in records:
+            for sym in (*rec.target_weights, *rec.actual_weights):
+                if sym not in symbols:
+                    symbols.append(sym)
+        n, k = len(records), len(symbols)
+        target = np.full((n, k), np.nan)
+        actual = np.full((n, k), np.nan)
+        column = {sym: j for j, sym in enumerate(symbols)}
+        for i, rec in enumerate(records):
+            for sym, weight in rec.target_weights.items():
+                target[i, column[sym]] = weight
+            for sym, weight in rec.actual_weights.items():
+                actual[i, column[sym]] = weight
+        return cls(
+            dates=pd.DatetimeIndex([rec.date for rec in records]),
+            symbols=tuple(symbols),
+            equity=np.array([rec.equity for rec in records], dtype=float),
+            target_weights=target,
+            actual_weights=actual,
+            vix=np.array([rec.vix for rec in records], dtype=float),
+            vix3m=np.array([rec.vix3m for rec in records], dtype=float),
+            erv30=np.array([rec.erv30 for rec in records], dtype=float),
+            evrp=np.array([rec.evrp for rec in records], dtype=float),
+            term_structure=np.array([TERM_STATES.index(rec.term_structure) for rec in records], dtype=np.int8),
+        )
+
+
+class RecordView(Sequence[DailyRecord]):
+    """Read-only ``DailyRecord`` sequence materialized lazily from a ``RecordTable``."""
+
+    def __init__(self, table: RecordTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._table.record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return self._table.record(index)
+
+
+@dataclass(init=False)
 class BacktestResult:
     equity_curve: pd.Series
     benchmark_curve: pd.Series
-    records: List[DailyRecord]
+    table: RecordTable
 
+    def __init__(
+        self,
+        equity_curve: pd.Series,
+        benchmark_curve: pd.Series,
+        records: Optional[Sequence[DailyRecord]] = None,
+        table: Optional[RecordTable] = None,
+    ):
+        if table is None:
+            table = RecordTable.from_records(records or [])
+        self.equity_curve = equity_curve
+        self.benchmark_curve = benchmark_curve
+        self.table = table
 
-def _price(df: pd.DataFrame, ts: pd.Timestamp) -> float:
-    row = df.loc[ts]
-    if "adj_close" in row:
-        return float(row["adj_close"])
-    return float(row["close"])
+    @property
+    def records(self) -> RecordView:
+        return RecordView(self.table)
 
 
-def _ensure_series(df: pd.DataFrame, column: str) -> pd.Series:
-    if column in df.columns:
-        return df[column]
-    raise ValueError(f"Missing column {column}")
+def _signal_inputs(
+    config: AppConfig,
+    dates: pd.DatetimeIndex,
+    spy_adj: pd.Series,
+    snapshots: Optional[pd.DataFrame] = None,
+) -> Tuple[pd.Series, Optional[pd.DataFrame]]:
+    """Return the close series feeding eRV30 and the intraday snapshots, if any.
 
+    Explicit ``snapshots`` (e.g. one ``SnapshotSurface.frame`` slice) win;
+    otherwise the IBKR provider loads the (cached) 15:45 snapshots.
+    """
+
+    if snapshots is not None:
+        intraday_snapshots = snapshots
+    elif config.data.provider != DataProvider.IBKR:
+        return spy_adj, None
+    else:
+        from vol_edge.data.ibkr.snapshot_cache import load_signal_snapshots  # pulls in ib_insync
+
+        end_date = config.backtest.end_date or dates[-1].date()
+        with stage("data.signal_snapshots"):
+            intraday_snapshots = load_signal_snapshots(config, config.backtest.start_date, end_date)
+    if intraday_snapshots.empty:
+        raise ValueError("No intraday snapshots available")
+    return intraday_snapshots["spy"], intraday_snapshots
+
+
+def _erv30_by_signal_date(
+    config: AppConfig,
+    panel: MarketPanel,
+    signal_series: pd.Series,
+    intraday_snapshots: Optional[pd.DataFrame],
+    window: int = 10,
+) -> pd.Series:
+    """eRV30 on the signal dates from the configured ``strategy.erv30_estimator``.
+
+    Close-to-close and EWMA use the returns of ``signal_series``. The range
+    estimators use SPY's daily OHLC; with intraday snapshots the day's range
+    is not yet known at the snapshot, so they use sessions up to the prior day.
+    """
+
+    estimator = RealizedVolEstimator(config.strategy.erv30_estimator)
+    closes = signal_series.astype(float)
+    if estimator is RealizedVolEstimator.CLOSE_TO_CLOSE:
+        return compute_erv30_series(closes, window=window)
+    bars = panel.bars("spy")
+    if estimator in (RealizedVolEstimator.PARKINSON, RealizedVolEstimator.GARMAN_KLASS):
+        if bars[["open", "high", "low"]].isna().all().any():
+            raise ValueError(f"{estimator.value} eRV30 needs SPY open/high/low prices")
+    if intraday_snapshots is not None:
+        bars = bars.shift(1)
+    bars = bars.reindex(closes.index).assign(adj_close=closes)
+    table = compute_realized_vol_estimators(bars, window=window, ewma_lambda=config.strategy.ewma_lambda)
+    return table[estimator.value].rename(closes.name)
+
+
+def run_backtest(
+    config: AppConfig,
+    data: Optional[MarketData] = None,
+    engine: Optional[BacktestEngine] = None,
+    snapshots: Optional[pd.DataFrame] = None,
+) -> BacktestResult:
+    """Backtest ``config`` on ``data``, loading it from the configured source if omitted.
+
+    ``snapshots`` (``spy``/``vix``/``vix3m`` by date) replaces the provider's
+    signal inputs, so any time slice of a ``SnapshotSurface`` can be replayed.
+    """
 
-def run_backtest(config: AppConfig, data: Optional[MarketData] = None) -> BacktestResult:
     if data is None:
         source = get_data_source(config)
         data = source.load(config.backtest.start_date, config.backtest.end_date)
 
-    spy_adj = _ensure_series(data.spy, "adj_close")
-    dates = spy_adj.index
+    engine = BacktestEngine(engine or config.backtest.engine)
+    if engine is BacktestEngine.VECTORIZED:
+        from vol_edge.exec.vectorized import run_vectorized_backtest
+
+        return run_vectorized_backtest(config, data, snapshots=snapshots)
+
+    panel = data.aligned(config.data.missing_data)
+    dates = panel.dates
     if len(dates) < 15:
         raise ValueError("Not enough data for backtest")
+    spy_adj = panel.series("spy")
+    vix_prices = panel.column("vix")
+    vix3m_prices = panel.column("vix3m")
+    short_prices = panel.column("short_vol")
+    long_prices = panel.column("long_vol")
 
-    use_intraday_signals = config.data.provider == DataProvider.IBKR
-    intraday_snapshots = None
-    signal_series = spy_adj
-    if use_intraday_signals:
-        end_date = config.backtest.end_date or dates[-1].date()
-        intraday_snapshots = build_signal_snapshots(config, config.backtest.start_date, end_date)
-        if intraday_snapshots.empty:
-            raise ValueError("No intraday snapshots available")
-        signal_series = intraday_snapshots["spy"]
+    signal_series, intraday_snapshots = _signal_inputs(config, dates, spy_adj, snapshots)
+    use_intraday_signals = intraday_snapshots is not None
+    estimated_erv30 = None
+    if RealizedVolEstimator(config.strategy.erv30_estimator) is not RealizedVolEstimator.CLOSE_TO_CLOSE:
+        estimated_erv30 = _erv30_by_signal_date(config, panel, signal_series, intraday_snapshots)
 
     strategy = build_strategy(config.strategy)
     rebalance = RebalanceEngine(config.strategy.rebalance_threshold_pct)
     portfolio = PortfolioState(cash=config.backtest.initial_equity)
-    records: List[DailyRecord] = []
 
     long_symbol = config.instruments.long_vol.symbol
     short_symbol = config.instruments.short_vol.symbol
     role_to_symbol = {"long_vol": long_symbol, "short_vol": short_symbol}
-
-    equity_series = []
-    spy_equity = []
-    spy_base = spy_adj.iloc[0]
+    symbols = tuple(dict.fromkeys((short_symbol, long_symbol)))
+    column = {sym: j for j, sym in enumerate(symbols)}
 
     window = 10
+    # one row per simulated day, filled in place and trimmed to the days actually recorded
+    capacity = max(len(dates) - window, 0)
+    rows = np.empty(capacity, dtype=np.int64)
+    equity_out = np.empty(capacity)
+    vix_out = np.empty(capacity)
+    vix3m_out = np.empty(capacity)
+    erv30_out = np.empty(capacity)
+    evrp_out = np.empty(capacity)
+    term_out = np.empty(capacity, dtype=np.int8)
+    target_out = np.full((capacity, len(symbols)), np.nan)
+    actual_out = np.full((capacity, len(symbols)), np.nan)
+    spy_values = spy_adj.to_numpy(dtype=float)
+    n = 0
 
-    for idx in range(window, len(dates)):
-        current_date = dates[idx]
-        history = signal_series.loc[:current_date].tail(window + 1)
-        if len(history) < window + 1:
-            continue
-        erv30 = compute_erv30(history.tolist())
-        if use_intraday_signals:
-            if current_date not in intraday_snapshots.index:
-                continue
-            snap = intraday_snapshots.loc[current_date]
-            vix = float(snap["vix"])
-            vix3m = float(snap["vix3m"])
-        else:
-            vix = _price(data.vix, current_date)
-            vix3m = _price(data.vix3m, current_date)
-        evrp = compute_evrp(vix, erv30)
-        term_structure = compute_term_structure_state(vix, vix3m, config.strategy.term_structure_epsilon)
-
-        ctx = StrategyContext(vix=vix, vix3m=vix3m, erv30=erv30, evrp=evrp, term_structure=term_structure)
-        decision = strategy.target_weights(ctx)
-        target_weights = {role_to_symbol.get(role, role): weight for role, weight in decision.weights.items()}
-
-        prices = {
-            short_symbol: _price(data.short_vol, current_date),
-            long_symbol: _price(data.long_vol, current_date),
-        }
-        current_weights = portfolio.weights(prices)
-        orders = rebalance.generate_orders(portfolio, target_weights, prices)
-        if orders:
-            portfolio.apply_orders(orders, prices, cost_bps=config.strategy.trade_cost_bps)
-        equity = portfolio.equity(prices)
-        equity_series.append((current_date, equity))
-        spy_value = spy_adj.loc[current_date] / spy_base * config.backtest.initial_equity
-        spy_equity.append((current_date, spy_value))
-        records.append(
-            DailyRecord(
-                date=current_date,
-                equity=equity,
-                target_weights=target_weights,
-                actual_weights=portfolio.weights(prices),
-                vix=vix,
-                vix3m=vix3m,
-                erv30=erv30,
-                evrp=evrp,
-                term_structure=term_structure,
-            )
-        )
+    signal_stage = stage("signals.daily")
+    strategy_stage = stage("strategy.target_weights")
+    portfolio_stage = stage("portfolio.rebalance")
+
+    with stage("engine.loop", hot=True):
+        for idx in range(window, len(dates)):
+            current_date = dates[idx]
+            with signal_stage:
+                history = signal_series.loc[:current_date].tail(window + 1)
+                if len(history) < window + 1:
+                    continue
+                if estimated_erv30 is None:
+                    erv30 = compute_erv30(history.tolist())
+                else:
+                    erv30 = float(estimated_erv30.loc[history.index[-1]])
+                    if np.isnan(erv30):
+                        continue
+                if use_intraday_signals:
+                    if current_date not in intraday_snapshots.index:
+                        continue
+                    snap = intraday_snapshots.loc[current_date]
+                    vix = float(snap["vix"])
+                    vix3m = float(snap["vix3m"])
+                else:
+                    vix = float(vix_prices[idx])
+                    vix3m = float(vix3m_prices[idx])
+                evrp = compute_evrp(vix, erv30)
+                term_structure = compute_term_structure_state(vix, vix3m, config.strategy.term_structure_epsilon)
+
+            with strategy_stage:
+                ctx = StrategyContext(vix=vix, vix3m=vix3m, erv30=erv30, evrp=evrp, term_structure=term_structure)
+                decision = strategy.target_weights(ctx)
+            target_weights = {role_to_symbol.get(role, role): weight for role, weight in decision.weights.items()}
+
+            prices = {
+                short_symbol: float(short_prices[idx]),
+                long_symbol: float(long_prices[idx]),
+            }
+            with portfolio_stage:
+                orders = rebalance.generate_orders(portfolio, target_weights, prices)
+                if orders:
+                    portfolio.apply_orders(orders, prices, cost_bps=config.strategy.trade_cost_bps)
+                equity = portfolio.equity(prices)
+            rows[n] = idx
+            equity_out[n] = equity
+            vix_out[n] = vix
+            vix3m_out[n] = vix3m
+            erv30_out[n] = erv30
+            evrp_out[n] = evrp
+            term_out[n] = TERM_STATES.index(term_structure)
+            for sym, weight in target_weights.items():
+                target_out[n, column[sym]] = weight
+            for sym, weight in portfolio.weights(prices).items():
+                actual_out[n, column[sym]] = weight
+            n += 1
 
-    equity_curve = pd.Series({dt: val for dt, val in equity_series})
-    benchmark_curve = pd.Series({dt: val for dt, val in spy_equity})
-    return BacktestResult(equity_curve=equity_curve, benchmark_curve=benchmark_curve, records=records)
+    rows = rows[:n]
+    recorded = dates[rows]
+    equity_curve = pd.Series(equity_out[:n], index=recorded)
+    benchmark_curve = pd.Series(spy_values[rows] / spy_values[0] * config.backtest.initial_equity, index=recorded)
+    table = RecordTable(
+        dates=recorded,
+        symbols=symbols,
+        equity=equity_out[:n],
+        target_weights=target_out[:n],
+        actual_weights=actual_out[:n],
+        vix=vix_out[:n],
+        vix3m=vix3m_out[:n],
+        erv30=erv30_out[:n],
+        evrp=evrp_out[:n],
+        term_structure=term_out[:n],
+    )
+    return BacktestResult(equity_curve=equity_curve, benchmark_curve=benchmark_curve, table=table)
@@ -0,0 +1,286 @@
+"""Checkpointed, incremental backtests.
+
+A checkpoint directory holds ``state.json`` (final portfolio, trailing eRV30
+window, benchmark base and fingerprints) and ``curves.csv`` (the equity and
+benchmark curves, appended to on every resume). Resuming loads only the
+trailing window plus the new dates, so a daily update costs O(new days).
+The EWMA eRV30 estimator depends on the whole history rather than a trailing
+window, so checkpoints with it always rebuild in full.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from vol_edge.config import AppConfig, RealizedVolEstimator
+from vol_edge.data import MarketData, MarketPanel, get_data_source
+from vol_edge.portfolio import PortfolioState
+
+from .backtest import BacktestResult
+from .vectorized import _WINDOW, EngineInputs, build_result, prepare_inputs, simulate
+
+CHECKPOINT_VERSION = 1
+_STATE_FILE = "state.json"
+_CURVES_FILE = "curves.csv"
+
+
+class CheckpointMismatchError(ValueError):
+    """Raised when a checkpoint no longer matches the config or market data."""
+
+
+@dataclass
+class BacktestCheckpoint:
+    last_date: pd.Timestamp
+    portfolio: PortfolioState
+    signal_dates: List[pd.Timestamp]
+    signal_closes: List[float]
+    benchmark_base: float
+    first_equity: float
+    last_equity: float
+    config_fingerprint: str
+    data_fingerprint: str
+    version: int = CHECKPOINT_VERSION
+
+    def to_json(self) -> Dict:
+        return {
+            "version": self.version,
+            "last_date": self.last_date.isoformat(),
+            "cash": self.portfolio.cash,
+            "holdings": self.portfolio.holdings,
+            "signal_dates": [ts.isoformat() for ts in self.signal_dates],
+            "signal_closes": self.signal_closes,
+            "benchmark_base": self.benchmark_base,
+            "first_equity": self.first_equity,
+            "last_equity": self.last_equity,
+            "config_fingerprint": self.config_fingerprint,
+            "data_fingerprint": self.data_fingerprint,
+        }
+
+    @classmethod
+    def from_json(cls, payload: Dict) -> "BacktestCheckpoint":
+        if payload.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointMismatchError(f"Unsupported checkpoint version {payload.get('version')}")
+        return cls(
+            last_date=pd.Timestamp(payload["last_date"]),
+            portfolio=PortfolioState(cash=float(payload["cash"]), holdings=dict(payload["holdings"])),
+            signal_dates=[pd.Timestamp(ts) for ts in payload["signal_dates"]],
+            signal_closes=[float(v) for v in payload["signal_closes"]],
+            benchmark_base=float(payload["benchmark_base"]),
+            first_equity=float(payload["first_equity"]),
+            last_equity=float(payload["last_equity"]),
+            config_fingerprint=payload["config_fingerprint"],
+            data_fingerprint=payload["data_fingerprint"],
+        )
+
+
+@dataclass
+class IncrementalResult:
+    """Outcome of ``run_incremental_backtest``.
+
+    ``result`` covers only the dates processed by this call: every date on a
+    fresh run, only the new ones when ``resumed`` is true.
+    """
+
+    result: BacktestResult
+    checkpoint: BacktestCheckpoint
+    resumed: bool
+    previous_equity: Optional[float] = None
+
+
+def config_fingerprint(config: AppConfig) -> str:
+    """Hash of every setting that changes backtest output (``end_date`` may move)."""
+
+    payload = config.model_dump(
+        mode="json",
+        exclude={"backtest": {"end_date", "engine"}, "logging": True, "execution": True},
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _data_fingerprint(window: pd.Series, etn_prices: np.ndarray) -> str:
+    payload = {
+        "window": [[ts.isoformat(), round(float(v), 8)] for ts, v in window.items()],
+        "prices": [round(float(v), 8) for v in etn_prices],
+    }
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def _last_prices(panel: MarketPanel, ts: pd.Timestamp) -> np.ndarray:
+    row = panel.offset(ts)
+    return np.array([panel.column("short_vol")[row], panel.column("long_vol")[row]])
+
+
+def _slice_after(inputs: EngineInputs, ts: pd.Timestamp) -> EngineInputs:
+    mask = np.asarray(inputs.dates > ts)
+    return replace(
+        inputs,
+        dates=inputs.dates[mask],
+        vix=inputs.vix[mask],
+        vix3m=inputs.vix3m[mask],
+        erv30=inputs.erv30[mask],
+        evrp=inputs.evrp[mask],
+        prices=inputs.prices[mask],
+        benchmark=inputs.benchmark[mask],
+    )
+
+
+def load_checkpoint(path: Path) -> Optional[BacktestCheckpoint]:
+    state_file = Path(path) / _STATE_FILE
+    if not state_file.exists():
+        return None
+    return BacktestCheckpoint.from_json(json.loads(state_file.read_text()))
+
+
+def load_checkpoint_curves(path: Path) -> Tuple[pd.Series, pd.Series]:
+    """Full equity and benchmark curves accumulated in a checkpoint directory."""
+
+    frame = pd.read_csv(Path(path) / _CURVES_FILE, parse_dates=["date"])
+    frame = frame.drop_duplicates(subset="date", keep="last").set_index("date").sort_index()
+    return frame["equity"], frame["benchmark"]
+
+
+def _write_checkpoint(path: Path, checkpoint: BacktestCheckpoint, result: BacktestResult, append: bool) -> None:
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    curves = pd.DataFrame(
+        {
+            "date": result.equity_curve.index,
+            "equity": result.equity_curve.to_numpy(),
+            "benchmark": result.benchmark_curve.to_numpy(),
+        }
+    )
+    curves_file = path / _CURVES_FILE
+    if append and curves_file.exists():
+        curves.to_csv(curves_file, mode="a", header=False, index=False)
+    else:
+        curves.to_csv(curves_file, index=False)
+    # Curves first, state last: a crash in between leaves duplicate curve rows
+    # (dropped on read) rather than a state that points past the curves.
+    tmp = path / f"{_STATE_FILE}.tmp"
+    tmp.write_text(json.dumps(checkpoint.to_json(), indent=2))
+    tmp.replace(path / _STATE_FILE)
+
+
+def _make_checkpoint(
+    config: AppConfig,
+    inputs: EngineInputs,
+    result: BacktestResult,
+    portfolio: PortfolioState,
+    panel: MarketPanel,
+    benchmark_base: float,
+    first_equity: float,
+) -> BacktestCheckpoint:
+    last_date = pd.Timestamp(result.equity_curve.index[-1])
+    window = inputs.signal_closes.loc[:last_date].tail(_WINDOW)
+    return BacktestCheckpoint(
+        last_date=last_date,
+        portfolio=portfolio.copy(),
+        signal_dates=list(window.index),
+        signal_closes=[float(v) for v in window],
+        benchmark_base=benchmark_base,
+        first_equity=first_equity,
+        last_equity=float(result.equity_curve.iloc[-1]),
+        config_fingerprint=config_fingerprint(config),
+        data_fingerprint=_data_fingerprint(window, _last_prices(panel, last_date)),
+    )
+
+
+def _full_run(config: AppConfig, checkpoint_dir: Path, data: Optional[MarketData]) -> IncrementalResult:
+    if data is None:
+        data = get_data_source(config).load(config.backtest.start_date, config.backtest.end_date)
+    panel = data.aligned(config.data.missing_data)
+    inputs = prepare_inputs(config, panel)
+    path = simulate(inputs, config.strategy, config.backtest.initial_equity)
+    result = build_result(inputs, path)
+    benchmark_base = float(panel.column("spy")[0])
+    checkpoint = _make_checkpoint(
+        config,
+        inputs,
+        result,
+        path.final_portfolio,
+        panel,
+        benchmark_base,
+        float(result.equity_curve.iloc[0]),
+    )
+    _write_checkpoint(checkpoint_dir, checkpoint, result, append=False)
+    return IncrementalResult(result=result, checkpoint=checkpoint, resumed=False)
+
+
+def _resume(
+    config: AppConfig,
+    checkpoint_dir: Path,
+    checkpoint: BacktestCheckpoint,
+    data: Optional[MarketData],
+) -> IncrementalResult:
+    if RealizedVolEstimator(config.strategy.erv30_estimator) is RealizedVolEstimator.EWMA:
+        raise CheckpointMismatchError("EWMA eRV30 cannot be rebuilt from the checkpoint window")
+    window_start = checkpoint.signal_dates[0]
+    resume_config = config.model_copy(
+        update={"backtest": config.backtest.model_copy(update={"start_date": window_start.date()})}
+    )
+    if data is None:
+        data = get_data_source(resume_config).load(window_start.date(), config.backtest.end_date)
+    panel = data.aligned(config.data.missing_data).since(window_start)
+
+    inputs = prepare_inputs(resume_config, panel, benchmark_base=checkpoint.benchmark_base, min_dates=_WINDOW)
+    window = inputs.signal_closes.loc[: checkpoint.last_date].tail(_WINDOW)
+    try:
+        fingerprint = _data_fingerprint(window, _last_prices(panel, checkpoint.last_date))
+    except KeyError as exc:
+        raise CheckpointMismatchError(f"Checkpoint date {exc} missing from market data") from exc
+    if fingerprint != checkpoint.data_fingerprint:
+        raise CheckpointMismatchError("Market data changed inside the checkpoint window")
+
+    new_inputs = _slice_after(inputs, checkpoint.last_date)
+    if not len(new_inputs.dates):
+        empty = pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+        result = BacktestResult(equity_curve=empty, benchmark_curve=empty.copy(), records=[])
+        return IncrementalResult(
+            result=result, checkpoint=checkpoint, resumed=True, previous_equity=checkpoint.last_equity
+        )
+
+    path = simulate(new_inputs, config.strategy, config.backtest.initial_equity, portfolio=checkpoint.portfolio)
+    result = build_result(new_inputs, path)
+    updated = _make_checkpoint(
+        config,
+        inputs,
+        result,
+        path.final_portfolio,
+        panel,
+        checkpoint.benchmark_base,
+        checkpoint.first_equity,
+    )
+    _write_checkpoint(checkpoint_dir, updated, result, append=True)
+    return IncrementalResult(
+        result=result, checkpoint=updated, resumed=True, previous_equity=checkpoint.last_equity
+    )
+
+
+def run_incremental_backtest(
+    config: AppConfig,
+    checkpoint_dir: Path,
+    data: Optional[MarketData] = None,
+) -> IncrementalResult:
+    """Resume from ``checkpoint_dir`` when it matches ``config``; otherwise run in full.
+
+    A checkpoint whose config fingerprint, version or market-data window no
+    longer matches is discarded and rebuilt from ``backtest.start_date``.
+    """
+
+    try:
+        checkpoint = load_checkpoint(checkpoint_dir)
+    except CheckpointMismatchError:
+        checkpoint = None
+    if checkpoint is not None and checkpoint.config_fingerprint == config_fingerprint(config):
+        try:
+            return _resume(config, checkpoint_dir, checkpoint, data)
+        except CheckpointMismatchError:
+            pass
+    return _full_run(config, checkpoint_dir, data)
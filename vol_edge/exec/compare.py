@@ -0,0 +1,58 @@
+"""Single-pass comparison of several strategies (Table 3).
+
+Data is loaded and eRV30 / eVRP / VIX term-structure inputs are computed once;
+each strategy then runs its own portfolio and rebalance path over them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Dict, Optional, Sequence, Union
+
+import pandas as pd
+
+from vol_edge.config import AppConfig, StrategyName
+from vol_edge.data import MarketData, get_data_source
+from vol_edge.reports import compute_metrics
+
+from .backtest import BacktestResult
+from .vectorized import build_result, prepare_inputs, simulate
+
+BENCHMARK_LABEL = "spy"
+
+
+def run_strategy_comparison(
+    config: AppConfig,
+    strategies: Optional[Sequence[Union[StrategyName, str]]] = None,
+    data: Optional[MarketData] = None,
+) -> Dict[str, BacktestResult]:
+    """Backtest each strategy (default: all four Table 2 rule sets) on shared signals.
+
+    Every strategy inherits the remaining ``config.strategy`` knobs. Results are
+    keyed by strategy name, in the order requested.
+    """
+
+    names = [StrategyName(name) for name in (strategies or list(StrategyName))]
+    if data is None:
+        source = get_data_source(config)
+        data = source.load(config.backtest.start_date, config.backtest.end_date)
+    inputs = prepare_inputs(config, data)
+
+    results: Dict[str, BacktestResult] = {}
+    for name in names:
+        strategy_config = config.strategy.model_copy(update={"name": name, "table": None})
+        path = simulate(inputs, strategy_config, config.backtest.initial_equity)
+        results[name.value] = build_result(inputs, path)
+    return results
+
+
+def comparison_table(results: Dict[str, BacktestResult], include_benchmark: bool = True) -> pd.DataFrame:
+    """Table 3-style metrics, one row per strategy (plus SPY when requested)."""
+
+    rows = {name: asdict(compute_metrics(result.equity_curve)) for name, result in results.items()}
+    if include_benchmark and results:
+        benchmark = next(iter(results.values())).benchmark_curve
+        rows[BENCHMARK_LABEL] = asdict(compute_metrics(benchmark))
+    table = pd.DataFrame.from_dict(rows, orient="index")
+    table.index.name = "strategy"
+    return table
@@ -0,0 +1,132 @@
+"""Parameter sweeps over ``StrategyConfig`` knobs.
+
+Market data is loaded and aligned once, with one set of signal inputs per
+distinct eRV30 estimator setting in the grid; each grid point only re-runs the
+strategy/rebalance simulation. With ``workers > 1`` the grid is fanned out over
+a process pool whose workers receive the aligned inputs once, at start-up,
+instead of with every task.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from vol_edge.config import AppConfig, StrategyConfig
+from vol_edge.data import MarketData, get_data_source
+from vol_edge.reports import compute_metrics
+
+from .vectorized import EngineInputs, prepare_inputs, signal_key, simulate
+
+GridSpec = Mapping[str, Union[str, Sequence[Any]]]
+
+
+def parse_range(spec: str) -> List[float]:
+    """Expand an inclusive ``start:stop:step`` range, e.g. ``0:100:5`` -> 0, 5, ..., 100."""
+
+    parts = spec.split(":")
+    if len(parts) != 3:
+        raise ValueError(f"range must look like start:stop:step, got {spec!r}")
+    start, stop, step = (float(p) for p in parts)
+    if step <= 0:
+        raise ValueError("range step must be positive")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    if count <= 0:
+        raise ValueError(f"empty range {spec!r}")
+    return [round(start + i * step, 12) for i in range(count)]
+
+
+def _grid_values(values: Union[str, Sequence[Any]]) -> List[Any]:
+    if isinstance(values, str):
+        if values.count(":") == 2:
+            return parse_range(values)
+        return [v.strip() for v in values.split(",") if v.strip()]
+    if isinstance(values, Iterable):
+        return list(values)
+    return [values]
+
+
+def expand_grid(grid: GridSpec) -> List[Dict[str, Any]]:
+    """Cartesian product of the grid, one ``{param: value}`` dict per point."""
+
+    fields = set(StrategyConfig.model_fields)
+    unknown = sorted(set(grid) - fields)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters in grid: {', '.join(unknown)}")
+    names = list(grid)
+    values = [_grid_values(grid[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def load_grid(path: Path) -> Dict[str, Any]:
+    payload = yaml.safe_load(Path(path).read_text()) or {}
+    if not isinstance(payload, dict):
+        raise ValueError("grid file must map parameter names to value lists")
+    return payload
+
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(inputs: Dict[tuple, EngineInputs], initial_equity: float) -> None:
+    _WORKER_STATE["inputs"] = inputs
+    _WORKER_STATE["initial_equity"] = initial_equity
+
+
+def _evaluate(strategy_config: StrategyConfig) -> Dict[str, float]:
+    inputs: EngineInputs = _WORKER_STATE["inputs"][signal_key(strategy_config)]
+    path = simulate(inputs, strategy_config, _WORKER_STATE["initial_equity"])
+    metrics = compute_metrics(pd.Series(path.equity, index=inputs.dates))
+    return {"final_equity": float(path.equity[-1]), **asdict(metrics)}
+
+
+def run_sweep(
+    config: AppConfig,
+    grid: GridSpec,
+    data: Optional[MarketData] = None,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Backtest every grid point and return one row of metrics per point.
+
+    ``workers=None`` uses every CPU; ``workers=1`` runs in-process.
+    """
+
+    points = expand_grid(grid)
+    base = config.strategy.model_dump()
+    strategy_configs = [StrategyConfig.model_validate({**base, **point}) for point in points]
+
+    if data is None:
+        source = get_data_source(config)
+        data = source.load(config.backtest.start_date, config.backtest.end_date)
+    inputs: Dict[tuple, EngineInputs] = {}
+    for cfg in strategy_configs:
+        key = signal_key(cfg)
+        if key not in inputs:
+            inputs[key] = prepare_inputs(config.model_copy(update={"strategy": cfg}), data)
+    initial_equity = config.backtest.initial_equity
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(strategy_configs)) or 1
+    if workers == 1:
+        _init_worker(inputs, initial_equity)
+        rows = [_evaluate(cfg) for cfg in strategy_configs]
+    else:
+        chunksize = max(1, len(strategy_configs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(inputs, initial_equity)
+        ) as pool:
+            rows = list(pool.map(_evaluate, strategy_configs, chunksize=chunksize))
+
+    params = pd.DataFrame(
+        [cfg.model_dump(mode="json", include=set(point)) for cfg, point in zip(strategy_configs, points)],
+        columns=list(grid),
+    )
+    return pd.concat([params, pd.DataFrame(rows)], axis=1)
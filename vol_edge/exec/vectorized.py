@@ -0,0 +1,265 @@
+"""Array-based backtest engine.
+
+Produces the same results as the day-by-day loop in :mod:`vol_edge.exec.backtest`
+but aligns every input into NumPy arrays up front, computes signals and target
+weights for the whole history in one pass, and keeps only the path-dependent
+rebalance band in a tight loop over plain floats.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from vol_edge.config import AppConfig, RealizedVolEstimator, StrategyConfig
+from vol_edge.data import MarketData, MarketPanel
+from vol_edge.portfolio import PortfolioState
+from vol_edge.profiling import stage
+from vol_edge.signals import compute_evrp_array, compute_term_structure_codes
+from vol_edge.strategies import ROLES, build_strategy
+
+from .backtest import BacktestResult, RecordTable, _erv30_by_signal_date, _signal_inputs
+
+_WINDOW = 10
+_ROLE_COLUMNS = {"short_vol": 0, "long_vol": 1}
+
+
+def _as_panel(config: AppConfig, data: Union[MarketData, MarketPanel]) -> MarketPanel:
+    if isinstance(data, MarketPanel):
+        return data
+    return data.aligned(config.data.missing_data)
+
+
+def _rebalance_path(
+    target: np.ndarray,
+    prices: np.ndarray,
+    symbols: Sequence[str],
+    portfolio: PortfolioState,
+    threshold: float,
+    cost_bps: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, PortfolioState]:
+    """Walk the ±threshold band rebalance over ``dates × symbols`` arrays.
+
+    Mirrors ``RebalanceEngine.generate_orders`` + ``PortfolioState.apply_orders``:
+    orders are sized off the pre-trade equity and fees are charged on traded
+    notional. Returns the equity path, post-trade weights, a mask of which
+    symbols are in the holdings (the keys ``PortfolioState.holdings`` would
+    carry) and the final portfolio.
+    """
+
+    n, k = prices.shape
+    cost = cost_bps / 10000.0
+    equity_out = np.empty(n)
+    weights_out = np.zeros((n, k))
+    held_out = np.zeros((n, k), dtype=bool)
+
+    unknown = set(portfolio.holdings) - set(symbols)
+    if unknown:
+        raise ValueError(f"Portfolio holds symbols outside the engine universe: {sorted(unknown)}")
+    column = {sym: j for j, sym in enumerate(symbols)}
+    cash = float(portfolio.cash)
+    shares = [float(portfolio.holdings.get(sym, 0.0)) for sym in symbols]
+    held: List[int] = [column[sym] for sym in portfolio.holdings]
+    target_rows = target.tolist()
+    price_rows = prices.tolist()
+    for i in range(n):
+        px = price_rows[i]
+        tw = target_rows[i]
+        equity = cash
+        for j in held:
+            equity += shares[j] * px[j]
+        if equity > 0:
+            orders = []
+            for j in range(k):
+                current = shares[j] * px[j] / equity if j in held else 0.0
+                if abs(tw[j] - current) <= threshold:
+                    continue
+                delta = tw[j] * equity / px[j] - shares[j]
+                if abs(delta) > 1e-9:
+                    orders.append((j, delta))
+            for j, delta in orders:
+                value = delta * px[j]
+                cash -= value + abs(value) * cost
+                shares[j] += delta
+                if j not in held:
+                    held.append(j)
+            equity = cash
+            for j in held:
+                equity += shares[j] * px[j]
+        equity_out[i] = equity
+        for j in held:
+            held_out[i, j] = True
+            weights_out[i, j] = shares[j] * px[j] / equity if equity != 0 else 0.0
+    final = PortfolioState(cash=cash, holdings={symbols[j]: shares[j] for j in held})
+    return equity_out, weights_out, held_out, final
+
+
+@dataclass
+class EngineInputs:
+    """Signal and price arrays aligned to the dates the engine trades on.
+
+    Of the ``StrategyConfig`` knobs only the eRV30 estimator settings
+    (:func:`signal_key`) shape these arrays, so one instance can be shared by
+    every simulation that agrees on them (sweeps, strategy comparisons).
+    """
+
+    dates: pd.DatetimeIndex
+    symbols: Tuple[str, str]  # (short_vol, long_vol)
+    vix: np.ndarray
+    vix3m: np.ndarray
+    erv30: np.ndarray
+    evrp: np.ndarray
+    prices: np.ndarray  # dates x symbols
+    benchmark: np.ndarray  # SPY rebased to initial equity
+    signal_closes: pd.Series  # closes feeding eRV30 (daily SPY or intraday snapshots)
+
+
+def signal_key(strategy_config: StrategyConfig) -> tuple:
+    """The part of ``strategy_config`` that ``prepare_inputs`` depends on."""
+
+    estimator = RealizedVolEstimator(strategy_config.erv30_estimator)
+    return (estimator, strategy_config.ewma_lambda if estimator is RealizedVolEstimator.EWMA else None)
+
+
+@dataclass
+class EnginePath:
+    """Arrays produced by one simulation over ``EngineInputs``."""
+
+    equity: np.ndarray
+    target_weights: np.ndarray  # dates x symbols
+    actual_weights: np.ndarray  # dates x symbols
+    held: np.ndarray  # dates x symbols, symbol present in portfolio holdings
+    target_set: np.ndarray  # dates x symbols, symbol present in the strategy decision
+    term_structure: np.ndarray  # int8 codes, 0 = contango, 1 = backwardation
+    final_portfolio: PortfolioState
+
+
+def prepare_inputs(
+    config: AppConfig,
+    data: Union[MarketData, MarketPanel],
+    benchmark_base: Optional[float] = None,
+    min_dates: int = 15,
+    snapshots: Optional[pd.DataFrame] = None,
+) -> EngineInputs:
+    """Align signals and prices; ``benchmark_base`` defaults to the first SPY close.
+
+    ``snapshots`` overrides the provider's signal snapshots (see ``run_backtest``).
+    """
+
+    panel = _as_panel(config, data)
+    dates = panel.dates
+    if len(dates) < min_dates:
+        raise ValueError("Not enough data for backtest")
+    spy_adj = panel.series("spy")
+
+    signal_series, intraday_snapshots = _signal_inputs(config, dates, spy_adj, snapshots)
+    with stage("signals.erv30"):
+        erv_by_signal_date = _erv30_by_signal_date(config, panel, signal_series, intraday_snapshots, window=_WINDOW)
+    candidates = dates[_WINDOW:]
+    erv_all = erv_by_signal_date.reindex(candidates).to_numpy()
+    active = candidates[~np.isnan(erv_all)]
+    erv30 = erv_by_signal_date.reindex(active).to_numpy()
+
+    rows = dates.get_indexer(active)
+    if intraday_snapshots is not None:
+        vix = intraday_snapshots["vix"].reindex(active).to_numpy(dtype=float)
+        vix3m = intraday_snapshots["vix3m"].reindex(active).to_numpy(dtype=float)
+    else:
+        vix = panel.column("vix")[rows]
+        vix3m = panel.column("vix3m")[rows]
+
+    prices = np.column_stack([panel.column("short_vol")[rows], panel.column("long_vol")[rows]])
+    spy_values = panel.column("spy")[rows]
+    return EngineInputs(
+        dates=active,
+        symbols=(config.instruments.short_vol.symbol, config.instruments.long_vol.symbol),
+        vix=vix,
+        vix3m=vix3m,
+        erv30=erv30,
+        evrp=compute_evrp_array(vix, erv30),
+        prices=prices,
+        benchmark=spy_values / float(benchmark_base or spy_adj.iloc[0]) * config.backtest.initial_equity,
+        signal_closes=signal_series.astype(float),
+    )
+
+
+def simulate(
+    inputs: EngineInputs,
+    strategy_config: StrategyConfig,
+    initial_equity: float,
+    portfolio: Optional[PortfolioState] = None,
+) -> EnginePath:
+    """Run one strategy over ``inputs``, starting flat or from ``portfolio``."""
+
+    with stage("engine.simulate", hot=True):
+        return _simulate(inputs, strategy_config, initial_equity, portfolio)
+
+
+def _simulate(
+    inputs: EngineInputs,
+    strategy_config: StrategyConfig,
+    initial_equity: float,
+    portfolio: Optional[PortfolioState],
+) -> EnginePath:
+    n = len(inputs.dates)
+    codes = compute_term_structure_codes(inputs.vix, inputs.vix3m, strategy_config.term_structure_epsilon)
+
+    strategy = build_strategy(strategy_config)
+    symbols = inputs.symbols
+    with stage("strategy.target_weights", calls=n):
+        decisions = strategy.target_weights_batch(inputs.vix, inputs.vix3m, inputs.erv30, inputs.evrp, codes)
+    columns = [_ROLE_COLUMNS[role] for role in ROLES]
+    target_set = np.zeros((n, len(symbols)), dtype=bool)
+    target_set[:, columns] = ~np.isnan(decisions)
+    target = np.zeros((n, len(symbols)))
+    target[:, columns] = np.where(target_set[:, columns], decisions, 0.0)
+
+    with stage("portfolio.rebalance", calls=n):
+        equity, weights, held, final_portfolio = _rebalance_path(
+            target,
+            inputs.prices,
+            symbols,
+            portfolio if portfolio is not None else PortfolioState(cash=initial_equity),
+            strategy_config.rebalance_threshold_pct,
+            strategy_config.trade_cost_bps,
+        )
+    return EnginePath(
+        equity=equity,
+        target_weights=target,
+        actual_weights=weights,
+        held=held,
+        target_set=target_set,
+        term_structure=codes,
+        final_portfolio=final_portfolio,
+    )
+
+
+def build_result(inputs: EngineInputs, path: EnginePath) -> BacktestResult:
+    table = RecordTable(
+        dates=inputs.dates,
+        symbols=tuple(inputs.symbols),
+        equity=path.equity,
+        target_weights=np.where(path.target_set, path.target_weights, np.nan),
+        actual_weights=np.where(path.held, path.actual_weights, np.nan),
+        vix=inputs.vix,
+        vix3m=inputs.vix3m,
+        erv30=inputs.erv30,
+        evrp=inputs.evrp,
+        term_structure=path.term_structure,
+    )
+    return BacktestResult(
+        equity_curve=pd.Series(path.equity, index=inputs.dates),
+        benchmark_curve=pd.Series(inputs.benchmark, index=inputs.dates),
+        table=table,
+    )
+
+
+def run_vectorized_backtest(
+    config: AppConfig, data: MarketData, snapshots: Optional[pd.DataFrame] = None
+) -> BacktestResult:
+    inputs = prepare_inputs(config, data, snapshots=snapshots)
+    path = simulate(inputs, config.strategy, config.backtest.initial_equity)
+    return build_result(inputs, path)
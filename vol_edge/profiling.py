@@ -0,0 +1,187 @@
+"""Lightweight per-stage profiling.
+
+Code marks its stages with ``with stage("signals.erv30"):``. Outside an active
+:class:`Profiler` that returns a shared no-op context manager, so instrumented
+hot loops cost one function call per stage when profiling is off::
+
+    with Profiler() as profiler:
+        run_backtest(config)
+    print(profiler.format_table())
+
+Stage objects hold no timing state, so hot loops can build them once and reuse
+them every iteration. Wall time is inclusive of nested stages; peak memory is
+the largest tracemalloc footprint above the stage's starting point.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+import pandas as pd
+
+F = TypeVar("F", bound=Callable)
+
+_ACTIVE: Optional["Profiler"] = None
+
+
+@dataclass
+class StageStats:
+    name: str
+    calls: int = 0
+    wall_s: float = 0.0
+    peak_bytes: int = 0
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "calls", "hot")
+
+    def __init__(self, profiler: "Profiler", name: str, calls: int, hot: bool):
+        self.profiler = profiler
+        self.name = name
+        self.calls = calls
+        self.hot = hot
+
+    def __enter__(self) -> "_Stage":
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.profiler._exit(self)
+        return False
+
+
+class Profiler:
+    """Collects :class:`StageStats` for every stage entered while it is active.
+
+    ``memory`` turns on tracemalloc peak tracking (slows allocation-heavy code);
+    ``cprofile`` runs :mod:`cProfile` inside stages marked ``hot`` so the inner
+    loop can be inspected with pstats via :meth:`dump_stats`.
+    """
+
+    def __init__(self, memory: bool = True, cprofile: bool = False):
+        self.memory = memory
+        self.stats: Dict[str, StageStats] = {}
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self._stack: List[list] = []  # [stage, start_bytes, peak_bytes, start_time]
+        self._hot_depth = 0
+        self._owns_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise RuntimeError("A profiler is already active")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        global _ACTIVE
+        _ACTIVE = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        return False
+
+    def _enter(self, stage: _Stage) -> None:
+        if stage.name not in self.stats:
+            self.stats[stage.name] = StageStats(stage.name)
+        current = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][2] = max(self._stack[-1][2], peak)
+            tracemalloc.reset_peak()
+        if stage.hot and self.cprofile is not None:
+            if self._hot_depth == 0:
+                self.cprofile.enable()
+            self._hot_depth += 1
+        self._stack.append([stage, current, current, time.perf_counter()])
+
+    def _exit(self, stage: _Stage) -> None:
+        ended = time.perf_counter()
+        _, start_bytes, peak_bytes, started = self._stack.pop()
+        if stage.hot and self.cprofile is not None:
+            self._hot_depth -= 1
+            if self._hot_depth == 0:
+                self.cprofile.disable()
+        if self.memory:
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1][2] = max(self._stack[-1][2], peak_bytes)
+            tracemalloc.reset_peak()
+        stats = self.stats[stage.name]
+        stats.calls += stage.calls
+        stats.wall_s += ended - started
+        stats.peak_bytes = max(stats.peak_bytes, peak_bytes - start_bytes)
+
+    def to_dict(self) -> List[Dict]:
+        return [asdict(stats) for stats in self.stats.values()]
+
+    def table(self) -> pd.DataFrame:
+        """One row per stage in first-entered order."""
+
+        frame = pd.DataFrame(self.to_dict(), columns=["name", "calls", "wall_s", "peak_bytes"])
+        frame["mean_ms"] = frame["wall_s"] / frame["calls"].clip(lower=1) * 1000.0
+        frame["peak_mb"] = frame["peak_bytes"] / 2**20
+        return frame[["name", "calls", "wall_s", "mean_ms", "peak_mb"]].rename(columns={"name": "stage"})
+
+    def format_table(self) -> str:
+        if not self.stats:
+            return "No profiled stages"
+        return self.table().to_string(index=False, float_format=lambda v: f"{v:.4f}")
+
+    def dump_stats(self, path: Path) -> None:
+        if self.cprofile is None:
+            raise RuntimeError("Profiler was created without cprofile=True")
+        self.cprofile.dump_stats(str(path))
+
+
+def active() -> Optional[Profiler]:
+    return _ACTIVE
+
+
+def stage(name: str, calls: int = 1, hot: bool = False):
+    """Context manager timing ``name``; ``calls`` counts batched work as several calls."""
+
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name, calls, hot)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator form of :func:`stage` for whole functions."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE
+            if profiler is None:
+                return fn(*args, **kwargs)
+            with _Stage(profiler, name, 1, False):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
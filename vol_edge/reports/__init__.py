@@ -2,5 +2,6 @@
 
 from .metrics import PerformanceMetrics, compute_metrics
 from .daily import build_daily_report
+from .blend import BlendRebalance, run_blend
 
-__all__ = ["PerformanceMetrics", "compute_metrics", "build_daily_report"]
+__all__ = ["PerformanceMetrics", "compute_metrics", "build_daily_report", "BlendRebalance", "run_blend"]
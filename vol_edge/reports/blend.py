@@ -0,0 +1,107 @@
+"""Strategy/SPY blending analysis (Figure 5).
+
+Every blend weight is one column of a returns matrix, so metrics for the whole
+0 → 100 % sweep come out of a handful of array reductions.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from vol_edge.exec.backtest import BacktestResult
+
+
+class BlendRebalance(str, Enum):
+    DAILY = "daily"
+    DRIFT = "drift"
+
+
+def _aligned_returns(result: BacktestResult) -> tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    frame = pd.concat([result.equity_curve, result.benchmark_curve], axis=1, join="inner").dropna().sort_index()
+    values = frame.to_numpy(dtype=float)
+    returns = values[1:] / values[:-1] - 1.0
+    return pd.DatetimeIndex(frame.index), returns[:, 0], returns[:, 1]
+
+
+def daily_blend_returns(strategy: np.ndarray, spy: np.ndarray, spy_weights: np.ndarray) -> np.ndarray:
+    """Returns matrix (days x weights) for blends rebalanced back to target every day."""
+
+    spy_weights = np.asarray(spy_weights, dtype=float)
+    return np.outer(strategy, 1.0 - spy_weights) + np.outer(spy, spy_weights)
+
+
+def drift_blend_returns(
+    strategy: np.ndarray,
+    spy: np.ndarray,
+    spy_weights: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """Returns matrix for blends that drift and rebalance once SPY's share leaves ±threshold.
+
+    The time loop is unavoidable (the path is stateful) but each step updates all
+    weight columns at once.
+    """
+
+    spy_weights = np.asarray(spy_weights, dtype=float)
+    sleeve_strategy = 1.0 - spy_weights
+    sleeve_spy = spy_weights.copy()
+    out = np.empty((len(strategy), len(spy_weights)))
+    for t in range(len(strategy)):
+        prev_total = sleeve_strategy + sleeve_spy
+        sleeve_strategy = sleeve_strategy * (1.0 + strategy[t])
+        sleeve_spy = sleeve_spy * (1.0 + spy[t])
+        total = sleeve_strategy + sleeve_spy
+        out[t] = total / prev_total - 1.0
+        breach = np.abs(sleeve_spy / total - spy_weights) > threshold
+        if breach.any():
+            sleeve_strategy = np.where(breach, total * (1.0 - spy_weights), sleeve_strategy)
+            sleeve_spy = np.where(breach, total * spy_weights, sleeve_spy)
+    return out
+
+
+def matrix_metrics(returns: np.ndarray, dates: pd.DatetimeIndex, columns: Sequence) -> pd.DataFrame:
+    """CAGR, volatility, Sharpe and max drawdown for every column of a returns matrix.
+
+    ``dates`` holds the equity dates (one more than ``returns`` rows); definitions
+    match :func:`vol_edge.reports.compute_metrics`.
+    """
+
+    returns = np.asarray(returns, dtype=float)
+    equity = np.vstack([np.ones((1, returns.shape[1])), np.cumprod(1.0 + returns, axis=0)])
+    years = (dates[-1] - dates[0]).days / 365.25
+    cagr = equity[-1] ** (1.0 / years) - 1.0 if years > 0 else np.zeros(returns.shape[1])
+    if len(returns):
+        vol = returns.std(axis=0, ddof=0) * np.sqrt(252)
+        mean = returns.mean(axis=0) * 252
+    else:
+        vol = mean = np.zeros(returns.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, mean / vol, 0.0)
+    max_drawdown = (equity / np.maximum.accumulate(equity, axis=0) - 1.0).min(axis=0)
+    return pd.DataFrame(
+        {"cagr": cagr, "volatility": vol, "sharpe": sharpe, "max_drawdown": max_drawdown},
+        index=pd.Index(columns, name="spy_weight"),
+    )
+
+
+def run_blend(
+    result: BacktestResult,
+    spy_weights: Sequence[float],
+    rebalance: BlendRebalance = BlendRebalance.DAILY,
+    threshold: float = 0.05,
+) -> pd.DataFrame:
+    """Blend the strategy with SPY at each weight (fractions, 0 = pure strategy)."""
+
+    dates, strategy, spy = _aligned_returns(result)
+    if len(dates) < 2:
+        raise ValueError("Need at least two overlapping equity points to blend")
+    weights = np.asarray(spy_weights, dtype=float)
+    if BlendRebalance(rebalance) is BlendRebalance.DRIFT:
+        returns = drift_blend_returns(strategy, spy, weights, threshold)
+    else:
+        returns = daily_blend_returns(strategy, spy, weights)
+    return matrix_metrics(returns, dates, weights).reset_index()
@@ -2,48 +2,86 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from vol_edge.config import AppConfig
-from vol_edge.exec.backtest import BacktestResult, DailyRecord
+from vol_edge.exec.backtest import BacktestResult, RecordTable
+from vol_edge.profiling import profiled
 
 
-def _regime_from_weights(record: DailyRecord, config: AppConfig) -> str:
-    weights = record.actual_weights or {}
-    long_w = weights.get(config.instruments.long_vol.symbol, 0.0)
-    short_w = weights.get(config.instruments.short_vol.symbol, 0.0)
-    if abs(long_w) < 1e-6 and abs(short_w) < 1e-6:
-        return "cash"
-    if abs(long_w) >= abs(short_w):
-        return f"long_vol {long_w:.2%}"
-    return f"short_vol {short_w:.2%}"
+def _percent(values: np.ndarray) -> pd.Series:
+    return pd.Series(values).map("{:.2%}".format)
 
 
-def build_daily_report(result: BacktestResult, config: AppConfig) -> pd.DataFrame:
-    """Return a DataFrame with Date, Regime, Position, PnL, Cumulative PnL."""
+def _regimes(table: RecordTable, config: AppConfig) -> np.ndarray:
+    def column(symbol: str) -> np.ndarray:
+        if symbol not in table.symbols:
+            return np.zeros(len(table))
+        return np.nan_to_num(table.actual_weights[:, table.symbols.index(symbol)])
+
+    long_w = column(config.instruments.long_vol.symbol)
+    short_w = column(config.instruments.short_vol.symbol)
+    cash = (np.abs(long_w) < 1e-6) & (np.abs(short_w) < 1e-6)
+    long_side = np.abs(long_w) >= np.abs(short_w)
+    labels = np.where(long_side, "long_vol " + _percent(long_w), "short_vol " + _percent(short_w))
+    return np.where(cash, "cash", labels)
+
+
+def _positions(table: RecordTable) -> pd.Series:
+    """``"SYM w%, ..."`` per day, listing symbols in the order the portfolio first held them."""
+
+    held_any = ~np.isnan(table.actual_weights)
+    first_held = np.where(held_any.any(axis=0), held_any.argmax(axis=0), len(table))
+    position = pd.Series([""] * len(table), dtype=object)
+    for j in np.argsort(first_held, kind="stable"):
+        symbol = table.symbols[j]
+        weights = table.actual_weights[:, j]
+        held = ~np.isnan(weights)
+        part = pd.Series(np.where(held, symbol + " " + _percent(np.nan_to_num(weights)), ""), dtype=object)
+        separator = np.where((position != "") & held, ", ", "")
+        position = position + separator + part
+    return position.where(position != "", "n/a")
+
+
+_COLUMNS = ["date", "strategy", "regime", "position", "pnl", "cumulative_pnl"]
+
+
+@profiled("reports.daily")
+def build_daily_report(
+    result: BacktestResult,
+    config: AppConfig,
+    previous_equity: Optional[float] = None,
+    base_equity: Optional[float] = None,
+) -> pd.DataFrame:
+    """Return a DataFrame with Date, Regime, Position, PnL, Cumulative PnL.
+
+    For a result that continues an earlier run (see ``run_incremental_backtest``)
+    pass the equity of the day before its first date as ``previous_equity`` and
+    the equity of the very first reported day as ``base_equity`` so PnL columns
+    line up with the rows already written.
+    """
 
     equity = result.equity_curve.sort_index()
-    daily_pnl = equity.diff().fillna(0.0)
-    cumulative_pnl = equity - equity.iloc[0]
-
-    rows: List[dict] = []
-    for rec in result.records:
-        dt = pd.Timestamp(rec.date)
-        regime = _regime_from_weights(rec, config)
-        position_desc = ", ".join(
-            f"{symbol} {weight:.2%}" for symbol, weight in rec.actual_weights.items()
-        )
-        rows.append(
-            {
-                "date": dt.date().isoformat(),
-                "strategy": config.strategy.name,
-                "regime": regime,
-                "position": position_desc or "n/a",
-                "pnl": float(daily_pnl.get(dt, 0.0)),
-                "cumulative_pnl": float(cumulative_pnl.get(dt, 0.0)),
-            }
-        )
-
-    return pd.DataFrame(rows)
+    if equity.empty:
+        return pd.DataFrame(columns=_COLUMNS)
+    prior = equity.shift(1)
+    if previous_equity is not None:
+        prior.iloc[0] = previous_equity
+    daily_pnl = (equity - prior).fillna(0.0)
+    cumulative_pnl = equity - (equity.iloc[0] if base_equity is None else base_equity)
+
+    table = result.table
+    return pd.DataFrame(
+        {
+            "date": table.dates.strftime("%Y-%m-%d"),
+            "strategy": [config.strategy.name] * len(table),
+            "regime": _regimes(table, config),
+            "position": _positions(table).to_numpy(),
+            "pnl": daily_pnl.reindex(table.dates).fillna(0.0).to_numpy(),
+            "cumulative_pnl": cumulative_pnl.reindex(table.dates).fillna(0.0).to_numpy(),
+        },
+        columns=_COLUMNS,
+    )
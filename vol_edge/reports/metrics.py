@@ -8,6 +8,8 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from vol_edge.profiling import profiled
+
 
 @dataclass
 class PerformanceMetrics:
@@ -64,6 +66,7 @@ def _adjusted_mdd(equity: pd.Series, window: int = 20) -> float:
     return float(drawdowns.min()) if not drawdowns.empty else 0.0
 
 
+@profiled("reports.metrics")
 def compute_metrics(equity: pd.Series) -> PerformanceMetrics:
     equity = equity.dropna()
     returns = _daily_returns(equity)
@@ -1,11 +1,33 @@
 """Signal calculations for Vol Edge."""
 
-from .realized_vol import compute_erv30
-from .term_structure import TermStructureState, compute_term_structure_state, compute_evrp
+from .estimators import ESTIMATORS, compute_realized_vol_estimators
+from .realized_vol import compute_erv30, compute_erv30_series
+from .streaming import RollingRealizedVol, SignalState, StreamingSignals
+from .term_structure import (
+    BACKWARDATION_CODE,
+    CONTANGO_CODE,
+    TERM_STATES,
+    TermStructureState,
+    compute_evrp,
+    compute_evrp_array,
+    compute_term_structure_codes,
+    compute_term_structure_state,
+)
 
 __all__ = [
     "compute_erv30",
+    "compute_erv30_series",
     "compute_evrp",
+    "compute_realized_vol_estimators",
+    "ESTIMATORS",
     "compute_term_structure_state",
+    "compute_term_structure_codes",
+    "compute_evrp_array",
+    "TERM_STATES",
+    "CONTANGO_CODE",
+    "BACKWARDATION_CODE",
     "TermStructureState",
+    "RollingRealizedVol",
+    "SignalState",
+    "StreamingSignals",
 ]
@@ -0,0 +1,94 @@
+"""Realized-volatility estimators over daily OHLC bars, computed together.
+
+Every estimator is annualized like ``compute_erv30`` (``sqrt(trading_days)``,
+in vol points) and aligned the same way: entry ``i`` covers the ``window``
+bars ending at ``i``, and the first ``window`` entries are NaN.
+
+- ``close_to_close``: population std of close-to-close returns, identical to
+  ``compute_erv30_series``.
+- ``parkinson``: mean of ``ln(H/L)^2 / (4 ln 2)``.
+- ``garman_klass``: mean of ``0.5 ln(H/L)^2 - (2 ln 2 - 1) ln(C/O)^2``.
+- ``ewma``: RiskMetrics ``s2_t = lam * s2_{t-1} + (1 - lam) * r_t^2``, seeded
+  with the mean squared return of the first window.
+
+The log ranges and returns are computed once, and each window mean is a
+difference of cumulative sums, so all four cost about as much as one.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .realized_vol import compute_erv30_series
+
+ESTIMATORS = ("close_to_close", "parkinson", "garman_klass", "ewma")
+
+_LOG2 = math.log(2.0)
+
+
+def _window_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing ``window`` mean; NaN until a full window, and for windows holding a NaN."""
+
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        missing = np.isnan(values)
+        csum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+        gaps = np.concatenate(([0], np.cumsum(missing)))
+        means = (csum[window:] - csum[:-window]) / window
+        out[window - 1 :] = np.where(gaps[window:] - gaps[:-window] > 0, np.nan, means)
+    return out
+
+
+def _ewma_variance(returns: np.ndarray, window: int, lam: float) -> np.ndarray:
+    """EWMA variance on close indices; entry ``window`` is the seed window."""
+
+    out = np.full(len(returns) + 1, np.nan)
+    if len(returns) >= window:
+        squared = returns * returns
+        seeded = np.concatenate(([squared[:window].mean()], squared[window:]))
+        out[window:] = pd.Series(seeded).ewm(alpha=1.0 - lam, adjust=False).mean().to_numpy()
+    return out
+
+
+def compute_realized_vol_estimators(
+    bars: pd.DataFrame,
+    window: int = 10,
+    trading_days: int = 252,
+    ewma_lambda: float = 0.94,
+) -> pd.DataFrame:
+    """All :data:`ESTIMATORS` for every bar of ``bars`` in one pass.
+
+    ``bars`` needs ``open``, ``high``, ``low`` and ``close``; returns use
+    ``adj_close`` when present so dividends do not show up as volatility,
+    while the intraday ranges use the raw prints. Returns one column per
+    estimator on ``bars.index``.
+    """
+
+    open_ = bars["open"].to_numpy(dtype=float)
+    high = bars["high"].to_numpy(dtype=float)
+    low = bars["low"].to_numpy(dtype=float)
+    close = bars["close"].to_numpy(dtype=float)
+    adj = bars["adj_close"].to_numpy(dtype=float) if "adj_close" in bars.columns else close
+    scale = math.sqrt(trading_days) * 100
+
+    log_hl2 = np.log(high / low) ** 2
+    log_co2 = np.log(close / open_) ** 2
+    parkinson = _window_mean(log_hl2 / (4.0 * _LOG2), window)
+    garman_klass = _window_mean(0.5 * log_hl2 - (2.0 * _LOG2 - 1.0) * log_co2, window)
+    returns = adj[1:] / adj[:-1] - 1.0 if len(adj) > 1 else np.empty(0)
+    ewma = _ewma_variance(returns, window, ewma_lambda)
+
+    out = {
+        "close_to_close": compute_erv30_series(adj, window=window, trading_days=trading_days),
+        "parkinson": np.sqrt(np.maximum(parkinson, 0.0)) * scale,
+        # GK can dip below zero on days with a wide open-close move inside a narrow range
+        "garman_klass": np.sqrt(np.maximum(garman_klass, 0.0)) * scale,
+        "ewma": np.sqrt(ewma) * scale,
+    }
+    for name in ("parkinson", "garman_klass"):
+        out[name][:window] = np.nan
+    return pd.DataFrame(out, index=bars.index, columns=list(ESTIMATORS))
+
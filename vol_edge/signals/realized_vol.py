@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable
+from typing import Iterable, Union
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def compute_erv30(adj_closes: Iterable[float], window: int = 10, trading_days: int = 252) -> float:
@@ -20,3 +22,31 @@ def compute_erv30(adj_closes: Iterable[float], window: int = 10, trading_days: i
         raise ValueError("insufficient returns for window")
     stdev = recent.std(ddof=0)
     return float(stdev * math.sqrt(trading_days) * 100)
+
+
+def compute_erv30_series(
+    closes: Union[pd.Series, np.ndarray, Iterable[float]],
+    window: int = 10,
+    trading_days: int = 252,
+) -> Union[pd.Series, np.ndarray]:
+    """eRV30 for every date of a close series in one rolling pass.
+
+    Entry ``i`` equals ``compute_erv30(closes[i - window : i + 1])``; the first
+    ``window`` entries are NaN. Works on any close series — daily (adjusted)
+    closes or the IBKR 15:45 snapshot ``spy`` column. A Series input returns a
+    Series on the same index, anything else returns an ndarray.
+    """
+
+    if isinstance(closes, pd.Series):
+        values = closes.to_numpy(dtype=float)
+    elif isinstance(closes, np.ndarray):
+        values = closes.astype(float, copy=False)
+    else:
+        values = np.fromiter(closes, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window + 1:
+        returns = values[1:] / values[:-1] - 1.0
+        out[window:] = sliding_window_view(returns, window).std(axis=1, ddof=0) * math.sqrt(trading_days) * 100
+    if isinstance(closes, pd.Series):
+        return pd.Series(out, index=closes.index, name=closes.name)
+    return out
@@ -0,0 +1,150 @@
+"""Incremental signal state for live, minute-by-minute refreshes.
+
+``RollingRealizedVol`` keeps the last ``window`` close-to-close returns in a
+ring buffer with running sums, so each update costs O(1) regardless of how
+much history came before. ``push`` appends a new close (a new return);
+``replace_last`` revises the newest close in place, which is what a
+still-forming bar needs as its price ticks. ``StreamingSignals`` layers eVRP
+and the term-structure state on top.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .term_structure import TermStructureState, compute_evrp, compute_term_structure_state
+
+
+class RollingRealizedVol:
+    """eRV30 over a sliding window of returns, matching ``compute_erv30``.
+
+    Running sums drift by a few ulps per update, so they are recomputed from
+    the buffer once every ``window`` updates (still O(1) amortized).
+    """
+
+    def __init__(self, window: int = 10, trading_days: int = 252):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._scale = math.sqrt(trading_days) * 100
+        self._returns = np.zeros(window)
+        self._head = 0  # slot the next return is written to
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._prev_close: Optional[float] = None  # close before the newest one
+        self._last_close: Optional[float] = None
+        self._updates = 0
+
+    @classmethod
+    def from_closes(cls, closes: Iterable[float], window: int = 10, trading_days: int = 252) -> "RollingRealizedVol":
+        acc = cls(window, trading_days)
+        for close in closes:
+            acc.push(close)
+        return acc
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return self._last_close
+
+    def _newest(self) -> int:
+        return (self._head - 1) % self.window
+
+    def _tick(self) -> None:
+        self._updates += 1
+        if self._updates % self.window == 0:
+            live = self._returns if self._count >= self.window else self._returns[: self._count]
+            self._sum = float(live.sum())
+            self._sumsq = float(np.dot(live, live))
+
+    def push(self, close: float) -> Optional[float]:
+        """Append a new close; returns eRV30 once ``window`` returns are held."""
+
+        close = float(close)
+        if self._last_close is not None:
+            ret = close / self._last_close - 1.0
+            if self._count >= self.window:
+                old = self._returns[self._head]
+                self._sum -= old
+                self._sumsq -= old * old
+            else:
+                self._count += 1
+            self._returns[self._head] = ret
+            self._sum += ret
+            self._sumsq += ret * ret
+            self._head = (self._head + 1) % self.window
+            self._tick()
+        self._prev_close, self._last_close = self._last_close, close
+        return self.erv30 if self.ready else None
+
+    def replace_last(self, close: float) -> Optional[float]:
+        """Revise the newest close (e.g. the forming 15:45 bar) without adding a return."""
+
+        if self._last_close is None:
+            raise ValueError("replace_last needs a pushed close")
+        close = float(close)
+        if self._prev_close is not None:
+            slot = self._newest()
+            old = self._returns[slot]
+            ret = close / self._prev_close - 1.0
+            self._returns[slot] = ret
+            self._sum += ret - old
+            self._sumsq += ret * ret - old * old
+            self._tick()
+        self._last_close = close
+        return self.erv30 if self.ready else None
+
+    @property
+    def erv30(self) -> float:
+        if not self.ready:
+            raise ValueError("insufficient returns for window")
+        mean = self._sum / self.window
+        variance = max(self._sumsq / self.window - mean * mean, 0.0)
+        return math.sqrt(variance) * self._scale
+
+
+@dataclass(frozen=True)
+class SignalState:
+    erv30: float
+    evrp: float
+    term_structure: TermStructureState
+    vix: float
+    vix3m: float
+
+
+class StreamingSignals:
+    """eRV30, eVRP and term structure refreshed in O(1) per bar.
+
+    Seed with prior snapshot closes, ``open_bar`` once per session with the
+    first price of the signal bar, then ``update`` on every tick or minute.
+    """
+
+    def __init__(self, closes: Iterable[float], window: int = 10, epsilon: float = 0.0, trading_days: int = 252):
+        self.realized = RollingRealizedVol.from_closes(closes, window, trading_days)
+        self.epsilon = epsilon
+
+    def _state(self, vix: float, vix3m: float) -> SignalState:
+        erv30 = self.realized.erv30
+        return SignalState(
+            erv30=erv30,
+            evrp=compute_evrp(vix, erv30),
+            term_structure=compute_term_structure_state(vix, vix3m, self.epsilon),
+            vix=float(vix),
+            vix3m=float(vix3m),
+        )
+
+    def open_bar(self, spy: float, vix: float, vix3m: float) -> SignalState:
+        self.realized.push(spy)
+        return self._state(vix, vix3m)
+
+    def update(self, spy: float, vix: float, vix3m: float) -> SignalState:
+        self.realized.replace_last(spy)
+        return self._state(vix, vix3m)
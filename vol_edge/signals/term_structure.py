@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 from enum import Enum
+from typing import Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, float]
 
 
 class TermStructureState(str, Enum):
@@ -10,6 +15,12 @@ class TermStructureState(str, Enum):
     BACKWARDATION = "backwardation"
 
 
+# int8 state codes used by the array functions: TERM_STATES[code] is the enum.
+CONTANGO_CODE = 0
+BACKWARDATION_CODE = 1
+TERM_STATES = (TermStructureState.CONTANGO, TermStructureState.BACKWARDATION)
+
+
 def compute_term_structure_state(vix: float, vix3m: float, epsilon: float = 0.0) -> TermStructureState:
     diff = vix3m - vix
     if diff > epsilon:
@@ -22,3 +33,20 @@ def compute_term_structure_state(vix: float, vix3m: float, epsilon: float = 0.0)
 
 def compute_evrp(vix: float, erv30: float) -> float:
     return float(vix - erv30)
+
+
+def compute_term_structure_codes(vix: ArrayLike, vix3m: ArrayLike, epsilon: float = 0.0) -> np.ndarray:
+    """Array form of :func:`compute_term_structure_state` as int8 codes.
+
+    Only ``vix3m - vix < -epsilon`` is backwardation, so ties (and NaN inputs)
+    go to contango exactly as in the scalar rule.
+    """
+
+    diff = np.asarray(vix3m, dtype=float) - np.asarray(vix, dtype=float)
+    return (diff < -epsilon).astype(np.int8)
+
+
+def compute_evrp_array(vix: ArrayLike, erv30: ArrayLike) -> np.ndarray:
+    """Array form of :func:`compute_evrp`."""
+
+    return np.asarray(vix, dtype=float) - np.asarray(erv30, dtype=float)
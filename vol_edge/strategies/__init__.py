@@ -1,11 +1,16 @@
 """Strategy implementations."""
 
-from .base import StrategyContext, StrategyDecision, Strategy
+from .base import ROLES, StrategyContext, StrategyDecision, Strategy
 from .factory import build_strategy
+from .table import BUILTIN_TABLES, TableStrategy, compile_table
 
 __all__ = [
+    "BUILTIN_TABLES",
+    "ROLES",
     "Strategy",
     "StrategyContext",
     "StrategyDecision",
+    "TableStrategy",
     "build_strategy",
+    "compile_table",
 ]
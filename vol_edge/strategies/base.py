@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
 
 from vol_edge.config import StrategyConfig
-from vol_edge.signals import TermStructureState
+from vol_edge.signals import TERM_STATES, TermStructureState
+
+# Column order of ``Strategy.target_weights_batch`` matrices.
+ROLES: Tuple[str, ...] = ("short_vol", "long_vol")
 
 
 @dataclass
@@ -30,5 +35,34 @@ class Strategy:
     def target_weights(self, ctx: StrategyContext) -> StrategyDecision:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def target_weights_batch(
+        self,
+        vix: np.ndarray,
+        vix3m: np.ndarray,
+        erv30: np.ndarray,
+        evrp: np.ndarray,
+        term_structure: np.ndarray,
+    ) -> np.ndarray:
+        """``target_weights`` for aligned arrays, as a dates x ``ROLES`` matrix.
+
+        ``term_structure`` holds int8 codes (see ``compute_term_structure_codes``).
+        A role missing from a day's decision is NaN, so the matrix says both
+        what a decision holds and at what weight. This fallback calls
+        ``target_weights`` row by row; subclasses override it with array selects.
+        """
+
+        out = np.full((len(vix), len(ROLES)), np.nan)
+        rows = zip(vix.tolist(), vix3m.tolist(), erv30.tolist(), evrp.tolist(), term_structure.tolist())
+        for i, (v, v3, e, p, code) in enumerate(rows):
+            ctx = StrategyContext(vix=v, vix3m=v3, erv30=e, evrp=p, term_structure=TERM_STATES[code])
+            for role, weight in self.target_weights(ctx).weights.items():
+                if role not in ROLES:
+                    raise ValueError(f"Unknown strategy role: {role}")
+                out[i, ROLES.index(role)] = weight
+        return out
+
     def _bounded(self, value: float) -> float:
         return max(-self.config.max_vol_exposure_pct, min(self.config.max_vol_exposure_pct, value))
+
+    def _bounded_array(self, values: np.ndarray) -> np.ndarray:
+        return np.clip(values, -self.config.max_vol_exposure_pct, self.config.max_vol_exposure_pct)
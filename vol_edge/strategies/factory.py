@@ -6,9 +6,12 @@ from vol_edge.config import StrategyConfig, StrategyName
 
 from .base import Strategy
 from .impl import EVRPBoCStrategy, EVRPBoCSizingStrategy, EVRPStrategy, StaticShortVol
+from .table import TableStrategy
 
 
 def build_strategy(config: StrategyConfig) -> Strategy:
+    if config.table is not None:
+        return TableStrategy(config)
     if config.name is StrategyName.PASSIVE:
         return StaticShortVol(config, target_weight=min(0.20, config.max_vol_exposure_pct))
     if config.name is StrategyName.EVRP:
@@ -4,10 +4,27 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from vol_edge.config import StrategyConfig
-from vol_edge.signals import TermStructureState
+from vol_edge.signals import CONTANGO_CODE, TermStructureState
+
+from .base import ROLES, Strategy, StrategyContext, StrategyDecision
+
+
+def _roles_matrix(n: int, **weights) -> np.ndarray:
+    """dates x ``ROLES`` matrix; roles not passed stay NaN (absent from the decision)."""
+
+    out = np.full((n, len(ROLES)), np.nan)
+    for role, values in weights.items():
+        out[:, ROLES.index(role)] = values
+    return out
+
 
-from .base import Strategy, StrategyContext, StrategyDecision
+def _nonzero(values: np.ndarray) -> np.ndarray:
+    """Batch form of ``{k: v for k, v in weights.items() if v}``."""
+
+    return np.where(values != 0, values, np.nan)
 
 
 @dataclass
@@ -20,6 +37,9 @@ class StaticShortVol(Strategy):
         weight = self._bounded(self.target_weight)
         return StrategyDecision({"short_vol": weight})
 
+    def target_weights_batch(self, vix, vix3m, erv30, evrp, term_structure):
+        return _roles_matrix(len(vix), short_vol=self._bounded(self.target_weight))
+
 
 class EVRPStrategy(Strategy):
     def target_weights(self, ctx: StrategyContext) -> StrategyDecision:
@@ -28,6 +48,10 @@ class EVRPStrategy(Strategy):
             weight = min(0.20, self.config.max_vol_exposure_pct)
         return StrategyDecision({"short_vol": weight})
 
+    def target_weights_batch(self, vix, vix3m, erv30, evrp, term_structure):
+        weight = np.where(evrp > 0, min(0.20, self.config.max_vol_exposure_pct), 0.0)
+        return _roles_matrix(len(vix), short_vol=weight)
+
 
 class EVRPBoCStrategy(Strategy):
     def target_weights(self, ctx: StrategyContext) -> StrategyDecision:
@@ -40,6 +64,17 @@ class EVRPBoCStrategy(Strategy):
             weight["long_vol"] = min(0.20, self.config.max_vol_exposure_pct)
         return StrategyDecision({k: self._bounded(v) for k, v in weight.items() if v})
 
+    def target_weights_batch(self, vix, vix3m, erv30, evrp, term_structure):
+        cap = self.config.max_vol_exposure_pct
+        contango = term_structure == CONTANGO_CODE
+        short = np.where(contango, np.where(evrp > 0, min(0.20, cap), np.where(evrp <= 0, min(0.10, cap), 0.0)), 0.0)
+        long = np.where((evrp <= 0) & ~contango, min(0.20, cap), 0.0)
+        return _roles_matrix(
+            len(vix),
+            short_vol=_nonzero(self._bounded_array(short)),
+            long_vol=_nonzero(self._bounded_array(long)),
+        )
+
 
 class EVRPBoCSizingStrategy(Strategy):
     def target_weights(self, ctx: StrategyContext) -> StrategyDecision:
@@ -56,3 +91,16 @@ class EVRPBoCSizingStrategy(Strategy):
             decision["long_vol"] = vix_pct
         # else stay cash
         return StrategyDecision({k: self._bounded(v) for k, v in decision.items() if v})
+
+    def target_weights_batch(self, vix, vix3m, erv30, evrp, term_structure):
+        cap = self.config.max_vol_exposure_pct
+        vix_pct = np.minimum(vix / self.config.size_rule_divisor, cap)
+        contango = term_structure == CONTANGO_CODE
+        half = np.minimum(vix_pct * 0.5, cap) if self.config.half_sizing_in_contango_when_neg_evrp else 0.0
+        short = np.where(contango, np.where(evrp > 0, vix_pct, np.where(evrp < 0, half, 0.0)), 0.0)
+        long = np.where((evrp < 0) & ~contango, vix_pct, 0.0)
+        return _roles_matrix(
+            len(vix),
+            short_vol=_nonzero(self._bounded_array(short)),
+            long_vol=_nonzero(self._bounded_array(long)),
+        )
@@ -0,0 +1,239 @@
+"""Decision-table strategies.
+
+A :class:`~vol_edge.config.DecisionTable` is an ordered list of rules; each
+rule filters on eVRP sign, term structure and VIX level and sizes one or more
+roles with a constant or an arithmetic expression over ``vix``, ``vix3m``,
+``erv30``, ``evrp``, ``divisor`` (``size_rule_divisor``), ``cap``
+(``max_vol_exposure_pct``), ``half_sizing`` (1.0/0.0 from
+``half_sizing_in_contango_when_neg_evrp``) and the table's own ``params``,
+using ``+ - * /``, ``min``, ``max`` and ``abs``. The first matching rule
+decides the day; no match means cash. Weights are clipped to ``±cap``.
+
+Tables are compiled once: conditions and expressions become plain Python
+callables that evaluate on floats for ``target_weights`` and on whole arrays
+for ``target_weights_batch``. ``BUILTIN_TABLES`` restates the four Table 2
+strategies in this form.
+"""
+
+from __future__ import annotations
+
+import ast
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Union
+
+import numpy as np
+
+from vol_edge.config import DecisionTable, EvrpSign, RuleCondition, StrategyConfig, StrategyName
+from vol_edge.signals import BACKWARDATION_CODE, CONTANGO_CODE, TermStructureState
+
+from .base import ROLES, Strategy, StrategyContext, StrategyDecision
+
+SIGNAL_NAMES = ("vix", "vix3m", "erv30", "evrp")
+
+
+def _minimum(a, b):
+    return np.minimum(a, b) if isinstance(a, np.ndarray) or isinstance(b, np.ndarray) else min(a, b)
+
+
+def _maximum(a, b):
+    return np.maximum(a, b) if isinstance(a, np.ndarray) or isinstance(b, np.ndarray) else max(a, b)
+
+
+_FUNCTIONS = {"min": _minimum, "max": _maximum, "abs": abs}
+_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.USub,
+    ast.UAdd,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.Call,
+)
+
+Expression = Callable[[Mapping[str, Any]], Any]
+
+
+def compile_expression(source: Union[float, str], names: Tuple[str, ...]) -> Expression:
+    """Compile a size expression to ``fn(env)``; only arithmetic over ``names`` is allowed."""
+
+    if isinstance(source, (int, float)):
+        value = float(source)
+        return lambda env: value
+    tree = ast.parse(str(source), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _NODES):
+            raise ValueError(f"unsupported syntax {type(node).__name__} in size expression {source!r}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"non-numeric constant in size expression {source!r}")
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords
+        ):
+            raise ValueError(f"only min(), max() and abs() may be called in {source!r}")
+        if isinstance(node, ast.Name) and node.id not in names and node.id not in _FUNCTIONS:
+            raise ValueError(f"unknown name {node.id!r} in size expression {source!r}")
+    code = compile(tree, f"<size {source}>", "eval")
+    scope = {"__builtins__": {}, **_FUNCTIONS}
+    return lambda env: eval(code, scope, env)  # noqa: S307 - AST whitelisted above
+
+
+_EVRP_TESTS = {
+    EvrpSign.POSITIVE: lambda evrp: evrp > 0,
+    EvrpSign.NEGATIVE: lambda evrp: evrp < 0,
+    EvrpSign.ZERO: lambda evrp: evrp == 0,
+    EvrpSign.NON_NEGATIVE: lambda evrp: evrp >= 0,
+    EvrpSign.NON_POSITIVE: lambda evrp: evrp <= 0,
+}
+_TERM_CODES = {"contango": CONTANGO_CODE, "backwardation": BACKWARDATION_CODE}
+
+
+def compile_condition(when: RuleCondition) -> Callable[[Mapping[str, Any]], Any]:
+    """``fn(env)`` -> bool (scalars) or bool array; ``env["term"]`` holds state codes."""
+
+    tests: List[Callable[[Mapping[str, Any]], Any]] = []
+    if when.evrp is not None:
+        sign = _EVRP_TESTS[when.evrp]
+        tests.append(lambda env: sign(env["evrp"]))
+    if when.term is not None:
+        code = _TERM_CODES[when.term]
+        tests.append(lambda env: env["term"] == code)
+    if when.vix_min is not None:
+        vix_min = when.vix_min
+        tests.append(lambda env: env["vix"] >= vix_min)
+    if when.vix_max is not None:
+        vix_max = when.vix_max
+        tests.append(lambda env: env["vix"] < vix_max)
+
+    def condition(env):
+        result = True
+        for test in tests:
+            result = result & test(env)
+        return result
+
+    return condition
+
+
+class CompiledTable:
+    """A decision table bound to one ``StrategyConfig``, ready to evaluate."""
+
+    def __init__(self, table: DecisionTable, config: StrategyConfig):
+        self.cap = config.max_vol_exposure_pct
+        self.drop_zero = table.drop_zero_weights
+        self.constants = {
+            "divisor": config.size_rule_divisor,
+            "cap": config.max_vol_exposure_pct,
+            "half_sizing": 1.0 if config.half_sizing_in_contango_when_neg_evrp else 0.0,
+        }
+        clash = sorted(set(table.params) & (set(self.constants) | set(SIGNAL_NAMES) | set(_FUNCTIONS)))
+        if clash:
+            raise ValueError(f"decision table params shadow built-in names: {', '.join(clash)}")
+        self.constants.update(table.params)
+        names = SIGNAL_NAMES + tuple(self.constants)
+        self.rules = []
+        for rule in table.rules:
+            unknown = sorted(set(rule.weights) - set(ROLES))
+            if unknown:
+                raise ValueError(f"Unknown strategy role: {', '.join(unknown)}")
+            sizes = [(role, ROLES.index(role), compile_expression(size, names)) for role, size in rule.weights.items()]
+            self.rules.append((compile_condition(rule.when), sizes))
+
+    def _env(self, vix, vix3m, erv30, evrp, term) -> Dict[str, Any]:
+        return {"vix": vix, "vix3m": vix3m, "erv30": erv30, "evrp": evrp, "term": term, **self.constants}
+
+    def decide(self, vix: float, vix3m: float, erv30: float, evrp: float, term: int) -> Dict[str, float]:
+        """One day's ``{role: weight}``."""
+
+        env = self._env(vix, vix3m, erv30, evrp, term)
+        for condition, sizes in self.rules:
+            if condition(env):
+                weights = {role: float(size(env)) for role, _, size in sizes}
+                return {
+                    role: max(-self.cap, min(self.cap, weight))
+                    for role, weight in weights.items()
+                    if weight or not self.drop_zero
+                }
+        return {}
+
+    def evaluate(
+        self,
+        vix: np.ndarray,
+        vix3m: np.ndarray,
+        erv30: np.ndarray,
+        evrp: np.ndarray,
+        term: np.ndarray,
+    ) -> np.ndarray:
+        """dates x ``ROLES`` weights with NaN for roles left out, as ``target_weights_batch``."""
+
+        n = len(vix)
+        env = self._env(vix, vix3m, erv30, evrp, term)
+        out = np.full((n, len(ROLES)), np.nan)
+        undecided = np.ones(n, dtype=bool)
+        for condition, sizes in self.rules:
+            hit = undecided & condition(env)
+            if hit.any():
+                for _, column, size in sizes:
+                    out[:, column] = np.where(hit, size(env), out[:, column])
+            undecided &= ~hit
+        out = np.clip(out, -self.cap, self.cap)
+        if self.drop_zero:
+            out[out == 0] = np.nan
+        return out
+
+
+def compile_table(table: Union[DecisionTable, Mapping[str, Any]], config: StrategyConfig) -> CompiledTable:
+    return CompiledTable(DecisionTable.model_validate(table), config)
+
+
+class TableStrategy(Strategy):
+    """Strategy driven by ``config.table`` (or an explicit ``table``)."""
+
+    def __init__(self, config: StrategyConfig, table: Union[DecisionTable, Mapping[str, Any], None] = None):
+        super().__init__(config)
+        table = table if table is not None else config.table
+        if table is None:
+            raise ValueError("TableStrategy needs a decision table")
+        self.table = compile_table(table, config)
+
+    def target_weights(self, ctx: StrategyContext) -> StrategyDecision:
+        term = CONTANGO_CODE if ctx.term_structure is TermStructureState.CONTANGO else BACKWARDATION_CODE
+        return StrategyDecision(self.table.decide(ctx.vix, ctx.vix3m, ctx.erv30, ctx.evrp, term))
+
+    def target_weights_batch(self, vix, vix3m, erv30, evrp, term_structure):
+        return self.table.evaluate(vix, vix3m, erv30, evrp, term_structure)
+
+
+# The Table 2 strategies as decision tables, in the shape of a ``strategy.table`` YAML block.
+BUILTIN_TABLES: Dict[StrategyName, Dict[str, Any]] = {
+    StrategyName.PASSIVE: {
+        "drop_zero_weights": False,
+        "rules": [{"weights": {"short_vol": "min(0.20, cap)"}}],
+    },
+    StrategyName.EVRP: {
+        "drop_zero_weights": False,
+        "rules": [
+            {"when": {"evrp": "positive"}, "weights": {"short_vol": "min(0.20, cap)"}},
+            {"weights": {"short_vol": 0.0}},
+        ],
+    },
+    StrategyName.EVRP_BOC: {
+        "rules": [
+            {"when": {"evrp": "positive", "term": "contango"}, "weights": {"short_vol": "min(0.20, cap)"}},
+            {"when": {"evrp": "non_positive", "term": "contango"}, "weights": {"short_vol": "min(0.10, cap)"}},
+            {"when": {"evrp": "non_positive", "term": "backwardation"}, "weights": {"long_vol": "min(0.20, cap)"}},
+        ],
+    },
+    StrategyName.EVRP_BOC_SIZING: {
+        "rules": [
+            {"when": {"evrp": "positive", "term": "contango"}, "weights": {"short_vol": "min(vix / divisor, cap)"}},
+            {
+                "when": {"evrp": "negative", "term": "contango"},
+                "weights": {"short_vol": "min(min(vix / divisor, cap) * 0.5, cap) * half_sizing"},
+            },
+            {"when": {"evrp": "negative", "term": "backwardation"}, "weights": {"long_vol": "min(vix / divisor, cap)"}},
+        ],
+    },
+}